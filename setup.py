@@ -22,12 +22,18 @@ setup(
     package_dir={"": "src"},  # maps the package root to 'src'
     install_requires=[
         "pandas",
+        "numpy",
         "rdflib",
         "python-dotenv",
     ],
+    extras_require={
+        "zstd": ["zstandard"],
+        "cache": ["pyarrow"],
+        "pyarrow": ["pyarrow"],
+    },
     entry_points={
         "console_scripts": [
-            "make-skos=skos_service:make_skos",
+            "make-skos=mcc_skos_service.cli:main",
         ],
     },
 )
@@ -0,0 +1,12 @@
+import argparse
+from mcc_skos_service.batch import make_skos_batch
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère plusieurs thésaurus SKOS en parallèle.")
+    parser.add_argument("manifest", help="Fichier JSON contenant la liste des configurations de make_skos.")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : BATCH_WORKERS ou le nombre de CPU).")
+    parser.add_argument("--report", default=None, help="Fichier JSON où écrire le rapport (durées et erreurs).")
+    args = parser.parse_args()
+
+    results = make_skos_batch(args.manifest, workers=args.workers, report_path=args.report)
+    raise SystemExit(1 if any(result['status'] == 'error' for result in results) else 0)
@@ -0,0 +1,29 @@
+import argparse
+from mcc_skos_service.benchmark import DEFAULT_SIZES, run_benchmarks
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure les performances de make_skos sur des CSV synthétiques.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Nombres de lignes des CSV synthétiques.")
+    parser.add_argument("--modes", nargs="+", choices=["flat", "nested"], default=["flat", "nested"], help="Modes de génération mesurés.")
+    parser.add_argument("--backends", nargs="+", choices=["graph", "stream", "buffer"], default=["graph"], help="Backends de sortie mesurés.")
+    parser.add_argument("--main-concepts", type=int, default=50, help="Nombre de concepts principaux distincts.")
+    parser.add_argument("--narrower-concepts", type=int, default=500, help="Nombre de concepts plus spécifiques distincts.")
+    parser.add_argument("--nan-density", type=float, default=0.1, help="Proportion de valeurs manquantes dans les colonnes optionnelles.")
+    parser.add_argument("--workdir", default="benchmark_data", help="Répertoire des CSV synthétiques et des fichiers générés.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Fichier JSON des résultats.")
+    parser.add_argument("--keep-outputs", action="store_true", help="Conserve les fichiers SKOS générés.")
+    parser.add_argument("--trace-memory", action="store_true", help="Suit les allocations Python avec tracemalloc (plus lent).")
+    args = parser.parse_args()
+
+    run_benchmarks(
+        sizes=args.sizes,
+        modes=args.modes,
+        output_backends=args.backends,
+        workdir=args.workdir,
+        results_path=args.output,
+        main_concepts=args.main_concepts,
+        narrower_concepts=args.narrower_concepts,
+        nan_density=args.nan_density,
+        keep_outputs=args.keep_outputs,
+        trace_memory=args.trace_memory,
+    )
@@ -1,5 +1,4 @@
-from mcc_skos_service.skos_service import make_skos  
-   
+from mcc_skos_service.cli import main
+
 if __name__ == "__main__":
-    make_skos()    
-    
\ No newline at end of file
+    raise SystemExit(main())
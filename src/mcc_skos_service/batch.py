@@ -0,0 +1,125 @@
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from mcc_skos_service.settings import get_settings
+
+
+def make_skos_batch(schemes, workers: int = None, report_path: str = None):
+    """
+    Génère plusieurs thésaurus SKOS indépendants en parallèle.
+
+    ### Description :
+    Chaque schéma est décrit par un dictionnaire contenant les mêmes clés que les paramètres de
+    `make_skos` (ex. `csv_path`, `namespace`, `scheme_name`...), plus une clé optionnelle `name`
+    utilisée dans le rapport. Les schémas sont répartis sur un pool de processus : les imports
+    de pandas et rdflib ne sont payés qu'une fois par processus. L'échec d'un schéma (CSV invalide,
+    paramètre manquant...) est enregistré dans le rapport sans interrompre les autres.
+
+    ### Paramètres :
+    - **schemes** (list ou str) : Liste des configurations, ou chemin d'un fichier JSON contenant cette liste.
+    - **workers** (int, optionnel) : Nombre de processus. Par défaut `BATCH_WORKERS`, sinon le nombre de CPU.
+    - **report_path** (str, optionnel) : Chemin d'un fichier JSON où écrire le rapport.
+
+    ### Retour :
+    - **list** : Un résultat par schéma, dans l'ordre du manifeste, avec les clés `name`, `status`
+      (`ok` ou `error`), `seconds`, `output` et `error`.
+
+    ### Exemple :
+    ```python
+    make_skos_batch("schemes.json", workers=4, report_path="rapport.json")
+    ```
+    """
+    if isinstance(schemes, (str, Path)):
+        schemes = load_batch_manifest(schemes)
+
+    workers = workers or get_settings().BATCH_WORKERS or os.cpu_count()
+    results = [None] * len(schemes)
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(schemes), 1))) as executor:
+        futures = {
+            executor.submit(run_scheme, config, index): index
+            for index, config in enumerate(schemes)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            name = batch_entry_name(schemes[index], index)
+            try:
+                results[index] = future.result()
+            except Exception as exc:
+                # Le processus lui-même a échoué (ex. arrêt brutal) : seul ce schéma est en erreur
+                results[index] = {'name': name, 'status': 'error', 'seconds': None,
+                                  'output': None, 'error': repr(exc)}
+            result = results[index]
+            print(f"[{result['status']}] {result['name']} ({result['seconds'] or 0:.2f} s)"
+                  + (f" : {result['error']}" if result['error'] else ''))
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+    failures = sum(result['status'] == 'error' for result in results)
+    print(f"{len(results) - failures}/{len(results)} schémas générés.")
+    return results
+
+
+def run_scheme(config, index=None):
+    """
+    Génère un schéma du lot dans un processus du pool.
+
+    ### Paramètres :
+    - **config** (dict) : Paramètres de `make_skos`, plus la clé optionnelle `name`.
+    - **index** (int, optionnel) : Position du schéma dans le manifeste.
+
+    ### Retour :
+    - **dict** : Résultat du schéma (voir `make_skos_batch`).
+    """
+    from mcc_skos_service.skos_service import make_skos
+
+    params = {key: value for key, value in config.items() if key != 'name'}
+    name = batch_entry_name(config, index)
+    start = time.perf_counter()
+    try:
+        output = make_skos(**params)
+    except Exception as exc:
+        return {'name': name, 'status': 'error', 'seconds': time.perf_counter() - start,
+                'output': None, 'error': f"{type(exc).__name__}: {exc}",
+                'traceback': traceback.format_exc()}
+    return {'name': name, 'status': 'ok', 'seconds': time.perf_counter() - start,
+            'output': str(output), 'error': None}
+
+
+def load_batch_manifest(path):
+    """
+    Lit le manifeste d'un lot de schémas.
+
+    ### Paramètres :
+    - **path** (str) : Chemin du fichier JSON, contenant une liste de configurations ou un
+      objet `{"schemes": [...]}`.
+
+    ### Retour :
+    - **list** : Configurations des schémas.
+    """
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    schemes = data['schemes'] if isinstance(data, dict) else data
+    if not isinstance(schemes, list) or not all(isinstance(config, dict) for config in schemes):
+        raise ValueError(f"Manifeste de lot invalide : '{path}'. Une liste de configurations est attendue.")
+    return schemes
+
+
+def batch_entry_name(config, index=None):
+    """
+    Retourne le nom d'un schéma du lot pour le rapport.
+
+    ### Paramètres :
+    - **config** (dict) : Configuration du schéma.
+    - **index** (int, optionnel) : Position du schéma dans le manifeste.
+
+    ### Retour :
+    - **str** : `name`, sinon `scheme_name`, `output_file_name` ou la position.
+    """
+    return str(config.get('name') or config.get('scheme_name') or config.get('output_file_name')
+               or f"schéma {index}")
@@ -0,0 +1,233 @@
+import json
+import multiprocessing
+import platform
+import sys
+import resource
+import time
+import tracemalloc
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Tailles par défaut des CSV synthétiques (nombre de lignes)
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def generate_synthetic_csv(
+    path,
+    rows: int,
+    main_concepts: int = 50,
+    narrower_concepts: int = 500,
+    nan_density: float = 0.1,
+    seed: int = 0,
+):
+    """
+    Génère un fichier CSV synthétique de thésaurus pour les benchmarks.
+
+    ### Description :
+    Chaque ligne contient un concept principal (`main`), un concept plus spécifique (`narrow`)
+    et un item (`label`, `definition`, `note`), avec leurs descriptions. Les valeurs des colonnes
+    optionnelles sont vides avec la probabilité `nan_density`.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier CSV à créer.
+    - **rows** (int) : Nombre de lignes.
+    - **main_concepts** (int, optionnel) : Nombre de concepts principaux distincts.
+    - **narrower_concepts** (int, optionnel) : Nombre de concepts plus spécifiques distincts.
+    - **nan_density** (float, optionnel) : Proportion de valeurs manquantes dans les colonnes optionnelles.
+    - **seed** (int, optionnel) : Graine du générateur aléatoire.
+
+    ### Retour :
+    - **Path** : Chemin du fichier créé.
+    """
+    rng = np.random.default_rng(seed)
+    main = rng.integers(0, main_concepts, rows)
+    narrow = rng.integers(0, narrower_concepts, rows)
+    index = np.arange(rows).astype(str)
+
+    def optional(values):
+        values = pd.Series(values, dtype=object)
+        values[rng.random(rows) < nan_density] = None
+        return values
+
+    df = pd.DataFrame({
+        'main': np.char.add('Catégorie ', main.astype(str)),
+        'main_description': optional(np.char.add('Description de la catégorie ', main.astype(str))),
+        'narrow': optional(np.char.add('Sous-catégorie ', narrow.astype(str))),
+        'narrow_description': optional(np.char.add('Description de la sous-catégorie ', narrow.astype(str))),
+        'label': np.char.add('Élément ', index),
+        'code': optional(index),
+        'definition': optional(np.char.add('Définition de l’élément ', index)),
+        'note': optional(np.char.add('Note ', index)),
+    })
+    df.to_csv(path, index=False)
+    return Path(path)
+
+
+def benchmark_params(csv_path, mode, output_dir, output_backend='graph'):
+    """
+    Construit les paramètres de `make_skos` d'un benchmark.
+
+    ### Paramètres :
+    - **csv_path** (Path) : CSV synthétique.
+    - **mode** (str) : `flat` (concept principal fixe) ou `nested` (`imbrique=True`).
+    - **output_dir** (Path) : Répertoire des fichiers générés.
+    - **output_backend** (str, optionnel) : Backend de sortie de `make_skos`.
+
+    ### Retour :
+    - **dict** : Paramètres de `make_skos`.
+    """
+    params = {
+        'csv_path': str(csv_path),
+        'namespace': 'http://example.org/benchmark#',
+        'scheme_id': 'benchmark',
+        'scheme_name': 'Benchmark',
+        'scheme_definition': 'Thésaurus synthétique',
+        'skos_prefLabel_columns': 'label,code',
+        'skos_definition_columns': 'definition',
+        'skos_notes_columns': 'note',
+        'main_project_root': str(output_dir),
+        'output_file_path': '.',
+        'output_file_name': f'{Path(csv_path).stem}-{mode}-{output_backend}',
+        'output_backend': output_backend,
+    }
+    if mode == 'nested':
+        params.update({
+            'imbrique': True,
+            'skos_main_concept_preflabel_columns': 'main',
+            'skos_main_concept_description_columns': 'main_description',
+            'skos_narrow_concept_preflabel_columns': 'narrow',
+            'skos_narrow_concept_description_columns': 'narrow_description',
+        })
+    else:
+        params.update({'imbrique': False, 'concept_main_name': 'Benchmark'})
+    return params
+
+
+def run_case(params, trace_memory=False):
+    """
+    Exécute `make_skos` et mesure la durée de chaque phase (exécuté dans un processus dédié).
+
+    ### Description :
+    Les durées des phases et les compteurs sont ceux de l'instrumentation de `make_skos`
+    (voir `Instrumentation`). Avec `output_backend='stream'`, les concepts sont écrits
+    pendant la phase `build`.
+
+    Avec `trace_memory`, les allocations Python sont suivies avec `tracemalloc` : le pic de mémoire
+    allouée et le nombre de blocs mémoire encore alloués à la fin de la génération (graphe complet) sont
+    ajoutés aux résultats. Ce suivi ralentit fortement la génération : les durées ne sont alors pas
+    comparables aux autres cas.
+
+    ### Paramètres :
+    - **params** (dict) : Paramètres de `make_skos`.
+    - **trace_memory** (bool, optionnel) : Suit les allocations avec `tracemalloc`.
+
+    ### Retour :
+    - **dict** : Durées par phase (secondes), compteurs, durée totale, pic de mémoire (RSS) et taille du fichier.
+    """
+    from mcc_skos_service.skos_service import make_skos
+
+    events = []
+    blocks = {}
+
+    def sink(event):
+        events.append(event)
+        # Le bilan est envoyé avant que `make_skos` ne libère le graphe
+        if trace_memory and event['event'] == 'summary':
+            blocks['allocated_blocks'] = sys.getallocatedblocks()
+
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    output = make_skos(**params, instrumentation=sink)
+    total = time.perf_counter() - start
+
+    summary = events[-1]
+    measures = {}
+    if trace_memory:
+        measures = {'traced_peak_mb': tracemalloc.get_traced_memory()[1] / 2**20, **blocks}
+        tracemalloc.stop()
+    return {
+        'seconds': total,
+        'phases': summary['phases'],
+        'counters': summary['counters'],
+        # ru_maxrss est exprimé en kilo-octets sous Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'baseline_rss_mb': rss_before / 1024,
+        'output_bytes': Path(output).stat().st_size,
+        **measures,
+    }
+
+
+def run_benchmarks(
+    sizes=DEFAULT_SIZES,
+    modes=('flat', 'nested'),
+    output_backends=('graph',),
+    workdir='benchmark_data',
+    results_path='benchmark_results.json',
+    main_concepts: int = 50,
+    narrower_concepts: int = 500,
+    nan_density: float = 0.1,
+    keep_outputs: bool = False,
+    trace_memory: bool = False,
+):
+    """
+    Exécute la suite de benchmarks et écrit les résultats au format JSON.
+
+    ### Description :
+    Pour chaque taille, un CSV synthétique est généré (une seule fois), puis `make_skos` est exécuté
+    pour chaque mode et chaque backend dans un processus neuf, afin que le pic de mémoire mesuré
+    ne dépende que du cas exécuté.
+
+    ### Paramètres :
+    - **sizes** (list, optionnel) : Nombres de lignes des CSV synthétiques.
+    - **modes** (list, optionnel) : `flat` et/ou `nested`.
+    - **output_backends** (list, optionnel) : Backends de sortie de `make_skos` (`graph`, `stream`).
+    - **workdir** (str, optionnel) : Répertoire des CSV et des fichiers générés.
+    - **results_path** (str, optionnel) : Fichier JSON des résultats.
+    - **main_concepts** (int, optionnel) : Nombre de concepts principaux distincts.
+    - **narrower_concepts** (int, optionnel) : Nombre de concepts plus spécifiques distincts.
+    - **nan_density** (float, optionnel) : Proportion de valeurs manquantes.
+    - **keep_outputs** (bool, optionnel) : Conserve les fichiers SKOS générés.
+    - **trace_memory** (bool, optionnel) : Suit les allocations Python de chaque cas (voir `run_case`).
+
+    ### Retour :
+    - **dict** : Résultats (environnement et un résultat par cas).
+    """
+    workdir = Path(workdir).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    context = multiprocessing.get_context('spawn')
+    results = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+        },
+        'cases': [],
+    }
+
+    for rows in sizes:
+        csv_path = workdir / f'synthetic-{rows}.csv'
+        if not csv_path.exists():
+            generate_synthetic_csv(csv_path, rows, main_concepts, narrower_concepts, nan_density)
+
+        for mode in modes:
+            for output_backend in output_backends:
+                params = benchmark_params(csv_path, mode, workdir, output_backend)
+                with context.Pool(1) as pool:
+                    measures = pool.apply(run_case, (params, trace_memory))
+                case = {'rows': rows, 'mode': mode, 'output_backend': output_backend,
+                        'rows_per_second': rows / measures['seconds'], **measures}
+                results['cases'].append(case)
+                print(f"{rows:>9} lignes  {mode:<6}  {output_backend:<6}  {measures['seconds']:8.2f} s  "
+                      f"{measures['peak_rss_mb']:8.1f} Mo  "
+                      + '  '.join(f"{phase}={value:.2f}s" for phase, value in measures['phases'].items()))
+
+                if not keep_outputs:
+                    for output in workdir.glob(f"{params['output_file_name']}.*"):
+                        output.unlink()
+
+    with open(results_path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    return results
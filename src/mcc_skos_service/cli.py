@@ -0,0 +1,108 @@
+import argparse
+import sys
+from mcc_skos_service.settings import get_settings
+
+# Paramètres de `make_skos` exposés par la ligne de commande, avec leur type
+# (`bool` : option `--x/--no-x` ; les colonnes sont des listes séparées par des virgules)
+CLI_PARAMETERS = {
+    'csv_path': str,
+    'csv_separateur': str,
+    'main_project_root': str,
+    'imbrique': bool,
+    'namespace': str,
+    'scheme_id': str,
+    'scheme_name': str,
+    'scheme_definition': str,
+    'concept_main_name': str,
+    'concept_main_definition': str,
+    'concept_narrower_name': str,
+    'concept_narrower_definition': str,
+    'skos_prefLabel_columns': str,
+    'skos_definition_columns': str,
+    'skos_notes_columns': str,
+    'skos_main_concept_preflabel_columns': str,
+    'skos_main_concept_description_columns': str,
+    'skos_narrow_concept_preflabel_columns': str,
+    'skos_narrow_concept_description_columns': str,
+    'output_file_name': str,
+    'output_file_path': str,
+    'output_backend': str,
+    'output_format': str,
+    'output_compression': str,
+    'csv_chunk_size': int,
+    'csv_reader': str,
+    'csv_cache_dir': str,
+    'csv_cache_max_size': float,
+    'uri_mode': str,
+    'stable_uris': bool,
+    'stable_uris_delta': bool,
+    'incremental': bool,
+    'append': bool,
+    'near_duplicates': str,
+    'near_duplicate_threshold': float,
+    'concept_index': str,
+    'concept_index_cache_size': int,
+    'parallel_workers': int,
+    'instrumentation': str,
+    'instrumentation_interval': float,
+    'profile': bool,
+}
+
+
+def create_parser():
+    """
+    Construit l'analyseur des arguments de la commande `make-skos`.
+
+    ### Retour :
+    - **argparse.ArgumentParser** : Une option par paramètre de `make_skos` (ex. `--csv-path`).
+    """
+    parser = argparse.ArgumentParser(
+        prog='make-skos',
+        description="Génère un fichier SKOS à partir d'un fichier CSV. Les options absentes sont lues "
+                    "dans les variables d'environnement (ou le fichier .env) du même nom en majuscules.",
+    )
+    parser.add_argument('--check', action='store_true',
+                        help="Valide les paramètres et affiche le fichier qui serait généré, sans le générer.")
+    for name, kind in CLI_PARAMETERS.items():
+        option = '--' + name.replace('_', '-')
+        if kind is bool:
+            parser.add_argument(option, dest=name, action=argparse.BooleanOptionalAction, default=None)
+        else:
+            parser.add_argument(option, dest=name, type=kind, default=None, metavar=name.upper())
+    return parser
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la commande `make-skos`.
+
+    ### Description :
+    pandas et rdflib ne sont importés que si un fichier est généré : l'aide (`--help`) et la
+    validation des paramètres (`--check`) restent rapides, ce qui permet d'enchaîner de nombreux
+    appels depuis un script.
+
+    ### Paramètres :
+    - **argv** (list, optionnel) : Arguments de la ligne de commande. Par défaut, `sys.argv[1:]`.
+
+    ### Retour :
+    - **int** : Code de sortie (0 si le fichier est généré ou si les paramètres sont valides, 1 sinon).
+    """
+    args = create_parser().parse_args(argv)
+    params = {name: getattr(args, name) for name in CLI_PARAMETERS}
+    try:
+        if args.check:
+            from mcc_skos_service.params import get_output_path, load_params
+            params = load_params(get_settings(), params)
+            print(f"Paramètres valides : {get_output_path(params)}")
+            return 0
+
+        from mcc_skos_service.skos_service import make_skos
+        make_skos(**params)
+    except (ValueError, KeyError, FileNotFoundError, ImportError) as exc:
+        print(f"Erreur : {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+
+# Extension des fichiers compressés, par algorithme
+COMPRESSION_SUFFIXES = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+# Niveau de compression gzip : celui de l'outil `gzip`, bien plus rapide que le niveau 9 de `gzip.open`
+GZIP_LEVEL = 6
+
+
+def infer_compression(path):
+    """
+    Déduit l'algorithme de compression de l'extension d'un fichier.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier.
+
+    ### Retour :
+    - **str ou None** : `gzip`, `zstd`, ou `None` si le fichier n'est pas compressé.
+    """
+    suffix = Path(str(path)).suffix.lower()
+    for compression, compression_suffix in COMPRESSION_SUFFIXES.items():
+        if suffix == compression_suffix:
+            return compression
+    return None
+
+
+def open_text(path, compression=None, encoding='utf-8', errors='strict', mode='w'):
+    """
+    Ouvre un fichier texte en écriture, en compressant au fil de l'écriture si demandé.
+
+    ### Description :
+    Les données sont transmises au codec par blocs au fur et à mesure de l'écriture : le fichier
+    non compressé n'est jamais conservé en mémoire ni sur le disque.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier.
+    - **compression** (str, optionnel) : `gzip`, `zstd`, ou `None`.
+    - **encoding** (str, optionnel) : Encodage du texte.
+    - **errors** (str, optionnel) : Gestion des caractères non encodables (voir `open`).
+    - **mode** (str, optionnel) : `w` (remplace le fichier) ou `a` (écrit à la fin du fichier ; compressé,
+      le texte ajouté forme un nouveau membre gzip ou une nouvelle trame zstd).
+
+    ### Retour :
+    - **TextIO** : Fichier ouvert en écriture.
+
+    ### Exceptions :
+    - `ImportError` : Si `compression='zstd'` et que le package `zstandard` n'est pas installé.
+    """
+    if compression is None:
+        return open(path, mode, encoding=encoding, errors=errors)
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', compresslevel=GZIP_LEVEL, encoding=encoding, errors=errors)
+    if compression == 'zstd':
+        writer = zstandard_module().ZstdCompressor().stream_writer(open(path, mode + 'b'), closefd=True)
+        return io.TextIOWrapper(writer, encoding=encoding, errors=errors)
+    raise ValueError(f"Compression inconnue : '{compression}'.")
+
+
+def open_input_text(path, encoding='utf-8'):
+    """
+    Ouvre un fichier texte en lecture, en le décompressant au fil de la lecture selon son extension.
+
+    ### Description :
+    Les extensions reconnues sont celles que `pd.read_csv` décompresse : `.gz`, `.bz2`, `.xz` et
+    `.zst`. Le fichier est ouvert avec `newline=''`, comme l'attend le module `csv`.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier.
+    - **encoding** (str, optionnel) : Encodage du texte.
+
+    ### Retour :
+    - **TextIO** : Fichier ouvert en lecture.
+    """
+    suffix = Path(str(path)).suffix.lower()
+    if suffix == '.gz':
+        return gzip.open(path, 'rt', encoding=encoding, newline='')
+    if suffix == '.bz2':
+        return bz2.open(path, 'rt', encoding=encoding, newline='')
+    if suffix == '.xz':
+        return lzma.open(path, 'rt', encoding=encoding, newline='')
+    if suffix == COMPRESSION_SUFFIXES['zstd']:
+        reader = zstandard_module().ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(reader, encoding=encoding, newline='')
+    return open(path, encoding=encoding, newline='')
+
+
+def open_binary(path, compression=None):
+    """
+    Ouvre un fichier binaire en écriture, en compressant au fil de l'écriture si demandé.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier.
+    - **compression** (str, optionnel) : `gzip`, `zstd`, ou `None`.
+
+    ### Retour :
+    - **BinaryIO** : Fichier ouvert en écriture.
+    """
+    if compression is None:
+        return open(path, 'wb')
+    if compression == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=GZIP_LEVEL)
+    if compression == 'zstd':
+        return zstandard_module().open(path, 'wb')
+    raise ValueError(f"Compression inconnue : '{compression}'.")
+
+
+def zstandard_module():
+    """
+    Importe le package optionnel `zstandard`.
+
+    ### Retour :
+    - **module** : Le module `zstandard`.
+
+    ### Exceptions :
+    - `ImportError` : Si le package n'est pas installé.
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "La compression 'zstd' nécessite le package 'zstandard' (pip install zstandard)."
+        ) from None
+    return zstandard
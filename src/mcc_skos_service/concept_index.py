@@ -0,0 +1,247 @@
+import sqlite3
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+
+# Index des concepts (`concept_index`) : dictionnaires en mémoire, ou fichier SQLite avec un cache LRU
+CONCEPT_INDEXES = ('memory', 'sqlite')
+
+# Nombre d'entrées gardées en mémoire par index, si `concept_index_cache_size` n'est pas renseigné
+CONCEPT_INDEX_CACHE_SIZE = 100_000
+
+# Nombre d'entrées ajoutées avant leur écriture dans le fichier, en une transaction
+CONCEPT_INDEX_WRITE_SIZE = 10_000
+
+# Sépare les labels d'une clé composée (même valeur que `PATH_SEPARATOR` de `uri_minter`, que ce
+# module n'importe pas : `params` en dépend et doit rester importable sans rdflib)
+KEY_SEPARATOR = '\x1f'
+
+# Nombre de clés lues par requête par `prefetch`
+CONCEPT_INDEX_READ_SIZE = 500
+
+# Taille du cache de pages de SQLite, en Kio (valeur négative de `PRAGMA cache_size`)
+SQLITE_PAGE_CACHE = 16 * 1024
+
+
+class ConceptStore:
+    """
+    Classe ConceptStore : Fichier SQLite contenant les index des concepts d'une génération.
+
+    ### Description :
+    Le fichier est temporaire : il est recréé à l'ouverture et supprimé par `close`. Il n'est
+    jamais relu après une interruption, la journalisation et la synchronisation de SQLite sont
+    donc désactivées. Chaque index (voir `ConceptIndex`) est une table du fichier.
+    """
+
+    def __init__(self, path, cache_size: int = None):
+        """
+        Initialisation du fichier des index.
+
+        ### Paramètres :
+        - **path** (str ou Path) : Chemin du fichier SQLite, remplacé s'il existe.
+        - **cache_size** (int, optionnel) : Nombre d'entrées gardées en mémoire par index. Par défaut, 100 000.
+        """
+        self.path = Path(path)
+        self.cache_size = int(cache_size or CONCEPT_INDEX_CACHE_SIZE)
+        self.path.unlink(missing_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA journal_mode = OFF')
+        self.connection.execute('PRAGMA synchronous = OFF')
+        self.connection.execute(f'PRAGMA cache_size = -{SQLITE_PAGE_CACHE}')
+        self._indexes = []
+
+    def index(self, name, value_type=None):
+        """
+        Crée un index dans le fichier.
+
+        ### Paramètres :
+        - **name** (str) : Nom de la table (identifiant SQL).
+        - **value_type** (callable, optionnel) : Type des valeurs (voir `ConceptIndex`). Par défaut, `URIRef`.
+
+        ### Retour :
+        - **ConceptIndex** : Index vide.
+        """
+        index = ConceptIndex(self.connection, name, self.cache_size, value_type)
+        self._indexes.append(index)
+        return index
+
+    def close(self):
+        """
+        Ferme et supprime le fichier.
+        """
+        if self.connection is None:
+            return
+        self.connection.close()
+        self.connection = None
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConceptIndex(MutableMapping):
+    """
+    Classe ConceptIndex : Dictionnaire label (ou chemin de labels) → URI de concept, stocké dans une table SQLite.
+
+    ### Description :
+    S'utilise comme les dictionnaires `main_concepts` et `narrow_concepts` de `make_skos_narrowed`,
+    mais seules les `cache_size` entrées les plus récemment utilisées restent en mémoire (cache LRU) :
+    la mémoire ne dépend plus du nombre de concepts. Une entrée absente du cache est lue dans la
+    table, puis gardée en cache. Les entrées ajoutées sont écrites par lots de
+    `CONCEPT_INDEX_WRITE_SIZE`, en une transaction.
+
+    `prefetch` lit en quelques requêtes les clés d'un bloc du CSV, avant de les consulter une à
+    une : la plupart sont nouvelles, et leur absence est alors connue sans autre requête.
+
+    Les clés sont des chaînes ou des tuples de chaînes (ex. `(concept principal, concept plus
+    spécifique)`), les valeurs des `URIRef`, ou des valeurs de type `value_type` (ex. `int` pour
+    le décompte des occurrences de `UriMinter`), stockées sous forme de texte.
+    """
+
+    def __init__(self, connection, name, cache_size=CONCEPT_INDEX_CACHE_SIZE, value_type=None):
+        """
+        Initialisation de l'index.
+
+        ### Paramètres :
+        - **connection** (sqlite3.Connection) : Connexion au fichier des index.
+        - **name** (str) : Nom de la table, créée si elle n'existe pas.
+        - **cache_size** (int, optionnel) : Nombre d'entrées gardées en mémoire.
+        - **value_type** (callable, optionnel) : Construit une valeur à partir de son texte. Par défaut, `URIRef`.
+        """
+        from rdflib import URIRef
+
+        self.connection = connection
+        self.name = name
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._absent = set()
+        self._value = value_type or URIRef
+        connection.execute(f'CREATE TABLE IF NOT EXISTS {name} (key TEXT PRIMARY KEY, uri TEXT NOT NULL) WITHOUT ROWID')
+        self._select = f'SELECT uri FROM {name} WHERE key = ?'
+
+    def __getitem__(self, key):
+        cache = self._cache
+        try:
+            uri = cache[key]
+        except KeyError:
+            pass
+        else:
+            cache.move_to_end(key)
+            return uri
+
+        uri = self._pending.get(key)
+        if uri is None:
+            if key in self._absent:
+                raise KeyError(key)
+            row = self.connection.execute(self._select, (encode_key(key),)).fetchone()
+            if row is None:
+                raise KeyError(key)
+            uri = self._value(row[0])
+        self._remember(key, uri)
+        return uri
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, key, uri):
+        self._absent.discard(key)
+        self._remember(key, uri)
+        self._pending[key] = uri
+        if len(self._pending) >= CONCEPT_INDEX_WRITE_SIZE:
+            self.flush()
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._cache.pop(key, None)
+        self._pending.pop(key, None)
+        with self.connection:
+            self.connection.execute(f'DELETE FROM {self.name} WHERE key = ?', (encode_key(key),))
+
+    def __iter__(self):
+        self.flush()
+        for (key,) in self.connection.execute(f'SELECT key FROM {self.name}'):
+            yield decode_key(key)
+
+    def __len__(self):
+        self.flush()
+        return self.connection.execute(f'SELECT COUNT(*) FROM {self.name}').fetchone()[0]
+
+    def prefetch(self, keys):
+        """
+        Lit les entrées de plusieurs clés, par lots de `CONCEPT_INDEX_READ_SIZE`.
+
+        ### Description :
+        Les entrées trouvées sont gardées en cache ; les clés absentes sont retenues jusqu'au
+        prochain appel, pour que leur consultation ne lise pas la table.
+
+        ### Paramètres :
+        - **keys** (iterable) : Clés consultées ensuite (ex. celles d'un bloc du CSV).
+        """
+        cache, pending = self._cache, self._pending
+        missing = [key for key in dict.fromkeys(keys) if key not in cache and key not in pending]
+        self._absent = set(missing)
+        for start in range(0, len(missing), CONCEPT_INDEX_READ_SIZE):
+            batch = {encode_key(key): key for key in missing[start:start + CONCEPT_INDEX_READ_SIZE]}
+            query = f'SELECT key, uri FROM {self.name} WHERE key IN ({", ".join("?" * len(batch))})'
+            for value, uri in self.connection.execute(query, list(batch)):
+                key = batch[value]
+                self._absent.discard(key)
+                self._remember(key, self._value(uri))
+
+    def flush(self):
+        """
+        Écrit dans la table les entrées ajoutées depuis la dernière écriture.
+        """
+        if not self._pending:
+            return
+        with self.connection:
+            self.connection.executemany(
+                f'INSERT OR REPLACE INTO {self.name} (key, uri) VALUES (?, ?)',
+                ((encode_key(key), str(uri)) for key, uri in self._pending.items()))
+        self._pending.clear()
+
+    def _remember(self, key, uri):
+        cache = self._cache
+        cache[key] = uri
+        cache.move_to_end(key)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+
+def encode_key(key):
+    """
+    Retourne la clé SQL d'une clé d'index.
+
+    ### Paramètres :
+    - **key** (str ou tuple) : Label, ou chemin de labels.
+
+    ### Retour :
+    - **str** : La clé elle-même, ou les labels du chemin séparés par `KEY_SEPARATOR`, préfixés par ce séparateur.
+    """
+    if isinstance(key, tuple):
+        return KEY_SEPARATOR + KEY_SEPARATOR.join(key)
+    return key
+
+
+def decode_key(value):
+    """
+    Retourne la clé d'index d'une clé SQL (inverse de `encode_key`).
+
+    ### Paramètres :
+    - **value** (str) : Clé SQL.
+
+    ### Retour :
+    - **str ou tuple** : Label, ou chemin de labels.
+    """
+    if value.startswith(KEY_SEPARATOR):
+        return tuple(value[1:].split(KEY_SEPARATOR))
+    return value
@@ -0,0 +1,244 @@
+import hashlib
+import os
+from pathlib import Path
+import pandas as pd
+from mcc_skos_service.csv_reader import pyarrow_module
+
+# Version du format des entrées : l'incrémenter invalide les entrées existantes
+CACHE_VERSION = 1
+
+# Taille maximale du cache, en Mo, si `csv_cache_max_size` n'est pas renseigné
+DEFAULT_MAX_SIZE = 1024
+
+# Taille des blocs lus pour calculer l'empreinte du CSV
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class CsvCache:
+    """
+    Classe CsvCache : Cache sur disque des fichiers CSV déjà lus, au format Arrow IPC (Feather v2).
+
+    ### Description :
+    Chaque entrée contient toutes les colonnes d'un CSV, telles que lues par `pd.read_csv`. Elle est
+    identifiée par le chemin, la taille, la date de modification et l'empreinte du contenu du fichier,
+    ainsi que par le séparateur et le mode de lecture (`text` : toutes les valeurs lues comme du texte,
+    comme en lecture par blocs ; sinon, types inférés par pandas). Une modification du CSV crée donc
+    une nouvelle entrée.
+
+    Lors des générations suivantes, l'entrée est projetée en mémoire (`memory_map`) au lieu
+    d'analyser à nouveau le texte du CSV : seules les colonnes demandées sont converties en
+    DataFrame. Plusieurs schémas générés à partir du même CSV, avec des colonnes ou des namespaces
+    différents, partagent ainsi la même entrée.
+
+    Lorsque la taille totale du cache dépasse `max_size` Mo, les entrées les moins récemment
+    utilisées sont supprimées.
+
+    Nécessite le package `pyarrow`.
+    """
+
+    def __init__(self, directory, max_size: float = None):
+        """
+        Initialisation du cache.
+
+        ### Paramètres :
+        - **directory** (str ou Path) : Répertoire du cache, créé s'il n'existe pas.
+        - **max_size** (float, optionnel) : Taille maximale du cache, en Mo. Par défaut, 1024.
+
+        ### Exceptions :
+        - `ImportError` : Si le package `pyarrow` n'est pas installé.
+        """
+        self.pa = pyarrow_module("csv_cache_dir")
+        self.directory = Path(directory)
+        self.max_size = float(max_size or DEFAULT_MAX_SIZE)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def read(self, csv_path, sep=',', columns=None):
+        """
+        Retourne le CSV complet, avec les types inférés par pandas.
+
+        ### Description :
+        Seules les colonnes demandées sont converties en DataFrame ; l'entrée contient toujours
+        toutes les colonnes du CSV. Les types de toutes les colonnes, tels que `pd.read_csv` les
+        donne, sont conservés dans `attrs['csv_dtypes']` : `clear_columns` convertit les lignes
+        vers leur type commun comme si toutes les colonnes avaient été lues.
+
+        ### Paramètres :
+        - **csv_path** (str ou Path) : Chemin du fichier CSV.
+        - **sep** (str, optionnel) : Séparateur du CSV.
+        - **columns** (list, optionnel) : Colonnes à retourner. Par défaut, toutes.
+
+        ### Retour :
+        - **pd.DataFrame** : Données du fichier CSV, identiques à celles de `pd.read_csv`.
+
+        ### Exceptions :
+        - `KeyError` : Si une colonne demandée est absente du CSV.
+        """
+        entry = self.entry_path(csv_path, sep, text=False)
+        table = self._open(entry)
+        if table is not None:
+            return project(select_columns(table, columns).to_pandas(), table.schema.empty_table().to_pandas().dtypes)
+
+        df = pd.read_csv(csv_path, encoding='utf-8', sep=sep)
+        try:
+            table = self.pa.Table.from_pandas(df, preserve_index=False)
+        except self.pa.ArrowException:
+            # Colonne de types mélangés : le CSV est utilisé sans être mis en cache
+            return project(df[columns] if columns else df, df.dtypes)
+        self._write(entry, table.schema, [table])
+        return project(select_columns(table, columns).to_pandas(), df.dtypes)
+
+    def read_chunks(self, csv_path, sep=',', columns=None, chunk_size=None):
+        """
+        Parcourt le CSV par blocs de lignes, toutes les valeurs étant lues comme du texte.
+
+        ### Description :
+        Si l'entrée n'existe pas encore, le CSV est lu bloc par bloc et chaque bloc est ajouté à
+        l'entrée : la mémoire reste bornée pendant la création, comme lors de sa lecture.
+
+        ### Paramètres :
+        - **csv_path** (str ou Path) : Chemin du fichier CSV.
+        - **sep** (str, optionnel) : Séparateur du CSV.
+        - **columns** (list, optionnel) : Colonnes à retourner. Par défaut, toutes.
+        - **chunk_size** (int, optionnel) : Nombre de lignes par bloc. Par défaut, un seul bloc.
+
+        ### Retour :
+        - **Iterator[pd.DataFrame]** : Blocs successifs du fichier CSV.
+
+        ### Exceptions :
+        - `KeyError` : Si une colonne demandée est absente du CSV.
+        """
+        entry = self.entry_path(csv_path, sep, text=True)
+        table = self._open(entry)
+        if table is None:
+            header = pd.read_csv(csv_path, encoding='utf-8', sep=sep, nrows=0).columns
+            schema = self.pa.schema([(str(column), self.pa.string()) for column in header])
+            with pd.read_csv(csv_path, encoding='utf-8', sep=sep, dtype=str,
+                             chunksize=chunk_size or 100000) as reader:
+                self._write(entry, schema, (self.pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                                            for chunk in reader))
+            table = self._open(entry)
+
+        table = select_columns(table, columns)
+
+        chunk_size = chunk_size or max(table.num_rows, 1)
+        for offset in range(0, table.num_rows, chunk_size):
+            chunk = table.slice(offset, chunk_size).to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            yield chunk
+
+    def entry_path(self, csv_path, sep=',', text=False):
+        """
+        Retourne le chemin de l'entrée correspondant à l'état actuel d'un fichier CSV.
+
+        ### Paramètres :
+        - **csv_path** (str ou Path) : Chemin du fichier CSV.
+        - **sep** (str, optionnel) : Séparateur du CSV.
+        - **text** (bool, optionnel) : Valeurs lues comme du texte (lecture par blocs).
+
+        ### Retour :
+        - **Path** : Chemin du fichier `.arrow` de l'entrée.
+        """
+        csv_path = Path(csv_path).resolve()
+        stat = csv_path.stat()
+        key = '\x1f'.join(str(value) for value in (
+            CACHE_VERSION, csv_path, stat.st_size, stat.st_mtime_ns, file_hash(csv_path), sep, text
+        ))
+        return self.directory / f"{hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()}.arrow"
+
+    def evict(self, keep=None):
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à ce que le cache respecte `max_size`.
+
+        ### Paramètres :
+        - **keep** (Path, optionnel) : Entrée à conserver, même si elle dépasse à elle seule `max_size`.
+        """
+        entries = sorted(self.directory.glob('*.arrow'), key=lambda path: path.stat().st_mtime)
+        total = sum(path.stat().st_size for path in entries)
+        for path in entries:
+            if total <= self.max_size * 1024 * 1024:
+                break
+            if path == keep:
+                continue
+            size = path.stat().st_size
+            try:
+                path.unlink()
+            except OSError:
+                # Entrée encore ouverte par une autre génération
+                continue
+            total -= size
+
+    def _open(self, entry):
+        if not entry.exists():
+            return None
+        # La date de modification de l'entrée indique sa dernière utilisation (éviction LRU)
+        os.utime(entry)
+        # Les colonnes de la table restent adossées au fichier projeté en mémoire
+        return self.pa.ipc.open_file(self.pa.memory_map(str(entry))).read_all()
+
+    def _write(self, entry, schema, tables):
+        part_path = entry.with_name(entry.name + '.part')
+        try:
+            with self.pa.OSFile(str(part_path), 'wb') as sink:
+                with self.pa.ipc.new_file(sink, schema) as writer:
+                    for table in tables:
+                        writer.write_table(table)
+        except BaseException:
+            if part_path.exists():
+                part_path.unlink()
+            raise
+        os.replace(part_path, entry)
+        self.evict(keep=entry)
+
+
+def select_columns(table, columns):
+    """
+    Retourne les colonnes demandées d'une table Arrow.
+
+    ### Paramètres :
+    - **table** (pyarrow.Table) : Table d'une entrée du cache.
+    - **columns** (list) : Colonnes à retourner. Si vide, toutes.
+
+    ### Retour :
+    - **pyarrow.Table** : Table réduite aux colonnes demandées, dans leur ordre.
+
+    ### Exceptions :
+    - `KeyError` : Si une colonne demandée est absente de la table.
+    """
+    if not columns:
+        return table
+    missing = set(columns) - set(table.column_names)
+    if missing:
+        raise KeyError(f"Colonnes manquants: {missing}")
+    return table.select(columns)
+
+
+def project(df, dtypes):
+    """
+    Retourne les colonnes lues d'un CSV, avec les types de toutes ses colonnes.
+
+    ### Paramètres :
+    - **df** (pd.DataFrame) : Colonnes lues.
+    - **dtypes** (pd.Series) : Types de toutes les colonnes du CSV.
+
+    ### Retour :
+    - **pd.DataFrame** : `df`, dont `attrs['csv_dtypes']` contient la liste des types.
+    """
+    df.attrs['csv_dtypes'] = list(dtypes)
+    return df
+
+
+def file_hash(path):
+    """
+    Calcule l'empreinte du contenu d'un fichier.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier.
+
+    ### Retour :
+    - **str** : Empreinte hexadécimale.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
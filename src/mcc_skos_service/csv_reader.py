@@ -0,0 +1,145 @@
+import csv
+import itertools
+from mcc_skos_service.compression import open_input_text
+
+# Lecteurs du fichier CSV (`csv_reader`)
+CSV_READERS = ('pandas', 'csv', 'pyarrow')
+
+# Valeurs lues comme manquantes, comme avec les `na_values` par défaut de `pd.read_csv`
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+
+class TextChunk:
+    """
+    Classe TextChunk : Bloc de lignes du CSV lu sans pandas.
+
+    ### Description :
+    Les valeurs sont conservées colonne par colonne, sous forme de chaînes telles qu'écrites dans
+    le CSV ; les valeurs manquantes (voir `NA_VALUES`) sont remplacées par `None`.
+    """
+
+    def __init__(self, rows: int, columns: dict):
+        """
+        Initialisation du bloc.
+
+        ### Paramètres :
+        - **rows** (int) : Nombre de lignes du bloc.
+        - **columns** (dict) : Valeurs de chaque colonne lue, une liste par colonne.
+        """
+        self.rows = rows
+        self.columns = columns
+
+    def __len__(self):
+        return self.rows
+
+
+def read_text_chunks(csv_path, sep=',', columns=None, chunk_size=None, reader='csv'):
+    """
+    Lit les colonnes `columns` du fichier CSV sans pandas, en entier ou par blocs de `chunk_size` lignes.
+
+    ### Paramètres :
+    - **csv_path** (str ou Path) : Chemin du fichier CSV, éventuellement compressé (`.gz`, `.bz2`, `.xz`, `.zst`).
+    - **sep** (str, optionnel) : Séparateur du CSV.
+    - **columns** (list, optionnel) : Colonnes à lire.
+    - **chunk_size** (int, optionnel) : Nombre maximal de lignes par bloc. Par défaut, un seul bloc.
+    - **reader** (str, optionnel) : `csv` (module `csv` de la bibliothèque standard) ou `pyarrow`.
+
+    ### Retour :
+    - **Iterator[TextChunk]** : Blocs successifs du fichier CSV.
+
+    ### Exceptions :
+    - `KeyError` : Si une colonne est absente du CSV.
+    - `ImportError` : Si `reader='pyarrow'` et que le package `pyarrow` n'est pas installé.
+    """
+    columns = columns or []
+    if reader == 'pyarrow':
+        return read_arrow_chunks(csv_path, sep, columns, chunk_size)
+    return read_csv_module_chunks(csv_path, sep, columns, chunk_size)
+
+
+def read_csv_module_chunks(csv_path, sep, columns, chunk_size=None):
+    """
+    Lit le fichier CSV avec le module `csv` de la bibliothèque standard (voir `read_text_chunks`).
+
+    ### Description :
+    Comme `pd.read_csv`, les lignes vides sont ignorées et les colonnes absentes d'une ligne trop
+    courte sont manquantes.
+    """
+    with open_input_text(csv_path) as file:
+        rows = csv.reader(file, delimiter=sep)
+        header = next(rows, [])
+        missing = set(columns) - set(header)
+        if missing:
+            raise KeyError(f"Colonnes manquants: {missing}")
+        positions = [header.index(column) for column in columns]
+        rows = (row for row in rows if row)
+
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size)) if chunk_size else list(rows)
+            if not chunk:
+                return
+            values = {}
+            for column, position in zip(columns, positions):
+                values[column] = [
+                    row[position] if position < len(row) and row[position] not in NA_VALUES else None
+                    for row in chunk
+                ]
+            yield TextChunk(len(chunk), values)
+
+
+def read_arrow_chunks(csv_path, sep, columns, chunk_size=None):
+    """
+    Lit le fichier CSV avec le lecteur en continu de `pyarrow.csv` (voir `read_text_chunks`).
+
+    ### Description :
+    Le CSV est analysé par blocs d'octets, en plusieurs threads ; les blocs de plus de `chunk_size`
+    lignes sont découpés.
+    """
+    pa = pyarrow_module("csv_reader='pyarrow'")
+    import pyarrow.csv
+
+    convert_options = pyarrow.csv.ConvertOptions(
+        include_columns=columns or None,
+        column_types={column: pa.string() for column in columns},
+        null_values=sorted(NA_VALUES),
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=True,
+    )
+    try:
+        reader = pyarrow.csv.open_csv(str(csv_path), parse_options=pyarrow.csv.ParseOptions(delimiter=sep),
+                                      convert_options=convert_options)
+    except pa.ArrowKeyError as exc:
+        raise KeyError(f"Colonnes manquants: {exc}") from None
+
+    with reader:
+        for batch in reader:
+            step = chunk_size or max(batch.num_rows, 1)
+            for offset in range(0, batch.num_rows, step):
+                part = batch.slice(offset, step)
+                yield TextChunk(part.num_rows, {column: part.column(column).to_pylist() for column in columns})
+
+
+def pyarrow_module(feature):
+    """
+    Importe le package optionnel `pyarrow`.
+
+    ### Paramètres :
+    - **feature** (str) : Paramètre qui nécessite `pyarrow`, cité dans le message d'erreur.
+
+    ### Retour :
+    - **module** : Le module `pyarrow`, avec `pyarrow.ipc`.
+
+    ### Exceptions :
+    - `ImportError` : Si le package n'est pas installé.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise ImportError(
+            f"'{feature}' nécessite le package 'pyarrow' (pip install pyarrow, ou pip install .[pyarrow])."
+        ) from None
+    return pyarrow
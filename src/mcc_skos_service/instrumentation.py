@@ -0,0 +1,190 @@
+import json
+import time
+from contextlib import contextmanager
+
+# Phases mesurées par `make_skos`, dans l'ordre d'exécution
+PHASES = ('load_params', 'read', 'clean', 'build', 'serialize')
+
+# Compteurs rapportés par `make_skos`
+COUNTERS = ('rows_read', 'concepts_created', 'main_concepts_deduplicated', 'narrower_concepts_deduplicated',
+            'near_duplicate_labels', 'triples_emitted', 'bytes_written')
+
+
+class Instrumentation:
+    """
+    Classe Instrumentation : Mesure la durée des phases et les compteurs d'une génération SKOS.
+
+    ### Description :
+    Les durées sont cumulées par phase (`load_params`, `read`, `clean`, `build`, `serialize`) et les
+    compteurs sont incrémentés bloc par bloc. Les événements sont envoyés au `sink`, un callable
+    qui reçoit un dictionnaire :
+    - `progress` : compteurs, durées et débit (lignes par seconde), au plus une fois par `interval`
+      secondes pendant la génération. Un événement peut être envoyé après chaque bloc du CSV (mise
+      à jour des compteurs) et à la fin de chaque phase (champ `phase` : la phase terminée) ; aucun
+      n'est envoyé pendant une phase. `csv_chunk_size` détermine donc la finesse du suivi ;
+    - `summary` : bilan final, avec le statut (`ok` ou `error`) et le fichier généré.
+
+    Sans `sink`, l'instrumentation est désactivée et ne coûte presque rien. Avec un `profiler`
+    (voir `PhaseProfiler`), chaque phase est aussi profilée.
+    """
+
+    def __init__(self, sink=None, interval: float = 5.0, start: float = None, profiler=None):
+        """
+        Initialisation de l'instrumentation.
+
+        ### Paramètres :
+        - **sink** (callable, optionnel) : Fonction appelée avec chaque événement.
+        - **interval** (float, optionnel) : Intervalle minimal entre deux événements `progress`, en secondes.
+        - **start** (float, optionnel) : Début de la génération (`time.perf_counter()`). Par défaut, maintenant.
+        - **profiler** (PhaseProfiler, optionnel) : Profilage des phases (mode `profile` de `make_skos`).
+        """
+        self.sink = sink
+        self.profiler = profiler
+        self.enabled = sink is not None
+        self.interval = interval
+        self.start = time.perf_counter() if start is None else start
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._last_sample = self.start
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Mesure la durée d'un bloc de code et l'ajoute à la phase `name`, puis envoie un événement
+        `progress` si `interval` est écoulé.
+
+        ### Paramètres :
+        - **name** (str) : Nom de la phase.
+        """
+        start = time.perf_counter()
+        try:
+            if self.profiler is None:
+                yield
+            else:
+                with self.profiler.phase(name):
+                    yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+        self.checkpoint()
+        if self.enabled and time.perf_counter() - self._last_sample >= self.interval:
+            self.sample(phase=name)
+
+    def record(self, name, seconds):
+        """
+        Ajoute une durée à une phase.
+
+        ### Paramètres :
+        - **name** (str) : Nom de la phase.
+        - **seconds** (float) : Durée en secondes.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name, value=1):
+        """
+        Incrémente un compteur, puis envoie un événement `progress` si `interval` est écoulé.
+
+        ### Paramètres :
+        - **name** (str) : Nom du compteur.
+        - **value** (int, optionnel) : Valeur ajoutée.
+        """
+        self.checkpoint()
+        self.counters[name] = self.counters.get(name, 0) + value
+        if self.enabled and time.perf_counter() - self._last_sample >= self.interval:
+            self.sample()
+
+    def checkpoint(self, final=False):
+        """
+        Point où la génération peut être interrompue : après chaque bloc du CSV (`count`), à la fin de
+        chaque phase et juste avant l'écriture définitive du fichier (`final`). Sans effet ici, voir
+        `CancellableInstrumentation`.
+
+        ### Paramètres :
+        - **final** (bool, optionnel) : Dernier point avant l'écriture définitive du fichier.
+        """
+
+    def sample(self, **fields):
+        """
+        Envoie un événement `progress` avec l'état courant.
+
+        ### Paramètres :
+        - **fields** : Champs ajoutés à l'événement (ex. `phase`).
+        """
+        self._last_sample = time.perf_counter()
+        self.emit('progress', **fields)
+
+    def finish(self, status='ok', output=None, error=None):
+        """
+        Envoie l'événement `summary` de la génération.
+
+        ### Paramètres :
+        - **status** (str, optionnel) : `ok` ou `error`.
+        - **output** (str, optionnel) : Fichier généré.
+        - **error** (str, optionnel) : Message d'erreur.
+        """
+        self.emit('summary', status=status, output=str(output) if output else None, error=error)
+
+    def snapshot(self):
+        """
+        Retourne l'état courant des mesures.
+
+        ### Retour :
+        - **dict** : Durée écoulée, durées par phase, compteurs et débit en lignes par seconde.
+        """
+        elapsed = time.perf_counter() - self.start
+        return {
+            'elapsed': elapsed,
+            'phases': dict(self.phases),
+            'counters': dict(self.counters),
+            'rows_per_second': self.counters['rows_read'] / elapsed if elapsed else 0.0,
+        }
+
+    def emit(self, event, **fields):
+        """
+        Envoie un événement au `sink`.
+
+        ### Paramètres :
+        - **event** (str) : Type d'événement.
+        - **fields** : Champs ajoutés à l'état courant.
+        """
+        if self.enabled:
+            self.sink({'event': event, 'timestamp': time.time(), **self.snapshot(), **fields})
+
+
+def create_instrumentation(sink, interval=None, start=None, profiler=None):
+    """
+    Crée l'instrumentation d'une génération à partir du paramètre `instrumentation` de `make_skos`.
+
+    ### Paramètres :
+    - **sink** (callable, str ou Instrumentation) : Fonction qui reçoit les événements, ou chemin d'un
+      fichier JSON Lines où les écrire. `None` désactive l'instrumentation. Une `Instrumentation` déjà
+      construite (ex. par `make_skos_async`) est utilisée telle quelle, avec l'intervalle `interval`.
+    - **interval** (float, optionnel) : Intervalle entre deux événements `progress`, en secondes (5 par défaut).
+    - **start** (float, optionnel) : Début de la génération (`time.perf_counter()`).
+    - **profiler** (PhaseProfiler, optionnel) : Profilage des phases.
+
+    ### Retour :
+    - **Instrumentation** : Instrumentation, désactivée si `sink` est vide.
+    """
+    if isinstance(sink, Instrumentation):
+        sink.interval = float(interval or sink.interval)
+        sink.profiler = profiler
+        return sink
+    if sink and not callable(sink):
+        sink = json_lines_sink(sink)
+    return Instrumentation(sink or None, float(interval or 5.0), start, profiler)
+
+
+def json_lines_sink(path):
+    """
+    Crée un `sink` qui ajoute chaque événement sur une ligne JSON d'un fichier.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier JSON Lines.
+
+    ### Retour :
+    - **callable** : Fonction qui reçoit un événement.
+    """
+    def write(event):
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(event, ensure_ascii=False) + '\n')
+    return write
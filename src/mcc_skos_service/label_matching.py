@@ -0,0 +1,189 @@
+import re
+import unicodedata
+
+# Modes de détection des labels quasi identiques (`near_duplicates`)
+NEAR_DUPLICATE_MODES = ('report', 'merge')
+
+# Similarité minimale (Jaccard des trigrammes de caractères) de deux labels quasi identiques
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+# Taille des n-grammes de caractères comparés
+NGRAM_SIZE = 3
+
+# Signature MinHash : `MINHASH_BANDS` bandes de `MINHASH_ROWS` valeurs. Deux labels sont comparés
+# si toutes les valeurs d'une bande sont égales (probabilité 1 - (1 - J^4)^8 : 98 % pour J = 0.8,
+# 40 % pour J = 0.5, 5 % pour J = 0.3).
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+
+# Nombre de labels dont les n-grammes sont traités à la fois
+MINHASH_BATCH_SIZE = 100_000
+
+# Au-delà de ce nombre de labels repliés, seuls les couples proposés par MinHash sont comparés
+# (en deçà, tous les couples le sont)
+EXACT_COMPARISON_LIMIT = 64
+
+# Graine des permutations MinHash : les mêmes labels donnent toujours les mêmes groupes
+MINHASH_SEED = 20240101
+
+WHITESPACE = re.compile(r'\s+')
+DIGITS = re.compile(r'\d+')
+
+
+def fold_label(label):
+    """
+    Réduit un label à sa forme de comparaison : sans accents, en minuscules, espaces normalisés.
+
+    ### Paramètres :
+    - **label** (str) : Label.
+
+    ### Retour :
+    - **str** : Label replié (ex. `"  Céramique\\t"` → `"ceramique"`).
+    """
+    decomposed = unicodedata.normalize('NFKD', label)
+    if not decomposed.isascii():
+        decomposed = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return WHITESPACE.sub(' ', decomposed.casefold()).strip()
+
+
+def label_ngrams(folded):
+    """
+    Retourne les n-grammes de caractères d'un label replié, bordé d'une espace de chaque côté.
+
+    ### Paramètres :
+    - **folded** (str) : Label replié (voir `fold_label`).
+
+    ### Retour :
+    - **set** : N-grammes de `NGRAM_SIZE` caractères.
+    """
+    padded = f' {folded} '.ljust(NGRAM_SIZE)
+    return {padded[index:index + NGRAM_SIZE] for index in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def cluster_labels(labels, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Regroupe les labels quasi identiques.
+
+    ### Description :
+    Les labels sont d'abord repliés (`fold_label`) : ceux de même forme repliée sont regroupés sans
+    comparaison. Les autres formes sont parcourues dans l'ordre d'apparition : chacune rejoint le
+    groupe d'une forme retenue plus ancienne si la similarité de Jaccard de leurs trigrammes atteint
+    `threshold`, sinon elle devient elle-même une forme retenue. Chaque label est donc comparé au label
+    retenu de son groupe, et non à un autre membre : des labels voisins de proche en proche (ex.
+    `Catégorie 1`, `Catégorie 2`...) ne sont pas enchaînés. Deux labels dont les nombres diffèrent ne
+    sont jamais regroupés.
+
+    Au-delà de `EXACT_COMPARISON_LIMIT` formes, seuls les couples candidats proposés par un index
+    MinHash (bandes de signatures calculées avec numpy sur les trigrammes) sont comparés, au lieu de
+    tous les couples : le temps reste proportionnel au nombre de labels.
+
+    ### Paramètres :
+    - **labels** (iterable) : Labels, dans l'ordre de leur première apparition (les doublons exacts sont ignorés).
+    - **threshold** (float, optionnel) : Similarité minimale, entre 0 et 1. Avec 1, seuls les labels de même
+      forme repliée sont regroupés.
+
+    ### Retour :
+    - **list** : Groupes d'au moins deux labels, chacun dans l'ordre d'apparition : le premier est le label retenu.
+    """
+    labels = list(dict.fromkeys(labels))
+    keys = {}
+    label_keys = [keys.setdefault(fold_label(label), len(keys)) for label in labels]
+    folded = list(keys)
+
+    # Forme retenue de chaque forme repliée (elle-même si elle n'a rejoint aucun groupe)
+    canonicals = list(range(len(folded)))
+    if threshold < 1 and len(folded) > 1:
+        if len(folded) <= EXACT_COMPARISON_LIMIT:
+            candidates = [(first, second) for second in range(len(folded)) for first in range(second)]
+        else:
+            candidates = sorted(minhash_candidates(folded), key=lambda pair: (pair[1], pair[0]))
+        ngrams = {}
+        numbers = {}
+
+        def features(index):
+            if index not in ngrams:
+                ngrams[index] = label_ngrams(folded[index])
+                numbers[index] = DIGITS.findall(folded[index])
+            return ngrams[index], numbers[index]
+
+        best = {}
+        for first, second in candidates:
+            # Les couples sont triés par second label : la forme retenue `first` est déjà connue
+            if canonicals[first] != first:
+                continue
+            first_ngrams, first_numbers = features(first)
+            second_ngrams, second_numbers = features(second)
+            if first_numbers != second_numbers:
+                continue
+            similarity = len(first_ngrams & second_ngrams) / len(first_ngrams | second_ngrams)
+            if similarity >= threshold and similarity > best.get(second, 0.0):
+                # Le label rejoint la forme retenue la plus proche
+                best[second] = similarity
+                canonicals[second] = first
+
+    clusters = {}
+    for label, key in zip(labels, label_keys):
+        clusters.setdefault(canonicals[key], []).append(label)
+    return [cluster for cluster in clusters.values() if len(cluster) > 1]
+
+
+def minhash_candidates(folded):
+    """
+    Retourne les couples de labels repliés qui partagent une bande de signature MinHash.
+
+    ### Description :
+    Chaque trigramme est codé sans perte par ses trois points de code (21 bits chacun). Les
+    signatures sont calculées par lots de labels, une permutation à la fois (`np.minimum.reduceat`).
+    Dans chaque bande, les labels de même valeur sont reliés au premier d'entre eux.
+
+    ### Paramètres :
+    - **folded** (list) : Labels repliés, distincts.
+
+    ### Retour :
+    - **set** : Couples `(i, j)` d'indices dans `folded`, avec `i < j`.
+    """
+    import numpy as np
+
+    count = len(folded)
+    if count < 2:
+        return set()
+    random = np.random.RandomState(MINHASH_SEED)
+    size = MINHASH_BANDS * MINHASH_ROWS
+    multipliers = random.randint(1, 2**63, size=size, dtype=np.uint64) | np.uint64(1)
+    increments = random.randint(0, 2**63, size=size, dtype=np.uint64)
+
+    band_keys = np.empty((MINHASH_BANDS, count), dtype=np.uint64)
+    for start in range(0, count, MINHASH_BATCH_SIZE):
+        batch = [f' {label} '.ljust(NGRAM_SIZE) for label in folded[start:start + MINHASH_BATCH_SIZE]]
+        lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+        codes = np.frombuffer(''.join(batch).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        gram_counts = lengths - NGRAM_SIZE + 1
+        offsets = np.cumsum(gram_counts) - gram_counts
+        positions = (np.repeat(np.cumsum(lengths) - lengths - offsets, gram_counts)
+                     + np.arange(int(gram_counts.sum())))
+        grams = (codes[positions] << np.uint64(42)) | (codes[positions + 1] << np.uint64(21)) | codes[positions + 2]
+
+        signature = np.empty((size, len(batch)), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for index in range(size):
+                hashed = (grams * multipliers[index] + increments[index]) >> np.uint64(32)
+                signature[index] = np.minimum.reduceat(hashed, offsets)
+            for band in range(MINHASH_BANDS):
+                key = np.zeros(len(batch), dtype=np.uint64)
+                for row in signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]:
+                    key = key * np.uint64(0x9E3779B97F4A7C15) + row
+                band_keys[band, start:start + len(batch)] = key
+
+    pairs = set()
+    for key in band_keys:
+        order = np.argsort(key, kind='stable')
+        ordered = key[order]
+        same = np.empty(count, dtype=bool)
+        same[0] = False
+        same[1:] = ordered[1:] == ordered[:-1]
+        if not same.any():
+            continue
+        # Premier label de chaque groupe de même valeur, relié aux suivants
+        run_starts = np.maximum.accumulate(np.where(same, 0, np.arange(count)))
+        pairs.update(zip(order[run_starts[same]].tolist(), order[same].tolist()))
+    return {(min(pair), max(pair)) for pair in pairs}
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from rdflib import URIRef
+from mcc_skos_service.uri_minter import PATH_SEPARATOR
+
+MANIFEST_VERSION = 1
+
+
+class ConceptManifest:
+    """
+    Classe ConceptManifest : Fichier compagnon du fichier SKOS généré, utilisé par les options
+    `stable_uris` et `incremental`.
+
+    ### Description :
+    Le manifeste associe l'identité de chaque concept (son chemin de labels, voir `UriMinter`)
+    à son URI et à une empreinte de son contenu (label, définition, notes). Lors d'une nouvelle
+    génération :
+    - les concepts déjà connus gardent leur URI, même en mode `random` ;
+    - les concepts ajoutés, supprimés ou modifiés sont détectés et peuvent être écrits dans
+      un fichier delta ;
+    - si rien n'a changé, le fichier SKOS existant n'est pas réécrit.
+
+    Avec `stable_uris` seul, le CSV est lu en entier, tous les concepts sont construits et le fichier
+    SKOS est entièrement réécrit dès qu'un concept a changé. En mode incrémental (`patch`), les
+    concepts dont l'empreinte n'a pas changé sont retenus dans `unchanged` : ils ne sont pas
+    reconstruits, et leurs lignes sont recopiées du fichier existant (voir `SkosLineWriter.copy_lines`),
+    sans celles des concepts supprimés ou modifiés (`replaced_uris`).
+    """
+
+    def __init__(self, path, fingerprint=''):
+        """
+        Initialisation du manifeste. Le manifeste précédent est chargé s'il existe.
+
+        ### Paramètres :
+        - **path** (str ou Path) : Chemin du fichier manifeste (JSON).
+        - **fingerprint** (str, optionnel) : Empreinte des paramètres qui ne dépendent pas du CSV
+          (schéma, namespace, format) ; si elle change, le fichier SKOS est toujours réécrit.
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.previous = {}
+        self.previous_fingerprint = None
+        self.scheme_uri = None
+        self.delta_path = None
+        self.current = {}
+        self.patch = False
+        self.unchanged = set()
+
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') == MANIFEST_VERSION:
+                self.previous = data['concepts']
+                self.previous_fingerprint = data.get('fingerprint')
+                self.scheme_uri = URIRef(data['scheme']) if data.get('scheme') else None
+
+    def resolve(self, names, contents, mint_new):
+        """
+        Retourne l'URI de chaque concept : celle du manifeste précédent si le concept est connu,
+        sinon une nouvelle URI générée par `mint_new`.
+
+        ### Paramètres :
+        - **names** (list) : Identités des concepts (chemins de labels).
+        - **contents** (list) : Contenu de chaque concept, utilisé pour détecter les modifications.
+        - **mint_new** (callable) : Fonction qui génère les URIs d'une liste d'identités inconnues.
+
+        ### Retour :
+        - **list** : URIs (`URIRef`) dans l'ordre de `names`.
+        """
+        unknown = [name for name in names if name not in self.previous]
+        new_uris = dict(zip(unknown, mint_new(unknown)))
+
+        uris = []
+        for name, content in zip(names, contents):
+            known = self.previous.get(name)
+            uri = URIRef(known[0]) if known else new_uris[name]
+            digest = content_hash(content)
+            self.current[name] = [str(uri), digest]
+            if self.patch and known and known[1] == digest:
+                self.unchanged.add(uri)
+            uris.append(uri)
+        return uris
+
+    def delta(self):
+        """
+        Compare le manifeste courant au précédent.
+
+        ### Retour :
+        - **dict** : Identités des concepts `added`, `removed` et `modified`.
+        """
+        return {
+            'added': [name for name in self.current if name not in self.previous],
+            'removed': [name for name in self.previous if name not in self.current],
+            'modified': [
+                name for name, (_, digest) in self.current.items()
+                if name in self.previous and self.previous[name][1] != digest
+            ],
+        }
+
+    def replaced_uris(self):
+        """
+        Retourne les URIs des concepts dont les lignes du fichier existant ne doivent pas être recopiées.
+
+        ### Retour :
+        - **set** : URIs des concepts supprimés et modifiés depuis la génération précédente.
+        """
+        delta = self.delta()
+        return ({self.previous[name][0] for name in delta['removed']}
+                | {self.current[name][0] for name in delta['modified']})
+
+    def has_changes(self):
+        """
+        Indique si le fichier SKOS doit être réécrit.
+
+        ### Retour :
+        - **bool** : `True` si un concept ou les paramètres du schéma ont changé.
+        """
+        if self.fingerprint != self.previous_fingerprint:
+            return True
+        return any(self.delta().values())
+
+    def save(self):
+        """
+        Écrit le manifeste courant à la place du précédent.
+        """
+        part_path = self.path.with_name(self.path.name + '.part')
+        with open(part_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'fingerprint': self.fingerprint,
+                'scheme': str(self.scheme_uri),
+                'concepts': self.current,
+            }, file, ensure_ascii=False)
+        os.replace(part_path, self.path)
+
+    def write_delta(self, path):
+        """
+        Écrit le fichier delta des concepts ajoutés, supprimés et modifiés.
+
+        ### Paramètres :
+        - **path** (str ou Path) : Chemin du fichier delta (JSON).
+
+        ### Retour :
+        - **dict** : Nombre de concepts par type de changement.
+        """
+        delta = self.delta()
+        entries = {}
+        for change, names in delta.items():
+            source = self.previous if change == 'removed' else self.current
+            entries[change] = [
+                {'uri': source[name][0], 'path': name.split(PATH_SEPARATOR)}
+                for name in names
+            ]
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(entries, file, ensure_ascii=False, indent=2)
+        return {change: len(names) for change, names in delta.items()}
+
+
+def content_hash(content):
+    """
+    Calcule l'empreinte courte du contenu d'un concept.
+
+    ### Paramètres :
+    - **content** (str) : Contenu du concept.
+
+    ### Retour :
+    - **str** : Empreinte hexadécimale (16 caractères).
+    """
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
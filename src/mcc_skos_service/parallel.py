@@ -0,0 +1,89 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from rdflib import URIRef, Namespace
+from mcc_skos_service.skos_service import emit_concepts
+from mcc_skos_service.skos_writer import SkosFragmentWriter, SkosLineWriter, SkosLineFragmentWriter
+
+
+class ShardPool:
+    """
+    Classe ShardPool : Construit les concepts des blocs du CSV dans un pool de processus.
+
+    ### Description :
+    Le processus principal lit le CSV, nettoie les colonnes, génère les URIs et dédoublonne les
+    concepts principaux ; chaque bloc de lignes est ensuite envoyé à un processus qui crée ses
+    concepts (`emit_concepts`) dans un fragment RDF/XML, N-Triples ou N-Quads. Les fragments sont écrits dans le fichier
+    de sortie dans l'ordre des blocs. Le nombre de blocs en cours est limité pour que la mémoire
+    reste bornée.
+    """
+
+    def __init__(self, g, NS: Namespace, concept_scheme_uri, workers: int):
+        """
+        Initialisation du pool.
+
+        ### Paramètres :
+        - **g** (SkosXmlWriter ou SkosLineWriter) : Écrivain du fichier de sortie.
+        - **NS** (Namespace) : Namespace pour les URIs.
+        - **concept_scheme_uri** (URIRef) : URI du schéma SKOS.
+        - **workers** (int) : Nombre de processus.
+        """
+        self.g = g
+        self.namespace = str(NS)
+        self.concept_scheme_uri = str(concept_scheme_uri)
+        self.line_format = isinstance(g, SkosLineWriter)
+        self.graph_name = str(g.graph_name) if self.line_format and g.graph_name is not None else None
+        self.max_pending = workers * 2
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._pending = deque()
+
+    def submit(self, groups):
+        """
+        Envoie les groupes de concepts d'un bloc à un processus.
+
+        ### Paramètres :
+        - **groups** (list) : Groupes de concepts (voir `emit_concepts`).
+        """
+        self._pending.append(self._executor.submit(build_fragment, self.namespace, self.concept_scheme_uri, groups,
+                                                   self.line_format, self.graph_name))
+        while len(self._pending) > self.max_pending:
+            self.g.write_fragment(self._pending.popleft().result())
+
+    def close(self):
+        """
+        Écrit les fragments restants dans l'ordre, puis arrête les processus.
+        """
+        try:
+            while self._pending:
+                self.g.write_fragment(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+
+    def abort(self):
+        """
+        Abandonne les fragments restants (en cas d'erreur) : les blocs en attente sont annulés et
+        les processus arrêtés.
+        """
+        self._pending.clear()
+        self._executor.shutdown(cancel_futures=True)
+
+
+def build_fragment(namespace, concept_scheme_uri, groups, line_format=False, graph_name=None):
+    """
+    Crée les concepts d'un bloc dans un fragment (exécuté dans un processus du pool).
+
+    ### Paramètres :
+    - **namespace** (str) : Namespace pour les URIs.
+    - **concept_scheme_uri** (str) : URI du schéma SKOS.
+    - **groups** (list) : Groupes de concepts (voir `emit_concepts`).
+    - **line_format** (bool, optionnel) : Écrit le fragment en N-Triples (ou N-Quads) au lieu de RDF/XML.
+    - **graph_name** (str, optionnel) : Graphe nommé des quadruplets (N-Quads).
+
+    ### Retour :
+    - **str** : Fragment des concepts du bloc.
+    """
+    if line_format:
+        writer = SkosLineFragmentWriter(URIRef(graph_name) if graph_name else None)
+    else:
+        writer = SkosFragmentWriter()
+    emit_concepts(groups, writer, Namespace(namespace), URIRef(concept_scheme_uri))
+    return writer.getvalue()
@@ -0,0 +1,217 @@
+import uuid
+from pathlib import Path
+from mcc_skos_service.compression import COMPRESSION_SUFFIXES, infer_compression
+from mcc_skos_service.csv_reader import CSV_READERS
+from mcc_skos_service.label_matching import NEAR_DUPLICATE_MODES, NEAR_DUPLICATE_THRESHOLD
+from mcc_skos_service.concept_index import CONCEPT_INDEXES, CONCEPT_INDEX_CACHE_SIZE
+
+# Nombre de lignes par bloc en mode parallèle, si `csv_chunk_size` n'est pas renseigné
+PARALLEL_CHUNK_SIZE = 20000
+
+# Formats de sortie : extension du fichier et format de sérialisation rdflib
+# (pour `xml`, le format dépend du mode : `pretty-xml` ou `xml`)
+OUTPUT_FORMATS = {
+    'xml': ('.xml', None),
+    'ntriples': ('.nt', 'nt'),
+    'nquads': ('.nq', 'nquads'),
+    'turtle': ('.ttl', 'turtle'),
+    'json-ld': ('.jsonld', 'json-ld'),
+}
+
+# Formats écrits ligne par ligne, compatibles avec l'écriture en continu et le mode parallèle
+LINE_FORMATS = ('ntriples', 'nquads')
+
+
+def load_params(settings, params):
+    """
+    Charge les paramètres par défaut à partir d'un objet `settings` si les valeurs des paramètres sont `None`.
+
+    ### Paramètres :
+    - **settings** : Objet contenant les paramètres par défaut.
+    - **params** (dict) : Dictionnaire de paramètres utilisateur.
+
+    ### Retour :
+    - **dict** : Dictionnaire mis à jour avec les paramètres par défaut.
+    """
+    for key, value in params.items():
+        if value is None:
+            params[key] = getattr(settings, key.upper(), None)
+            
+    params['output_file_name'] = params['output_file_name'] or str(uuid.uuid4())
+    params['output_file_path'] = params['output_file_path'] or '/'
+    params['main_project_root'] = params['main_project_root'] or '/workspaces'
+    params['imbrique'] = params['imbrique'] or False
+    params['csv_separateur'] = params['csv_separateur'] or ','
+    params['output_backend'] = params['output_backend'] or 'graph'
+    params['output_format'] = params['output_format'] or 'xml'
+    params['output_compression'] = params['output_compression'] or infer_compression(params['output_file_name'])
+    params['uri_mode'] = params['uri_mode'] or 'random'
+    params['csv_reader'] = params['csv_reader'] or 'pandas'
+    params['incremental'] = params['incremental'] or False
+    # Le mode incrémental compare les concepts au manifeste des URIs stables
+    params['stable_uris'] = params['stable_uris'] or params['incremental']
+    params['stable_uris_delta'] = params['stable_uris_delta'] or False
+    params['append'] = params['append'] or False
+    params['near_duplicate_threshold'] = float(params['near_duplicate_threshold'] or NEAR_DUPLICATE_THRESHOLD)
+    params['concept_index'] = params['concept_index'] or 'memory'
+    params['concept_index_cache_size'] = int(params['concept_index_cache_size'] or CONCEPT_INDEX_CACHE_SIZE)
+    params['profile'] = params['profile'] or False
+    params['parallel_workers'] = int(params['parallel_workers'] or 1)
+    params['instrumentation_interval'] = float(params['instrumentation_interval'] or 5.0)
+    if params['parallel_workers'] > 1:
+        # Le CSV est découpé en blocs de lignes traités par les processus
+        params['csv_chunk_size'] = params['csv_chunk_size'] or PARALLEL_CHUNK_SIZE
+    
+    
+    if not params['csv_path']:
+        raise FileNotFoundError(f"Invalid CSV file path: '{params['csv_path']}'" )
+    
+    # Vérifier si imbrique=True, que les colonnes nécessaires sont spécifiées
+    if params['imbrique']:
+        if not params['skos_main_concept_preflabel_columns'] or params['skos_main_concept_preflabel_columns'] == ['']:
+            raise ValueError(
+                "Lorsque 'imbrique=True', 'skos_main_concept_preflabel_columns' est obligatoire. "
+                "Veuillez spécifier les colonnes pour les labels des concepts principaux."
+            )
+    else:
+        if not params['concept_main_name']:
+            raise ValueError(
+                "Lorsque 'imbrique=False', 'concept_main_name' est obligatoire. "
+                "Veuillez fournir un nom pour le concept principal."
+            )
+    
+    if params['csv_chunk_size'] is not None and int(params['csv_chunk_size']) <= 0:
+        raise ValueError(f"'csv_chunk_size' doit être un entier positif : '{params['csv_chunk_size']}'.")
+
+    if params['csv_cache_max_size'] is not None and float(params['csv_cache_max_size']) <= 0:
+        raise ValueError(f"'csv_cache_max_size' doit être positif : '{params['csv_cache_max_size']}'.")
+
+    if params['csv_reader'] not in CSV_READERS:
+        raise ValueError(
+            f"'csv_reader' invalide : '{params['csv_reader']}'. "
+            f"Valeurs possibles : {', '.join(repr(value) for value in CSV_READERS)}."
+        )
+
+    if params['csv_cache_dir'] and params['csv_reader'] != 'pandas':
+        raise ValueError("Le cache des CSV ('csv_cache_dir') nécessite 'csv_reader' = 'pandas'.")
+
+    if params['uri_mode'] not in ('random', 'deterministic'):
+        raise ValueError(
+            f"'uri_mode' invalide : '{params['uri_mode']}'. "
+            "Valeurs possibles : 'random', 'deterministic'."
+        )
+
+    if params['output_backend'] not in ('graph', 'stream', 'buffer'):
+        raise ValueError(
+            f"'output_backend' invalide : '{params['output_backend']}'. "
+            "Valeurs possibles : 'graph', 'stream', 'buffer'."
+        )
+
+    if params['output_format'] not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"'output_format' invalide : '{params['output_format']}'. "
+            f"Valeurs possibles : {', '.join(repr(value) for value in OUTPUT_FORMATS)}."
+        )
+
+    if params['output_compression'] is not None and params['output_compression'] not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"'output_compression' invalide : '{params['output_compression']}'. "
+            "Valeurs possibles : 'gzip', 'zstd'."
+        )
+
+    if params['output_backend'] == 'stream' and params['output_format'] not in ('xml',) + LINE_FORMATS:
+        raise ValueError(
+            "Lorsque 'output_backend' est 'stream', 'output_format' doit être 'xml', 'ntriples' ou 'nquads'."
+        )
+
+    if params['parallel_workers'] > 1 and params['output_backend'] != 'stream':
+        raise ValueError(
+            "Lorsque 'parallel_workers' est supérieur à 1, 'output_backend' doit être 'stream'."
+        )
+
+    if params['append'] and params['output_backend'] != 'stream':
+        raise ValueError("Lorsque 'append=True', 'output_backend' doit être 'stream'.")
+
+    if params['incremental'] and (params['output_backend'] != 'stream' or params['output_format'] not in LINE_FORMATS):
+        raise ValueError(
+            "Lorsque 'incremental=True', 'output_backend' doit être 'stream' et 'output_format' 'ntriples' ou 'nquads'."
+        )
+
+    if params['append'] and params['incremental']:
+        raise ValueError("'append' et 'incremental' ne peuvent pas être utilisés ensemble.")
+
+    if params['append'] and params['stable_uris']:
+        raise ValueError("'append' et 'stable_uris' ne peuvent pas être utilisés ensemble.")
+
+    if params['near_duplicates'] and params['near_duplicates'] not in NEAR_DUPLICATE_MODES:
+        raise ValueError(
+            f"'near_duplicates' invalide : '{params['near_duplicates']}'. "
+            f"Valeurs possibles : {', '.join(repr(value) for value in NEAR_DUPLICATE_MODES)}."
+        )
+
+    if params['near_duplicates'] and not params['imbrique']:
+        raise ValueError("'near_duplicates' nécessite 'imbrique=True'.")
+
+    if not 0 < params['near_duplicate_threshold'] <= 1:
+        raise ValueError(
+            f"'near_duplicate_threshold' doit être compris entre 0 et 1 : '{params['near_duplicate_threshold']}'."
+        )
+
+    if params['concept_index'] not in CONCEPT_INDEXES:
+        raise ValueError(
+            f"'concept_index' invalide : '{params['concept_index']}'. "
+            f"Valeurs possibles : {', '.join(repr(value) for value in CONCEPT_INDEXES)}."
+        )
+
+    if params['concept_index'] == 'sqlite' and not params['imbrique']:
+        raise ValueError("'concept_index' = 'sqlite' nécessite 'imbrique=True'.")
+
+    if params['concept_index'] == 'sqlite' and params['output_backend'] != 'stream':
+        raise ValueError("Lorsque 'concept_index' est 'sqlite', 'output_backend' doit être 'stream'.")
+
+    if params['concept_index_cache_size'] <= 0:
+        raise ValueError(
+            f"'concept_index_cache_size' doit être un entier positif : '{params['concept_index_cache_size']}'."
+        )
+
+    if params['instrumentation_interval'] <= 0:
+        raise ValueError(
+            f"'instrumentation_interval' doit être positif : '{params['instrumentation_interval']}'."
+        )
+    
+    return params
+
+
+def get_output_path(params):
+    """
+    Construit le chemin complet du fichier SKOS à générer.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+
+    ### Retour :
+    - **Path** : Chemin du fichier, avec l'extension de `output_format` (ex. `.xml`), suivie de celle
+      de `output_compression` (ex. `.xml.gz`).
+    """
+    final_path = Path(params['main_project_root'],params['output_file_path'], params['output_file_name'])
+    suffix = OUTPUT_FORMATS[params['output_format']][0]
+    compression_suffix = COMPRESSION_SUFFIXES.get(params['output_compression'], '')
+
+    if compression_suffix and final_path.suffix == compression_suffix:
+        final_path = final_path.with_suffix('')
+    if final_path.suffix != suffix:
+        final_path = Path(f"{final_path}{suffix}")
+    return Path(f"{final_path}{compression_suffix}")
+
+def get_serialization_format(params, xml_format):
+    """
+    Retourne le format de sérialisation rdflib correspondant à `output_format`.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **xml_format** (str) : Format rdflib utilisé pour `output_format='xml'` (`pretty-xml` ou `xml`).
+
+    ### Retour :
+    - **str** : Format rdflib.
+    """
+    return OUTPUT_FORMATS[params['output_format']][1] or xml_format
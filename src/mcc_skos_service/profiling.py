@@ -0,0 +1,234 @@
+import cProfile
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+# Nombre de lignes de code rapportées par phase dans le résumé des allocations
+PROFILE_TOP_ALLOCATIONS = 25
+
+# Part minimale du temps d'une phase pour qu'une pile figure dans le flamegraph (sinon comptée dans son parent)
+FLAMEGRAPH_MIN_SHARE = 0.001
+
+# Profondeur maximale des piles du flamegraph
+FLAMEGRAPH_MAX_DEPTH = 64
+
+# Allocations ignorées : celles du module tracemalloc et du profilage lui-même
+IGNORED_FILES = (tracemalloc.__file__, __file__)
+
+
+class PhaseProfiler:
+    """
+    Classe PhaseProfiler : Profil CPU (cProfile) et mémoire (tracemalloc) d'une génération, par phase.
+
+    ### Description :
+    Utilisé par `make_skos` avec `profile=True` : chaque phase de l'instrumentation (`load_params`,
+    `read`, `clean`, `build`, `serialize`) a son propre `cProfile.Profile`, activé seulement pendant
+    la phase et cumulé sur ses occurrences (une par bloc du CSV). Les allocations sont suivies avec
+    tracemalloc : les traces sont effacées à l'entrée de chaque occurrence, si bien que l'instantané
+    pris à sa sortie ne contient que les blocs alloués pendant la phase et encore utilisés (son coût
+    ne dépend pas de la mémoire déjà occupée, ex. par le graphe rdflib). Ces blocs sont cumulés par
+    ligne de code, avec le pic de la mémoire allouée pendant la phase. Dans une phase imbriquée, les
+    allocations de la phase englobante qui la précèdent ne sont pas comptées.
+
+    Sans `profile`, aucun objet de ce module n'est créé : la génération n'a aucun surcoût.
+    """
+
+    def __init__(self, top: int = PROFILE_TOP_ALLOCATIONS):
+        """
+        Initialisation du profilage. Le suivi des allocations démarre à la première phase.
+
+        ### Paramètres :
+        - **top** (int, optionnel) : Nombre de lignes de code rapportées par phase dans le résumé des allocations.
+        """
+        self.top = top
+        self.profiles = {}
+        self.durations = {}
+        self.peaks = {}
+        self.allocations = {}
+        self._stack = []
+        self._tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Profile un bloc de code et l'ajoute à la phase `name`.
+
+        ### Description :
+        Un seul profileur CPU peut être actif : celui d'une phase englobante est suspendu pendant
+        une phase imbriquée.
+
+        ### Paramètres :
+        - **name** (str) : Nom de la phase.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = cProfile.Profile()
+        if self._stack:
+            self._stack[-1].disable()
+        self._stack.append(profile)
+
+        tracemalloc.clear_traces()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+            self.peaks[name] = max(self.peaks.get(name, 0), tracemalloc.get_traced_memory()[1])
+            allocations = self.allocations.setdefault(name, {})
+            for stat in tracemalloc.take_snapshot().statistics('lineno'):
+                frame = stat.traceback[0]
+                if frame.filename not in IGNORED_FILES:
+                    size, count = allocations.get((frame.filename, frame.lineno), (0, 0))
+                    allocations[(frame.filename, frame.lineno)] = (size + stat.size, count + stat.count)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].enable()
+
+    def close(self):
+        """
+        Arrête le suivi des allocations, s'il a été démarré par le profilage.
+        """
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def write(self, output_path):
+        """
+        Écrit les rapports du profilage à côté du fichier SKOS.
+
+        ### Description :
+        - `<fichier>.profile.<phase>.pstats` : statistiques cProfile de chaque phase, à lire avec
+          `pstats`, `snakeviz`...
+        - `<fichier>.profile.folded` : piles d'appels repliées (une ligne `phase;fonction;...;fonction
+          microsecondes` par pile), au format de `flamegraph.pl` et de speedscope (voir `collapsed_stacks`).
+        - `<fichier>.profile.allocations.txt` : durée et pic de mémoire de chaque phase, et lignes de
+          code qui y ont le plus alloué.
+
+        ### Paramètres :
+        - **output_path** (str ou Path) : Chemin du fichier SKOS.
+
+        ### Retour :
+        - **list** : Chemins des fichiers écrits.
+        """
+        paths = []
+        for name, profile in self.profiles.items():
+            path = Path(f"{output_path}.profile.{name}.pstats")
+            profile.dump_stats(path)
+            paths.append(path)
+
+        path = Path(f"{output_path}.profile.folded")
+        with open(path, 'w', encoding='utf-8') as file:
+            for name, profile in self.profiles.items():
+                for stack, microseconds in collapsed_stacks(pstats.Stats(profile)):
+                    file.write(f"{';'.join((name,) + stack)} {microseconds}\n")
+        paths.append(path)
+
+        path = Path(f"{output_path}.profile.allocations.txt")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.allocation_summary())
+        paths.append(path)
+        return paths
+
+    def allocation_summary(self):
+        """
+        Retourne le résumé des allocations de chaque phase.
+
+        ### Retour :
+        - **str** : Pour chaque phase, sa durée, son pic de mémoire, la mémoire allouée encore utilisée
+          à sa fin et les `top` lignes de code qui en ont alloué le plus.
+        """
+        lines = []
+        for name in self.profiles:
+            allocations = self.allocations.get(name, {})
+            lines.append(
+                f"Phase {name} : {self.durations.get(name, 0.0):.3f} s, pic {self.peaks.get(name, 0) / 1e6:.1f} Mo, "
+                f"{sum(size for size, _ in allocations.values()) / 1e6:.1f} Mo alloués encore utilisés en fin de phase"
+            )
+            lines.append(f"{'Taille (Ko)':>14} {'Blocs':>10}  Ligne")
+            ranked = sorted(allocations.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+            for (filename, lineno), (size, count) in ranked:
+                lines.append(f"{size / 1e3:>14.1f} {count:>10}  {filename}:{lineno}")
+            lines.append('')
+        return '\n'.join(lines)
+
+
+def collapsed_stacks(stats, min_share=FLAMEGRAPH_MIN_SHARE, max_depth=FLAMEGRAPH_MAX_DEPTH):
+    """
+    Reconstruit les piles d'appels repliées d'un profil cProfile.
+
+    ### Description :
+    cProfile ne conserve que les arcs appelant → appelé, avec leur temps cumulé. Les piles partent
+    des fonctions dont certains appels n'ont pas d'appelant profilé (ex. `next` appelé par le
+    générateur qui lit le CSV, ouvert avant la phase), avec le temps cumulé qui n'est attribué à
+    aucun arc. Le temps d'une pile est réparti entre les appelés de sa dernière fonction au prorata
+    du temps de chaque arc, le reste étant le temps propre de la pile. C'est une approximation
+    lorsqu'une fonction est appelée depuis plusieurs piles ; les appels récursifs sont comptés dans
+    la pile de leur premier appel.
+
+    ### Paramètres :
+    - **stats** (pstats.Stats) : Statistiques d'un profil.
+    - **min_share** (float, optionnel) : Part minimale du temps total d'une pile ; les plus courtes sont
+      comptées dans leur parent.
+    - **max_depth** (int, optionnel) : Profondeur maximale des piles.
+
+    ### Retour :
+    - **list** : Couples `(pile, microsecondes)`, la pile étant un tuple de noms de fonctions.
+    """
+    children = {}
+    roots = {}
+    for function, (_, calls, _, cumulative, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            if caller != function:
+                children.setdefault(caller, []).append((function, edge[3]))
+        if calls > sum(edge[1] for edge in callers.values()):
+            unattributed = cumulative - sum(edge[3] for caller, edge in callers.items() if caller != function)
+            if unattributed > 0:
+                roots[function] = unattributed
+    minimum = sum(roots.values()) * min_share
+
+    stacks = []
+
+    def walk(function, seconds, stack, on_stack):
+        cumulative = stats.stats[function][3]
+        stack = stack + (function_label(function),)
+        remaining = seconds
+        calls = [(child, edge) for child, edge in children.get(function, ()) if child not in on_stack]
+        # Les arcs d'appels récursifs peuvent dépasser le temps cumulé de la fonction
+        total = max(cumulative, sum(edge for _, edge in calls))
+        if total > 0 and len(stack) < max_depth:
+            for child, edge in calls:
+                child_seconds = seconds * edge / total
+                if child_seconds < minimum:
+                    continue
+                walk(child, child_seconds, stack, on_stack | {child})
+                remaining -= child_seconds
+        microseconds = round(remaining * 1e6)
+        if microseconds > 0:
+            stacks.append((stack, microseconds))
+
+    for function, seconds in roots.items():
+        if seconds >= minimum:
+            walk(function, seconds, (), {function})
+    return stacks
+
+
+def function_label(function):
+    """
+    Retourne le nom d'une fonction d'un profil, pour les piles repliées.
+
+    ### Paramètres :
+    - **function** (tuple) : Fonction d'un profil cProfile `(fichier, ligne, nom)`.
+
+    ### Retour :
+    - **str** : `nom (fichier:ligne)`, ou le nom seul pour une fonction native (ex. `<built-in method time.sleep>`).
+    """
+    filename, lineno, name = function
+    label = name if filename == '~' else f"{name} ({Path(filename).name}:{lineno})"
+    return label.replace(';', ',')
@@ -1,4 +1,24 @@
+import mmap
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from uuid import UUID
+import numpy as np
+
+# Identifiants du fichier d'entrée, séparés par des virgules ou des blancs
+UUID_TOKEN = re.compile(rb'[^,\s]+')
+
+# Nombre d'identifiants analysés avant d'être ajoutés aux fichiers de partition
+PARSE_BATCH_SIZE = 250_000
+
+# Taille des blocs du fichier d'entrée dont les identifiants uniques sont écrits ensemble (en octets)
+WRITE_BLOCK_SIZE = 16 * 2**20
+
+# Identifiant analysé : valeur de l'UUID, position et longueur dans le fichier d'entrée
+RECORD_DTYPE = np.dtype([('uuid', 'V16'), ('offset', '<i8'), ('length', '<i4')])
+UNIQUE_DTYPE = np.dtype([('offset', '<i8'), ('length', '<i4')])
 
 def remove_duplicate_uuids(uuid_list, filename="unique_uuids.txt"):
     seen = set()
@@ -18,3 +38,245 @@ def remove_duplicate_uuids(uuid_list, filename="unique_uuids.txt"):
         file.write(",".join(unique_uuids))
     
     return "finished"
+
+
+def remove_duplicate_uuid_file(input_path, output_path="unique_uuids.txt", workers=None, partitions=None,
+                               keep_order=True, separator=","):
+    """
+    Dédoublonne les UUID d'un fichier, sans les charger en mémoire.
+
+    ### Description :
+    Variante de `remove_duplicate_uuids` pour des dizaines de millions d'identifiants. Le fichier
+    d'entrée (identifiants séparés par des virgules ou des blancs) est projeté en mémoire (`mmap`)
+    et découpé en plages d'octets, analysées en parallèle. Chaque UUID est converti en sa valeur
+    de 16 octets puis rangé, avec sa position dans le fichier, dans une partition selon son hachage :
+    les doublons d'un UUID sont donc tous dans la même partition, dédoublonnée indépendamment des
+    autres (tri NumPy). Les identifiants conservés sont écrits tels qu'ils apparaissent dans le
+    fichier d'entrée, par blocs ; la mémoire utilisée dépend de la taille d'une partition et d'un
+    bloc, pas de celle du fichier. Les fichiers intermédiaires sont écrits dans un répertoire
+    temporaire à côté du fichier de sortie.
+
+    ### Paramètres :
+    - **input_path** (str ou Path) : Fichier des identifiants.
+    - **output_path** (str ou Path, optionnel) : Fichier des identifiants uniques.
+    - **workers** (int, optionnel) : Nombre de processus. Par défaut, le nombre de CPU.
+    - **partitions** (int, optionnel) : Nombre de partitions. Par défaut, 4 par processus.
+    - **keep_order** (bool, optionnel) : Écrit les identifiants dans l'ordre de leur première
+      occurrence (par défaut). Sinon, ils sont écrits partition par partition.
+    - **separator** (str, optionnel) : Séparateur des identifiants écrits.
+
+    ### Retour :
+    - **int** : Nombre d'identifiants uniques écrits. Les identifiants invalides sont ignorés.
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    workers = workers or os.cpu_count() or 1
+    partitions = partitions or workers * 4
+    size = input_path.stat().st_size
+    ranges = split_ranges(size, workers)
+    part_path = output_path.with_name(output_path.name + '.part')
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    run = executor.map if executor is not None else map
+    try:
+        with tempfile.TemporaryDirectory(dir=output_path.resolve().parent) as tmp_dir:
+            indexes = range(len(ranges))
+            invalid = sum(run(partition_range, [str(input_path)] * len(ranges), ranges, indexes,
+                              [partitions] * len(ranges), [tmp_dir] * len(ranges)))
+            count = sum(run(deduplicate_partition, [tmp_dir] * partitions, range(partitions),
+                            [len(ranges)] * partitions))
+            write_unique(input_path, part_path, tmp_dir, partitions, size, keep_order, separator)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    os.replace(part_path, output_path)
+
+    if invalid:
+        print(f"{invalid} identifiant(s) invalide(s) ignoré(s).")
+    return count
+
+
+def split_ranges(size, count):
+    """
+    Découpe un fichier en plages d'octets de tailles égales.
+
+    ### Paramètres :
+    - **size** (int) : Taille du fichier, en octets.
+    - **count** (int) : Nombre maximal de plages.
+
+    ### Retour :
+    - **list** : Plages `(début, fin)`. Aucune plage pour un fichier vide.
+    """
+    count = max(1, min(count, size))
+    bounds = [size * index // count for index in range(count + 1)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def partition_range(input_path, byte_range, index, partitions, tmp_dir):
+    """
+    Analyse les identifiants d'une plage d'octets et les range dans les fichiers de partition
+    (exécuté dans un processus du pool).
+
+    ### Description :
+    Un identifiant appartient à la plage où il commence : s'il est coupé par le début de la
+    plage, il est laissé à la plage précédente.
+
+    ### Paramètres :
+    - **input_path** (str) : Fichier des identifiants.
+    - **byte_range** (tuple) : Plage `(début, fin)`.
+    - **index** (int) : Numéro de la plage, qui fixe l'ordre des fichiers de partition.
+    - **partitions** (int) : Nombre de partitions.
+    - **tmp_dir** (str) : Répertoire des fichiers intermédiaires.
+
+    ### Retour :
+    - **int** : Nombre d'identifiants invalides.
+    """
+    start, end = byte_range
+    invalid = 0
+    values, offsets, lengths = bytearray(), [], []
+    files = [open(Path(tmp_dir, f'{partition}-{index}.bin'), 'wb') for partition in range(partitions)]
+    try:
+        with open(input_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            truncated = start > 0 and UUID_TOKEN.match(data, start - 1) is not None
+            for match in UUID_TOKEN.finditer(data, start):
+                position = match.start()
+                if position >= end:
+                    break
+                if truncated and position == start:
+                    continue
+                token = match.group()
+                try:
+                    value = UUID(token.decode('ascii')).bytes
+                except ValueError:
+                    invalid += 1
+                    continue
+                values += value
+                offsets.append(position)
+                lengths.append(len(token))
+                if len(offsets) >= PARSE_BATCH_SIZE:
+                    write_partitions(values, offsets, lengths, files)
+                    values, offsets, lengths = bytearray(), [], []
+        write_partitions(values, offsets, lengths, files)
+    finally:
+        for partition_file in files:
+            partition_file.close()
+    return invalid
+
+
+def write_partitions(values, offsets, lengths, files):
+    """
+    Ajoute un lot d'identifiants aux fichiers de partition, selon le hachage de leur valeur.
+
+    ### Paramètres :
+    - **values** (bytearray) : Valeurs des UUID, 16 octets par identifiant.
+    - **offsets** (list) : Position de chaque identifiant dans le fichier d'entrée.
+    - **lengths** (list) : Longueur de chaque identifiant, en octets.
+    - **files** (list) : Fichiers de partition ouverts en écriture.
+    """
+    if not offsets:
+        return
+    records = np.empty(len(offsets), dtype=RECORD_DTYPE)
+    records['uuid'] = np.frombuffer(values, dtype='V16')
+    records['offset'] = offsets
+    records['length'] = lengths
+    # Hachage multiplicatif des deux moitiés : les UUID dont seuls quelques octets varient
+    # (ex. UUID1) sont aussi répartis uniformément
+    halves = np.frombuffer(values, dtype='<u8').reshape(-1, 2)
+    hashes = ((halves[:, 0] ^ halves[:, 1]) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+    targets = hashes % np.uint64(len(files))
+    order = np.argsort(targets, kind='stable')
+    bounds = np.searchsorted(targets[order], np.arange(len(files) + 1))
+    for partition, partition_file in enumerate(files):
+        records[order[bounds[partition]:bounds[partition + 1]]].tofile(partition_file)
+
+
+def deduplicate_partition(tmp_dir, partition, ranges):
+    """
+    Dédoublonne une partition et conserve la première occurrence de chaque UUID (exécuté dans un
+    processus du pool).
+
+    ### Paramètres :
+    - **tmp_dir** (str) : Répertoire des fichiers intermédiaires.
+    - **partition** (int) : Numéro de la partition.
+    - **ranges** (int) : Nombre de plages analysées.
+
+    ### Retour :
+    - **int** : Nombre d'identifiants uniques de la partition.
+    """
+    paths = [Path(tmp_dir, f'{partition}-{index}.bin') for index in range(ranges)]
+    # Les plages sont concaténées dans l'ordre : les positions sont croissantes
+    records = np.concatenate([np.fromfile(path, dtype=RECORD_DTYPE) for path in paths]
+                             or [np.empty(0, dtype=RECORD_DTYPE)])
+    _, first = np.unique(records['uuid'], return_index=True)
+    first.sort()
+    unique = np.empty(len(first), dtype=UNIQUE_DTYPE)
+    unique['offset'] = records['offset'][first]
+    unique['length'] = records['length'][first]
+    unique.tofile(Path(tmp_dir, f'{partition}.bin'))
+    for path in paths:
+        path.unlink()
+    return len(unique)
+
+
+def write_unique(input_path, output_path, tmp_dir, partitions, size, keep_order=True, separator=","):
+    """
+    Écrit les identifiants uniques des partitions, tels qu'ils apparaissent dans le fichier d'entrée.
+
+    ### Description :
+    Avec `keep_order`, le fichier d'entrée est parcouru par blocs de `WRITE_BLOCK_SIZE` octets :
+    les identifiants de chaque partition situés dans le bloc sont réunis et triés par position.
+
+    ### Paramètres :
+    - **input_path** (Path) : Fichier des identifiants.
+    - **output_path** (Path) : Fichier à écrire.
+    - **tmp_dir** (str) : Répertoire des fichiers intermédiaires.
+    - **partitions** (int) : Nombre de partitions.
+    - **size** (int) : Taille du fichier d'entrée, en octets.
+    - **keep_order** (bool, optionnel) : Écrit les identifiants dans l'ordre de leur première occurrence.
+    - **separator** (str, optionnel) : Séparateur des identifiants écrits.
+    """
+    uniques = []
+    for partition in range(partitions):
+        path = Path(tmp_dir, f'{partition}.bin')
+        if path.stat().st_size:
+            uniques.append(np.memmap(path, dtype=UNIQUE_DTYPE, mode='r'))
+
+    separator = separator.encode('utf-8')
+    with open(output_path, 'wb') as output:
+        if not uniques:
+            return
+        with open(input_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            first = True
+            for block in iter_unique_blocks(uniques, size, keep_order):
+                if not len(block):
+                    continue
+                if not first:
+                    output.write(separator)
+                output.write(separator.join([data[offset:offset + length] for offset, length in
+                                             zip(block['offset'].tolist(), block['length'].tolist())]))
+                first = False
+
+
+def iter_unique_blocks(uniques, size, keep_order=True):
+    """
+    Parcourt par blocs les identifiants uniques des partitions (voir `write_unique`).
+
+    ### Paramètres :
+    - **uniques** (list) : Identifiants uniques de chaque partition, triés par position.
+    - **size** (int) : Taille du fichier d'entrée, en octets.
+    - **keep_order** (bool, optionnel) : Retourne les identifiants dans l'ordre de leur position.
+
+    ### Retour :
+    - **Iterator[np.ndarray]** : Blocs de positions et longueurs (`UNIQUE_DTYPE`).
+    """
+    if not keep_order:
+        for unique in uniques:
+            for start in range(0, len(unique), PARSE_BATCH_SIZE):
+                yield unique[start:start + PARSE_BATCH_SIZE]
+        return
+    for start in range(0, size, WRITE_BLOCK_SIZE):
+        block = np.concatenate([
+            unique[np.searchsorted(unique['offset'], start):np.searchsorted(unique['offset'], start + WRITE_BLOCK_SIZE)]
+            for unique in uniques
+        ])
+        yield block[np.argsort(block['offset'], kind='stable')]
@@ -0,0 +1,428 @@
+import json
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from mcc_skos_service.batch import batch_entry_name
+from mcc_skos_service.cli import CLI_PARAMETERS
+from mcc_skos_service.params import load_params, get_output_path
+from mcc_skos_service.settings import get_settings
+
+# Nombre de tâches en attente acceptées, si `queue_size` n'est pas renseigné
+DEFAULT_QUEUE_SIZE = 100
+
+# Port d'écoute, si `port` n'est pas renseigné
+DEFAULT_PORT = 8750
+
+# Nombre de tâches terminées conservées pour être consultées
+JOB_HISTORY = 1000
+
+
+class GenerationService:
+    """
+    Classe GenerationService : Exécute des générations SKOS dans des processus gardés chauds.
+
+    ### Description :
+    Chaque processus de génération importe pandas, rdflib et `make_skos` une seule fois, à son
+    démarrage, puis exécute les tâches les unes après les autres : le coût de démarrage d'un
+    interpréteur n'est donc pas payé à chaque génération, ce qui domine la durée des petits
+    vocabulaires.
+
+    Les tâches (mêmes paramètres que `make_skos`, plus la clé optionnelle `name`) sont placées
+    dans une file bornée (`queue_size`) et exécutées par `workers` processus. Une tâche qui dépasse
+    `job_timeout` secondes est interrompue : son processus est arrêté puis remplacé.
+    """
+
+    def __init__(self, workers: int = None, queue_size: int = None, job_timeout: float = None):
+        """
+        Initialisation du service.
+
+        ### Paramètres :
+        - **workers** (int, optionnel) : Nombre de processus de génération. Par défaut `SERVICE_WORKERS`,
+          sinon le nombre de CPU.
+        - **queue_size** (int, optionnel) : Nombre maximal de tâches en attente. Par défaut `SERVICE_QUEUE_SIZE`,
+          sinon 100.
+        - **job_timeout** (float, optionnel) : Durée maximale d'une tâche, en secondes. Par défaut
+          `SERVICE_JOB_TIMEOUT`, sinon aucune limite.
+        """
+        settings = get_settings()
+        self.workers = int(workers or settings.SERVICE_WORKERS or os.cpu_count())
+        self.queue_size = int(queue_size or settings.SERVICE_QUEUE_SIZE or DEFAULT_QUEUE_SIZE)
+        self.job_timeout = job_timeout or settings.SERVICE_JOB_TIMEOUT
+        if self.workers <= 0 or self.queue_size <= 0:
+            raise ValueError("'workers' et 'queue_size' doivent être des entiers positifs.")
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._jobs = {}
+        self._finished = []
+        self._condition = threading.Condition()
+        self._threads = []
+
+    def start(self):
+        """
+        Démarre les processus de génération et attend qu'ils soient prêts.
+        """
+        ready = []
+        for index in range(self.workers):
+            worker = WarmWorker()
+            ready.append(worker)
+            thread = threading.Thread(target=self._run, args=(worker,), name=f"skos-worker-{index}", daemon=True)
+            self._threads.append(thread)
+        for worker in ready:
+            worker.wait_ready()
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, config):
+        """
+        Ajoute une tâche de génération à la file.
+
+        ### Paramètres :
+        - **config** (dict) : Paramètres de `make_skos`, plus la clé optionnelle `name`.
+
+        ### Retour :
+        - **dict** : État de la tâche (voir `get`).
+
+        ### Exceptions :
+        - `queue.Full` : Si la file d'attente est pleine.
+        """
+        job_id = uuid.uuid4().hex
+        job = {'id': job_id, 'name': batch_entry_name(config), 'status': 'queued', 'seconds': None,
+               'output': None, 'error': None}
+        with self._condition:
+            self._jobs[job_id] = (job, config)
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            with self._condition:
+                del self._jobs[job_id]
+            raise
+        return dict(job)
+
+    def get(self, job_id, wait: float = None):
+        """
+        Retourne l'état d'une tâche.
+
+        ### Paramètres :
+        - **job_id** (str) : Identifiant de la tâche.
+        - **wait** (float, optionnel) : Attend au plus ce nombre de secondes que la tâche soit terminée.
+
+        ### Retour :
+        - **dict ou None** : `id`, `name`, `status` (`queued`, `running`, `ok`, `error` ou `timeout`),
+          `seconds`, `output` et `error`, ou `None` si la tâche est inconnue.
+        """
+        with self._condition:
+            if wait:
+                self._condition.wait_for(
+                    lambda: job_id not in self._jobs or self._jobs[job_id][0]['status'] not in ('queued', 'running'),
+                    timeout=wait)
+            entry = self._jobs.get(job_id)
+            return dict(entry[0]) if entry else None
+
+    def status(self):
+        """
+        Retourne l'état du service.
+
+        ### Retour :
+        - **dict** : Nombre de processus, de tâches en attente et en cours, taille de la file et durée maximale.
+        """
+        with self._condition:
+            statuses = [job['status'] for job, _ in self._jobs.values()]
+        return {'status': 'ok', 'workers': self.workers, 'queue_size': self.queue_size,
+                'job_timeout': self.job_timeout, 'queued': statuses.count('queued'),
+                'running': statuses.count('running')}
+
+    def shutdown(self):
+        """
+        Arrête les processus de génération une fois les tâches en attente terminées.
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _run(self, worker):
+        try:
+            while True:
+                job_id = self._queue.get()
+                if job_id is None:
+                    return
+                with self._condition:
+                    job, config = self._jobs[job_id]
+                    job['status'] = 'running'
+                result = worker.run(config, self.job_timeout)
+                self._finish(job_id, result)
+        finally:
+            worker.close()
+
+    def _finish(self, job_id, result):
+        with self._condition:
+            job, _ = self._jobs[job_id]
+            job.update(status=result['status'], seconds=result['seconds'], output=result['output'],
+                       error=result['error'])
+            # La configuration n'est plus nécessaire une fois la tâche terminée
+            self._jobs[job_id] = (job, None)
+            self._finished.append(job_id)
+            while len(self._finished) > JOB_HISTORY:
+                self._jobs.pop(self._finished.pop(0), None)
+            self._condition.notify_all()
+
+
+class WarmWorker:
+    """
+    Classe WarmWorker : Processus de génération dont les imports sont déjà effectués.
+
+    ### Description :
+    Le processus reçoit les configurations par un `Pipe` et renvoie le résultat de `run_scheme`.
+    Si une tâche dépasse sa durée maximale ou si le processus s'arrête, il est remplacé par un
+    nouveau processus, et le fichier temporaire (`.part`) laissé par l'écriture interrompue est
+    supprimé.
+    """
+
+    def __init__(self):
+        self._context = multiprocessing.get_context('spawn')
+        self._start()
+
+    def wait_ready(self):
+        """
+        Attend que le processus ait terminé ses imports.
+        """
+        if not self._ready:
+            self._conn.recv()
+            self._ready = True
+
+    def run(self, config, timeout=None):
+        """
+        Exécute une génération dans le processus.
+
+        ### Paramètres :
+        - **config** (dict) : Paramètres de `make_skos`, plus la clé optionnelle `name`.
+        - **timeout** (float, optionnel) : Durée maximale, en secondes.
+
+        ### Retour :
+        - **dict** : Résultat de la génération (voir `make_skos_batch`), avec le statut `timeout`
+          si la durée maximale est dépassée.
+        """
+        start = time.perf_counter()
+        config, part_path = pin_output(config)
+        try:
+            self.wait_ready()
+            self._conn.send(config)
+            if self._conn.poll(timeout):
+                return self._conn.recv()
+            status, error = 'timeout', f"Durée maximale dépassée ({timeout} s)."
+        except (EOFError, OSError):
+            status, error = 'error', "Le processus de génération s'est arrêté."
+        self._restart()
+        if part_path is not None:
+            part_path.unlink(missing_ok=True)
+        return {'name': batch_entry_name(config), 'status': status, 'seconds': time.perf_counter() - start,
+                'output': None, 'error': error}
+
+    def close(self):
+        """
+        Arrête le processus.
+        """
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._conn.close()
+
+    def _start(self):
+        self._conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(target=worker_loop, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._ready = False
+
+    def _restart(self):
+        self._process.terminate()
+        self._process.join()
+        self._conn.close()
+        self._start()
+
+
+def pin_output(config):
+    """
+    Fixe le nom du fichier généré par une tâche et retourne le chemin de son fichier temporaire.
+
+    ### Description :
+    Sans `output_file_name` (ni `OUTPUT_FILE_NAME`), `load_params` tire un nom au hasard dans le
+    processus de génération : le nom est tiré ici, pour que le service connaisse le fichier
+    temporaire (`.part`) à supprimer si le processus est arrêté.
+
+    ### Paramètres :
+    - **config** (dict) : Paramètres de `make_skos`, plus la clé optionnelle `name`.
+
+    ### Retour :
+    - **tuple** : La configuration, avec `output_file_name` renseigné, et le chemin du fichier
+      temporaire (`None` si les paramètres sont invalides : la tâche échouera avant d'écrire).
+    """
+    try:
+        params = load_params(get_settings(), {**dict.fromkeys(CLI_PARAMETERS), **config})
+    except Exception:
+        return config, None
+    final_path = get_output_path(params)
+    config = dict(config, output_file_name=params['output_file_name'])
+    return config, final_path.with_name(final_path.name + '.part')
+
+
+def worker_loop(conn):
+    """
+    Boucle d'un processus de génération : importe `make_skos`, puis exécute les configurations reçues.
+
+    ### Paramètres :
+    - **conn** (Connection) : Extrémité du `Pipe` partagé avec le service.
+    """
+    # Imports chauds : pandas, numpy, rdflib et make_skos sont chargés une seule fois par processus,
+    # y compris ceux que `make_skos` n'importe qu'à la lecture du CSV
+    import numpy
+    import pandas
+    import mcc_skos_service.skos_service
+    from mcc_skos_service.batch import run_scheme
+
+    conn.send('ready')
+    while True:
+        config = conn.recv()
+        if config is None:
+            return
+        result = run_scheme(config)
+        result.pop('traceback', None)
+        conn.send(result)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    Classe ServiceRequestHandler : API HTTP JSON du service de génération.
+
+    ### Description :
+    - `POST /jobs` : ajoute une tâche (corps JSON : paramètres de `make_skos`). Avec `?wait=<secondes>`,
+      attend la fin de la tâche. Répond `202` (ou `200` si la tâche est terminée), `400` si le corps
+      ou `wait` sont invalides et `503` si la file est pleine.
+    - `GET /jobs/<id>` : état d'une tâche (`?wait=<secondes>` pour attendre sa fin), `404` si inconnue.
+    - `GET /health` : état du service.
+    """
+
+    server_version = 'mcc-skos-service'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+        if url.path == '/health':
+            return self._send(HTTPStatus.OK, service.status())
+        if url.path.startswith('/jobs/'):
+            try:
+                wait = self._wait(url)
+            except ValueError as exc:
+                return self._send(HTTPStatus.BAD_REQUEST, {'error': str(exc)})
+            job = service.get(url.path[len('/jobs/'):], wait=wait)
+            if job is None:
+                return self._send(HTTPStatus.NOT_FOUND, {'error': 'Tâche inconnue.'})
+            return self._send(HTTPStatus.OK, job)
+        return self._send(HTTPStatus.NOT_FOUND, {'error': 'Ressource inconnue.'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/jobs':
+            return self._send(HTTPStatus.NOT_FOUND, {'error': 'Ressource inconnue.'})
+        try:
+            wait = self._wait(url)
+        except ValueError as exc:
+            return self._send(HTTPStatus.BAD_REQUEST, {'error': str(exc)})
+        try:
+            config = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except ValueError as exc:
+            return self._send(HTTPStatus.BAD_REQUEST, {'error': f"JSON invalide : {exc}"})
+        if not isinstance(config, dict):
+            return self._send(HTTPStatus.BAD_REQUEST, {'error': "Un objet JSON de paramètres est attendu."})
+        try:
+            job = self.server.service.submit(config)
+        except queue.Full:
+            return self._send(HTTPStatus.SERVICE_UNAVAILABLE, {'error': "La file d'attente est pleine."})
+        if wait:
+            job = self.server.service.get(job['id'], wait=wait)
+        finished = job['status'] not in ('queued', 'running')
+        return self._send(HTTPStatus.OK if finished else HTTPStatus.ACCEPTED, job)
+
+    def _wait(self, url):
+        values = parse_qs(url.query).get('wait')
+        if not values:
+            return None
+        try:
+            wait = float(values[0])
+        except ValueError:
+            wait = None
+        if wait is None or not math.isfinite(wait) or wait < 0:
+            raise ValueError(f"'wait' invalide : '{values[0]}' (nombre de secondes positif attendu).")
+        return wait
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_server(service, host: str = None, port: int = None):
+    """
+    Crée le serveur HTTP du service, sans le démarrer.
+
+    ### Paramètres :
+    - **service** (GenerationService) : Service de génération, déjà démarré.
+    - **host** (str, optionnel) : Adresse d'écoute. Par défaut `SERVICE_HOST`, sinon `127.0.0.1`.
+    - **port** (int, optionnel) : Port d'écoute (`0` pour un port libre). Par défaut `SERVICE_PORT`, sinon 8750.
+
+    ### Retour :
+    - **ThreadingHTTPServer** : Serveur dont l'attribut `service` est le service de génération.
+    """
+    settings = get_settings()
+    host = host or settings.SERVICE_HOST or '127.0.0.1'
+    if port is None:
+        port = settings.SERVICE_PORT if settings.SERVICE_PORT is not None else DEFAULT_PORT
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.service = service
+    return server
+
+
+def serve(host: str = None, port: int = None, workers: int = None, queue_size: int = None,
+          job_timeout: float = None):
+    """
+    Démarre le service de génération et répond aux requêtes HTTP jusqu'à son arrêt (Ctrl+C).
+
+    ### Paramètres :
+    - **host** (str, optionnel) : Adresse d'écoute (voir `create_server`).
+    - **port** (int, optionnel) : Port d'écoute (voir `create_server`).
+    - **workers** (int, optionnel) : Nombre de processus de génération (voir `GenerationService`).
+    - **queue_size** (int, optionnel) : Nombre maximal de tâches en attente.
+    - **job_timeout** (float, optionnel) : Durée maximale d'une tâche, en secondes.
+
+    ### Exemple :
+    ```python
+    serve(port=8750, workers=4, queue_size=50, job_timeout=300)
+    ```
+    """
+    service = GenerationService(workers, queue_size, job_timeout)
+    service.start()
+    server = create_server(service, host, port)
+    print(f"Service SKOS à l'écoute sur http://{server.server_address[0]}:{server.server_address[1]} "
+          f"({service.workers} processus)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
@@ -1,5 +1,5 @@
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
 class Settings:
     """
@@ -26,7 +26,35 @@ class Settings:
         - SKOS_DEFINITION_COLUMNS : colonnes du fichier CSV contenant les définitions SKOS.
         - SKOS_NOTES_COLUMNS : colonnes du fichier CSV contenant les notes SKOS.
         - SKOS_PREFLABEL_COLUMNS : colonnes du fichier CSV contenant les labels préférentiels SKOS.
+        - CSV_CHUNK_SIZE : nombre de lignes lues par bloc dans le fichier CSV (lecture complète si vide).
+        - CSV_READER : lecteur du fichier CSV (`pandas`, `csv` ou `pyarrow`).
+        - CSV_CACHE_DIR : répertoire du cache des CSV déjà lus (désactivé si vide).
+        - CSV_CACHE_MAX_SIZE : taille maximale du cache des CSV, en Mo.
+        - URI_MODE : génération des URIs des concepts, `random` (UUID4) ou `deterministic` (UUID5).
+        - STABLE_URIS : conserve les URIs des concepts d'une génération à l'autre (manifeste à côté du fichier SKOS).
+        - STABLE_URIS_DELTA : écrit le fichier delta des concepts ajoutés, supprimés et modifiés.
+        - INCREMENTAL : ne reconstruit que les concepts modifiés et recopie les autres depuis le fichier existant.
+        - APPEND : ajoute les concepts du CSV au fichier SKOS existant au lieu de le remplacer.
+        - NEAR_DUPLICATES : détection des labels quasi identiques (`report` ou `merge`, désactivée si vide).
+        - NEAR_DUPLICATE_THRESHOLD : similarité minimale de deux labels quasi identiques (entre 0 et 1).
+        - CONCEPT_INDEX : index des concepts par label, `memory` (dictionnaires) ou `sqlite` (fichier avec cache LRU).
+        - CONCEPT_INDEX_CACHE_SIZE : nombre d'entrées de l'index `sqlite` gardées en mémoire.
+        - BATCH_WORKERS : nombre de processus utilisés par la génération par lots.
+        - PARALLEL_WORKERS : nombre de processus utilisés pour construire les concepts d'un schéma.
+        - OUTPUT_BACKEND : destination des triplets, `graph` (rdflib), `stream` (écriture en continu) ou `buffer` (tampon compact).
+        - OUTPUT_FORMAT : format du fichier généré (`xml`, `ntriples`, `nquads`, `turtle`, `json-ld`).
+        - OUTPUT_COMPRESSION : compression du fichier généré (`gzip` ou `zstd`).
+        - SERVICE_HOST : adresse d'écoute du service de génération.
+        - SERVICE_PORT : port d'écoute du service de génération.
+        - SERVICE_WORKERS : nombre de processus du service de génération.
+        - SERVICE_QUEUE_SIZE : nombre maximal de tâches en attente dans le service de génération.
+        - SERVICE_JOB_TIMEOUT : durée maximale, en secondes, d'une tâche du service de génération.
+        - INSTRUMENTATION : fichier JSON Lines où écrire les mesures de la génération (désactivé si vide).
+        - INSTRUMENTATION_INTERVAL : intervalle, en secondes, entre deux mesures de progression.
+        - PROFILE : profile chaque phase de la génération (rapports à côté du fichier SKOS).
         """
+        # python-dotenv n'est importé qu'à la lecture des paramètres (démarrage rapide de la commande)
+        from dotenv import load_dotenv
         load_dotenv()
         self.MAIN_PROJECT_ROOT = os.environ.get('MAIN_PROJECT_ROOT')
         self.OUTPUT_FILE_PATH = os.environ.get('OUTPUT_FILE_PATH')
@@ -49,4 +77,45 @@ class Settings:
         self.SKOS_MAIN_CONCEPT_DESCRIPTION_COLUMNS = os.environ.get('SKOS_MAIN_CONCEPT_DESCRIPTION_COLUMNS')
         self.SKOS_NARROW_CONCEPT_PREFLABEL_COLUMNS = os.environ.get('SKOS_NARROW_CONCEPT_PREFLABEL_COLUMNS')
         self.SKOS_NARROW_CONCEPT_DESCRIPTION_COLUMNS = os.environ.get('SKOS_NARROW_CONCEPT_DESCRIPTION_COLUMNS')
-        
\ No newline at end of file
+        self.OUTPUT_BACKEND = os.environ.get('OUTPUT_BACKEND')
+        self.OUTPUT_FORMAT = os.environ.get('OUTPUT_FORMAT')
+        self.OUTPUT_COMPRESSION = os.environ.get('OUTPUT_COMPRESSION')
+        self.URI_MODE = os.environ.get('URI_MODE')
+        self.STABLE_URIS = os.environ.get('STABLE_URIS') == 'True'
+        self.STABLE_URIS_DELTA = os.environ.get('STABLE_URIS_DELTA') == 'True'
+        self.INCREMENTAL = os.environ.get('INCREMENTAL') == 'True'
+        self.APPEND = os.environ.get('APPEND') == 'True'
+        self.NEAR_DUPLICATES = os.environ.get('NEAR_DUPLICATES')
+        self.NEAR_DUPLICATE_THRESHOLD = float(os.environ['NEAR_DUPLICATE_THRESHOLD']) if os.environ.get('NEAR_DUPLICATE_THRESHOLD') else None
+        self.CONCEPT_INDEX = os.environ.get('CONCEPT_INDEX')
+        self.CONCEPT_INDEX_CACHE_SIZE = int(os.environ['CONCEPT_INDEX_CACHE_SIZE']) if os.environ.get('CONCEPT_INDEX_CACHE_SIZE') else None
+        self.BATCH_WORKERS = int(os.environ['BATCH_WORKERS']) if os.environ.get('BATCH_WORKERS') else None
+        self.PARALLEL_WORKERS = int(os.environ['PARALLEL_WORKERS']) if os.environ.get('PARALLEL_WORKERS') else None
+        self.CSV_CHUNK_SIZE = int(os.environ['CSV_CHUNK_SIZE']) if os.environ.get('CSV_CHUNK_SIZE') else None
+        self.CSV_READER = os.environ.get('CSV_READER')
+        self.CSV_CACHE_DIR = os.environ.get('CSV_CACHE_DIR')
+        self.CSV_CACHE_MAX_SIZE = float(os.environ['CSV_CACHE_MAX_SIZE']) if os.environ.get('CSV_CACHE_MAX_SIZE') else None
+        self.SERVICE_HOST = os.environ.get('SERVICE_HOST')
+        self.SERVICE_PORT = int(os.environ['SERVICE_PORT']) if os.environ.get('SERVICE_PORT') else None
+        self.SERVICE_WORKERS = int(os.environ['SERVICE_WORKERS']) if os.environ.get('SERVICE_WORKERS') else None
+        self.SERVICE_QUEUE_SIZE = int(os.environ['SERVICE_QUEUE_SIZE']) if os.environ.get('SERVICE_QUEUE_SIZE') else None
+        self.SERVICE_JOB_TIMEOUT = float(os.environ['SERVICE_JOB_TIMEOUT']) if os.environ.get('SERVICE_JOB_TIMEOUT') else None
+        self.INSTRUMENTATION = os.environ.get('INSTRUMENTATION')
+        self.INSTRUMENTATION_INTERVAL = float(os.environ['INSTRUMENTATION_INTERVAL']) if os.environ.get('INSTRUMENTATION_INTERVAL') else None
+        self.PROFILE = os.environ.get('PROFILE') == 'True'
+
+
+@lru_cache(maxsize=None)
+def get_settings():
+    """
+    Retourne les paramètres de l'environnement, chargés une seule fois par processus.
+
+    ### Description :
+    Le fichier .env est lu et les variables d'environnement sont analysées au premier appel ;
+    les appels suivants (ex. chaque `make_skos` d'un lot ou du service) retournent le même objet.
+    Appeler `get_settings.cache_clear()` pour prendre en compte une modification de l'environnement.
+
+    ### Retour :
+    - **Settings** : Paramètres de l'environnement.
+    """
+    return Settings()
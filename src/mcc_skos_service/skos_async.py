@@ -0,0 +1,161 @@
+import asyncio
+import functools
+import inspect
+import threading
+from mcc_skos_service.instrumentation import Instrumentation, json_lines_sink
+from mcc_skos_service.skos_service import make_skos
+
+
+class GenerationCancelled(Exception):
+    """
+    Exception levée dans le thread de génération lorsque la coroutine `make_skos_async` est annulée.
+    """
+
+
+class CancellableInstrumentation(Instrumentation):
+    """
+    Classe CancellableInstrumentation : Instrumentation qui interrompt la génération lorsqu'elle est annulée.
+
+    ### Description :
+    L'annulation est vérifiée aux points d'interruption de `make_skos` (voir `Instrumentation.checkpoint`) :
+    après chaque bloc du CSV, à la fin de chaque phase et juste avant l'écriture définitive du fichier.
+    Elle lève alors `GenerationCancelled`, ce qui supprime le fichier en cours d'écriture comme
+    n'importe quelle erreur. Une phase en cours n'est pas interrompue : sans `csv_chunk_size`, la
+    lecture et la construction du CSV entier vont jusqu'à leur terme, de même que la sérialisation
+    d'un graphe rdflib. Une annulation reçue après le dernier point d'interruption, le fichier étant
+    déjà écrit, n'a plus d'effet sur la génération : le fichier est conservé.
+    """
+
+    def __init__(self, cancelled: threading.Event, sink=None, interval: float = 5.0):
+        """
+        Initialisation de l'instrumentation.
+
+        ### Paramètres :
+        - **cancelled** (threading.Event) : Événement signalant l'annulation.
+        - **sink** (callable, optionnel) : Fonction appelée avec chaque événement.
+        - **interval** (float, optionnel) : Intervalle minimal entre deux événements `progress`, en secondes.
+        """
+        super().__init__(sink, interval)
+        self.cancelled = cancelled
+        self.committed = False
+
+    def checkpoint(self, final=False):
+        if self.committed:
+            return
+        if self.cancelled.is_set():
+            raise GenerationCancelled("Génération annulée.")
+        self.committed = final
+
+
+async def make_skos_async(progress=None, executor=None, **params):
+    """
+    Variante asynchrone de `make_skos`, qui ne bloque pas la boucle d'événements.
+
+    ### Description :
+    La génération (lecture du CSV, construction des concepts, sérialisation et écriture du fichier)
+    est exécutée dans `executor`, par défaut le pool de threads de la boucle : les autres coroutines
+    continuent de s'exécuter pendant ce temps, et plusieurs schémas peuvent être générés en même
+    temps dans un même processus. La lecture du CSV et l'écriture des fichiers libèrent le GIL ;
+    pour répartir la construction d'un grand schéma sur plusieurs CPU, utiliser `parallel_workers`.
+
+    Les événements de l'instrumentation (`progress`, puis `summary`, voir `Instrumentation`) sont
+    transmis à `progress` dans la boucle d'événements.
+
+    Si la coroutine est annulée, la génération s'arrête au point d'interruption suivant (bloc du CSV,
+    fin de phase ou écriture définitive du fichier, voir `CancellableInstrumentation`) et le fichier
+    en cours d'écriture est supprimé ; l'annulation est propagée une fois le thread de génération
+    terminé. Si le fichier était déjà écrit, il est conservé.
+
+    ### Paramètres :
+    - **progress** (callable, optionnel) : Fonction, ou coroutine, appelée dans la boucle d'événements
+      avec chaque événement.
+    - **executor** (concurrent.futures.ThreadPoolExecutor, optionnel) : Pool de threads de la génération.
+      Par défaut, celui de la boucle.
+    - **params** : Paramètres de `make_skos`. Les événements sont aussi envoyés à `instrumentation`,
+      s'il est renseigné.
+
+    ### Retour :
+    - **Path** : Chemin complet du fichier SKOS généré.
+
+    ### Exemple :
+    ```python
+    output = await make_skos_async(progress=print, csv_path="/path/to/file.csv", csv_chunk_size=10000, ...)
+    ```
+    """
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+    tasks = set()
+    extra_sink = params.pop('instrumentation', None)
+    if extra_sink and not callable(extra_sink):
+        extra_sink = json_lines_sink(extra_sink)
+
+    def deliver(event):
+        result = progress(event)
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    def sink(event):
+        # Appelé dans le thread de génération
+        if extra_sink:
+            extra_sink(event)
+        if progress is not None:
+            loop.call_soon_threadsafe(deliver, event)
+
+    instrumentation = CancellableInstrumentation(cancelled, sink)
+    future = loop.run_in_executor(executor, functools.partial(make_skos, instrumentation=instrumentation, **params))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancelled.set()
+        try:
+            await future
+        except GenerationCancelled:
+            pass
+        raise
+
+
+async def make_skos_events(executor=None, **params):
+    """
+    Génère un fichier SKOS avec `make_skos_async` et retourne les événements de l'instrumentation au fil de l'eau.
+
+    ### Description :
+    Le dernier événement est le `summary` de la génération, dont le champ `output` contient le fichier
+    généré. Une erreur de la génération est levée après ce dernier événement. Si l'itération est
+    interrompue avant la fin, la génération est annulée.
+
+    ### Paramètres :
+    - **executor** (concurrent.futures.ThreadPoolExecutor, optionnel) : Pool de threads de la génération.
+    - **params** : Paramètres de `make_skos`.
+
+    ### Retour :
+    - **AsyncIterator[dict]** : Événements `progress`, puis `summary`.
+
+    ### Exemple :
+    ```python
+    async for event in make_skos_events(csv_path="/path/to/file.csv", instrumentation_interval=1, ...):
+        print(event['event'], event['counters']['rows_read'])
+    ```
+    """
+    events = asyncio.Queue()
+    task = asyncio.ensure_future(make_skos_async(progress=events.put_nowait, executor=executor, **params))
+    try:
+        while True:
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+                continue
+            getter.cancel()
+            while not events.empty():
+                yield events.get_nowait()
+            break
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
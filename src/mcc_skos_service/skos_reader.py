@@ -0,0 +1,320 @@
+import re
+from pathlib import Path
+from xml.etree.ElementTree import iterparse
+from rdflib import URIRef, BNode, Literal
+from rdflib.namespace import RDF, SKOS
+from mcc_skos_service.compression import open_input_text
+from mcc_skos_service.uri_minter import PATH_SEPARATOR
+
+# Extensions des fichiers lus, par format (après l'extension de compression éventuelle)
+READ_FORMATS = {'.xml': 'xml', '.rdf': 'xml', '.nt': 'ntriples', '.nq': 'nquads'}
+
+# Extensions des fichiers compressés, décompressés par `open_input_text`
+INPUT_COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.xz', '.zst')
+
+# Noms des éléments et attributs RDF/XML, tels que les retourne ElementTree
+RDF_PREFIX = f'{{{RDF}}}'
+XML_PREFIX = '{http://www.w3.org/XML/1998/namespace}'
+RDF_ROOT = RDF_PREFIX + 'RDF'
+RDF_DESCRIPTION = RDF_PREFIX + 'Description'
+RDF_ABOUT = RDF_PREFIX + 'about'
+RDF_RESOURCE = RDF_PREFIX + 'resource'
+RDF_NODE_ID = RDF_PREFIX + 'nodeID'
+RDF_DATATYPE = RDF_PREFIX + 'datatype'
+RDF_PARSE_TYPE = RDF_PREFIX + 'parseType'
+XML_LANG = XML_PREFIX + 'lang'
+
+# Objet d'un élément de propriété dont le prédicat n'est pas demandé
+SKIPPED = object()
+
+# Une ligne N-Triples ou N-Quads : sujet, prédicat, objet et graphe éventuel
+NTRIPLES_TERM = r'<[^>]*>|_:\S+|"(?:[^"\\]|\\.)*"(?:@[A-Za-z0-9-]+|\^\^<[^>]*>)?'
+NTRIPLES_LINE = re.compile(
+    rf'\s*({NTRIPLES_TERM})\s*({NTRIPLES_TERM})\s*({NTRIPLES_TERM})\s*(?:{NTRIPLES_TERM})?\s*\.\s*'
+)
+NTRIPLES_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"(?:@([A-Za-z0-9-]+)|\^\^<([^>]*)>)?')
+NTRIPLES_ESCAPE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+NTRIPLES_UNESCAPES = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+
+
+def get_read_format(path):
+    """
+    Déduit le format d'un fichier RDF de son extension.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier, éventuellement compressé (ex. `thesaurus.nt.gz`).
+
+    ### Retour :
+    - **str** : `xml`, `ntriples` ou `nquads`.
+
+    ### Exceptions :
+    - `ValueError` : Si le format n'est pas reconnu.
+    """
+    path = Path(str(path))
+    if path.suffix.lower() in INPUT_COMPRESSION_SUFFIXES:
+        path = path.with_suffix('')
+    try:
+        return READ_FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Format non reconnu : '{path.name}'. Extensions possibles : {', '.join(READ_FORMATS)}."
+        ) from None
+
+
+def iter_triples(path, predicates=None):
+    """
+    Parcourt en continu les triplets d'un fichier RDF/XML, N-Triples ou N-Quads.
+
+    ### Description :
+    Le fichier est lu au fil de l'eau, sans construire de graphe : la mémoire utilisée ne dépend
+    pas de sa taille. Les fichiers compressés sont décompressés à la lecture. En RDF/XML, les
+    éléments imbriqués (`pretty-xml`) sont pris en charge, mais pas `rdf:parseType`.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Chemin du fichier (voir `get_read_format`).
+    - **predicates** (set, optionnel) : Prédicats des triplets à retourner. Les termes des autres
+      triplets ne sont pas construits, ce qui accélère nettement la lecture. Par défaut, tous.
+
+    ### Retour :
+    - **Iterator[tuple]** : Triplets `(sujet, prédicat, objet)` de termes rdflib. En N-Quads, le graphe est ignoré.
+
+    ### Exceptions :
+    - `ValueError` : Si le format n'est pas reconnu ou si une ligne N-Triples est invalide.
+    """
+    if get_read_format(path) == 'xml':
+        return iter_xml_triples(path, predicates)
+    return iter_line_triples(path, predicates)
+
+
+def iter_line_triples(path, predicates=None):
+    """
+    Parcourt les triplets d'un fichier N-Triples ou N-Quads (voir `iter_triples`).
+    """
+    terms = {f'<{predicate}>' for predicate in predicates} if predicates is not None else None
+    with open_input_text(path) as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            match = NTRIPLES_LINE.fullmatch(line)
+            if match is None:
+                raise ValueError(f"Ligne {number} invalide : {line.strip()}")
+            subject, predicate, obj = match.groups()
+            if terms is None or predicate in terms:
+                yield ntriples_node(subject), ntriples_node(predicate), ntriples_node(obj)
+
+
+def ntriples_node(term):
+    """
+    Convertit un terme N-Triples en terme rdflib.
+
+    ### Paramètres :
+    - **term** (str) : Terme N-Triples (`<uri>`, `_:id` ou littéral).
+
+    ### Retour :
+    - **URIRef, BNode ou Literal** : Terme rdflib.
+    """
+    if term[0] == '<':
+        return URIRef(term[1:-1])
+    if term[0] == '_':
+        return BNode(term[2:])
+    value, language, datatype = NTRIPLES_LITERAL.fullmatch(term).groups()
+    if '\\' in value:
+        value = NTRIPLES_ESCAPE.sub(ntriples_unescape, value)
+    return Literal(value, lang=language, datatype=URIRef(datatype) if datatype else None)
+
+
+def ntriples_unescape(match):
+    escape = match.group(1)
+    if escape[0] in 'uU' and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    return NTRIPLES_UNESCAPES.get(escape, escape)
+
+
+def iter_xml_triples(path, predicates=None):
+    """
+    Parcourt les triplets d'un fichier RDF/XML (voir `iter_triples`).
+
+    ### Description :
+    Chaque élément est libéré dès qu'il a été lu. Un élément de nœud (`rdf:Description`, ou un
+    élément typé comme `skos:Concept`) est à la racine ou dans un élément de propriété ; un
+    élément de propriété a pour objet `rdf:resource`, le nœud qu'il contient, ou son texte.
+    """
+    # URIs des prédicats et des types, par nom d'élément
+    names = {}
+    # Prédicats à ignorer, par nom d'élément
+    skipped = set()
+    root = None
+    # Pile des éléments ouverts : [sujet] pour un nœud, [sujet, prédicat, objet] pour une propriété
+    stack = []
+    with open_input_text(path) as file:
+        for event, element in iterparse(file, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = element
+                    if element.tag != RDF_ROOT:
+                        stack.append(None)
+                        yield from start_xml_node(element, stack, None, names, predicates)
+                    continue
+                parent = stack[-1] if stack else None
+                if parent is None or len(parent) == 3:
+                    yield from start_xml_node(element, stack, parent, names, predicates)
+                    continue
+                attributes = element.attrib
+                if RDF_PARSE_TYPE in attributes:
+                    raise ValueError(f"rdf:parseType n'est pas pris en charge : {element.tag}")
+                if element.tag in skipped:
+                    stack.append([parent[0], None, SKIPPED])
+                    continue
+                predicate = names.get(element.tag) or names.setdefault(element.tag, xml_uri(element.tag))
+                if predicates is not None and predicate not in predicates:
+                    skipped.add(element.tag)
+                    stack.append([parent[0], None, SKIPPED])
+                    continue
+                resource = attributes.get(RDF_RESOURCE)
+                if resource is not None:
+                    obj = URIRef(resource)
+                else:
+                    node_id = attributes.get(RDF_NODE_ID)
+                    obj = BNode(node_id) if node_id is not None else None
+                if obj is not None:
+                    yield parent[0], predicate, obj
+                stack.append([parent[0], predicate, obj])
+                continue
+
+            if element is root:
+                break
+            entry = stack.pop()
+            if entry is not None and len(entry) == 3 and entry[2] is None:
+                yield entry[0], entry[1], xml_literal(element)
+            if len(stack) <= 1:
+                # Élément de premier niveau lu : libérer la mémoire
+                root.clear()
+
+
+def start_xml_node(element, stack, parent, names, predicates=None):
+    attributes = element.attrib
+    about = attributes.get(RDF_ABOUT)
+    subject = URIRef(about) if about is not None else BNode(attributes.get(RDF_NODE_ID))
+    if parent is not None and parent[2] is not SKIPPED:
+        parent[2] = subject
+        yield parent[0], parent[1], subject
+    if element.tag != RDF_DESCRIPTION and (predicates is None or RDF.type in predicates):
+        yield subject, RDF.type, names.get(element.tag) or names.setdefault(element.tag, xml_uri(element.tag))
+    for name, value in attributes.items():
+        if not name.startswith(RDF_PREFIX) and not name.startswith(XML_PREFIX):
+            predicate = xml_uri(name)
+            if predicates is None or predicate in predicates:
+                yield subject, predicate, Literal(value)
+    stack.append([subject])
+
+
+def xml_uri(tag):
+    namespace, _, local_name = tag[1:].partition('}')
+    return URIRef(namespace + local_name)
+
+
+def xml_literal(element):
+    attributes = element.attrib
+    if not attributes:
+        return Literal(element.text or '')
+    datatype = attributes.get(RDF_DATATYPE)
+    return Literal(element.text or '', lang=attributes.get(XML_LANG),
+                   datatype=URIRef(datatype) if datatype else None)
+
+
+class ThesaurusHierarchy:
+    """
+    Classe ThesaurusHierarchy : Index des concepts principaux et plus spécifiques d'un thésaurus déjà généré.
+
+    ### Description :
+    Utilisé par le mode ajout (`append`) : les nouveaux items sont rattachés aux concepts existants
+    au lieu d'en créer de nouveaux. L'index est construit en deux lectures en continu du fichier (trois avec `count_items`),
+    sans graphe rdflib, et ne contient que les concepts principaux (`skos:hasTopConcept`) et leurs
+    concepts plus spécifiques, identifiés par leurs labels comme dans `make_skos_narrowed` :
+    - **main_concepts** (dict) : Label → URI des concepts principaux.
+    - **narrow_concepts** (dict) : (label du concept principal, label) → URI des concepts plus spécifiques.
+    - **item_counts** (dict) : Chemin de labels (voir `UriMinter`) → nombre d'items existants, si demandé.
+    """
+
+    def __init__(self, scheme_uri=None, main_concepts=None, narrow_concepts=None, item_counts=None):
+        self.scheme_uri = scheme_uri
+        self.main_concepts = main_concepts or {}
+        self.narrow_concepts = narrow_concepts or {}
+        self.item_counts = item_counts or {}
+
+    @classmethod
+    def read(cls, path, has_items=True, count_items=False):
+        """
+        Lit la hiérarchie d'un fichier SKOS généré.
+
+        ### Description :
+        La première lecture relève le schéma, les concepts principaux et les concepts qui ont des
+        concepts plus spécifiques ; la seconde, les labels de ces concepts et les liens entre eux.
+        Un fils d'un concept principal est un concept plus spécifique s'il a lui-même des fils
+        (ses items), ou si le thésaurus n'a pas d'items (`has_items=False`).
+
+        Avec `count_items`, une troisième lecture relève les labels des items pour compter les items
+        existants par chemin de labels : en mode `deterministic`, les occurrences des nouvelles lignes
+        sont numérotées à leur suite, et un item déjà présent ne reçoit pas la même URI.
+
+        ### Paramètres :
+        - **path** (str ou Path) : Fichier SKOS (RDF/XML, N-Triples ou N-Quads, éventuellement compressé).
+        - **has_items** (bool, optionnel) : Le thésaurus contient des items sous les concepts plus spécifiques.
+        - **count_items** (bool, optionnel) : Compte les items existants par chemin de labels.
+
+        ### Retour :
+        - **ThesaurusHierarchy** : Index des concepts.
+
+        ### Exceptions :
+        - `FileNotFoundError` : Si le fichier n'existe pas.
+        - `ValueError` : Si le fichier ne contient pas de schéma SKOS.
+        """
+        scheme_uri = None
+        top_concepts = set()
+        parents = set()
+        for subject, predicate, obj in iter_triples(path, {SKOS.hasTopConcept, SKOS.narrower, RDF.type}):
+            if predicate == SKOS.hasTopConcept:
+                top_concepts.add(obj)
+            elif predicate == SKOS.narrower:
+                parents.add(subject)
+            elif predicate == RDF.type and obj == SKOS.ConceptScheme and scheme_uri is None:
+                scheme_uri = subject
+        if scheme_uri is None:
+            raise ValueError(f"Aucun schéma SKOS (skos:ConceptScheme) dans {path}.")
+        inner_concepts = parents - top_concepts
+
+        count_items = count_items and has_items
+        labels = {}
+        children = []
+        item_parents = {}
+        for subject, predicate, obj in iter_triples(path, {SKOS.prefLabel, SKOS.narrower}):
+            if predicate == SKOS.prefLabel:
+                if subject in top_concepts or subject in inner_concepts:
+                    labels.setdefault(subject, str(obj))
+            elif predicate == SKOS.narrower and subject in top_concepts:
+                if obj in inner_concepts or not has_items:
+                    children.append((subject, obj))
+                elif count_items:
+                    item_parents[obj] = subject
+            elif predicate == SKOS.narrower and count_items and subject in inner_concepts:
+                item_parents[obj] = subject
+
+        main_concepts = {labels[uri]: uri for uri in top_concepts if uri in labels}
+        narrow_concepts = {}
+        for parent, child in children:
+            if parent in labels and child in labels:
+                narrow_concepts.setdefault((labels[parent], labels[child]), child)
+
+        item_counts = {}
+        if item_parents:
+            # Chemin de labels des parents des items : (concept principal, concept plus spécifique)
+            parent_paths = {uri: (labels[uri], '') for uri in top_concepts if uri in labels}
+            for parent, child in children:
+                if parent in labels and child in labels:
+                    parent_paths[child] = (labels[parent], labels[child])
+            for subject, _, obj in iter_triples(path, {SKOS.prefLabel}):
+                parent_path = parent_paths.get(item_parents.pop(subject, None))
+                if parent_path is not None:
+                    name = PATH_SEPARATOR.join((*parent_path, str(obj)))
+                    item_counts[name] = item_counts.get(name, 0) + 1
+        return cls(scheme_uri, main_concepts, narrow_concepts, item_counts)
@@ -1,11 +1,39 @@
-import pandas as pd
 from rdflib import Graph, URIRef, Literal, Namespace
 from rdflib.namespace import RDF, SKOS
 import uuid
 import math
-from mcc_skos_service.settings import Settings
+import time
+import json
+import os
+from contextlib import nullcontext
+from functools import lru_cache
+from mcc_skos_service.settings import get_settings
+from mcc_skos_service.skos_writer import SkosStreamWriter, SkosXmlWriter, SkosLineWriter
+from mcc_skos_service.skos_reader import ThesaurusHierarchy
+from mcc_skos_service.label_matching import cluster_labels
+from mcc_skos_service.concept_index import ConceptStore
+from mcc_skos_service.triple_buffer import TripleBuffer
+from mcc_skos_service.uri_minter import UriMinter, PATH_SEPARATOR
+from mcc_skos_service.manifest import ConceptManifest, content_hash
+from mcc_skos_service.instrumentation import Instrumentation, create_instrumentation
+from mcc_skos_service.compression import open_binary
+from mcc_skos_service.params import (PARALLEL_CHUNK_SIZE, OUTPUT_FORMATS, LINE_FORMATS, load_params, get_output_path,
+                                     get_serialization_format)
 from pathlib import Path
 
+# Nombre maximal de littéraux conservés par `get_literal` (les moins récemment utilisés sont oubliés)
+LITERAL_CACHE_SIZE = 65536
+
+# Termes SKOS de `create_concept` et `definition_scheme`, résolus une seule fois
+# (chaque accès à un attribut de `SKOS` est vérifié par rdflib)
+SKOS_CONCEPT = SKOS.Concept
+SKOS_CONCEPT_SCHEME = SKOS.ConceptScheme
+SKOS_IN_SCHEME = SKOS.inScheme
+SKOS_PREF_LABEL = SKOS.prefLabel
+SKOS_DEFINITION = SKOS.definition
+SKOS_NOTE = SKOS.note
+SKOS_HAS_TOP_CONCEPT = SKOS.hasTopConcept
+SKOS_NARROWER = SKOS.narrower
 
 def make_skos(
     imbrique: bool = None,
@@ -29,6 +57,26 @@ def make_skos(
     skos_narrow_concept_description_columns: str =None,
     output_file_name: str  = None,
     output_file_path: str  = None,
+    output_backend: str = None,
+    output_format: str = None,
+    output_compression: str = None,
+    csv_chunk_size: int = None,
+    csv_reader: str = None,
+    csv_cache_dir: str = None,
+    csv_cache_max_size: float = None,
+    uri_mode: str = None,
+    stable_uris: bool = None,
+    stable_uris_delta: bool = None,
+    incremental: bool = None,
+    append: bool = None,
+    near_duplicates: str = None,
+    near_duplicate_threshold: float = None,
+    concept_index: str = None,
+    concept_index_cache_size: int = None,
+    parallel_workers: int = None,
+    instrumentation=None,
+    instrumentation_interval: float = None,
+    profile: bool = None,
 ):    
     """
     Génère un fichier SKOS (Simple Knowledge Organization System) à partir d'un fichier CSV, avec la possibilité d'inclure des concepts imbriqués.
@@ -40,7 +88,7 @@ def make_skos(
     ### Paramètres :
     - **imbrique** (bool, optionnel) : Indique si les concepts doivent être imbriqués. Par défaut, `False`. Si `True`, des valeurs dynamiques pour les concepts principaux et imbriqués seront extraites du CSV.
     - **main_project_root** (str, optionnel) : Répertoire racine du projet.
-    - **csv_path** (str) : Chemin vers le fichier CSV contenant les données source.
+    - **csv_path** (str) : Chemin vers le fichier CSV contenant les données source. Un fichier compressé (`.csv.gz`, `.csv.zst`...) est décompressé à la lecture, selon son extension.
     - **csv_separateur** (str, optionnel) : Séparateur utilisé dans le fichier CSV (par défaut `,`).
     - **skos_prefLabel_columns** (list, optionnel) : Colonnes pour le label préférentiel (`skos:prefLabel`).
     - **skos_definition_columns** (list, optionnel) : Colonnes pour la définition (`skos:definition`).
@@ -59,6 +107,26 @@ def make_skos(
     - **skos_narrow_concept_description_columns** (list, optionnel) : Colonnes pour les descriptions des concepts imbriqués.
     - **output_file_name** (str, optionnel) : Nom du fichier SKOS généré.
     - **output_file_path** (str, optionnel) : Chemin où sauvegarder le fichier SKOS.
+    - **csv_chunk_size** (int, optionnel) : Si renseigné, le CSV est lu par blocs de ce nombre de lignes et seules les colonnes utilisées sont chargées, ce qui permet de traiter des fichiers plus grands que la mémoire.
+    - **csv_reader** (str, optionnel) : Lecteur du fichier CSV : `pandas` (par défaut), `csv` (module `csv` de la bibliothèque standard, sans pandas) ou `pyarrow` (lecteur multithread de `pyarrow.csv`). Avec `csv` et `pyarrow`, seules les colonnes utilisées sont lues, comme du texte, et les valeurs manquantes sont les mêmes qu'avec pandas (cellule vide, `NA`, `NaN`, `null`...).
+    - **csv_cache_dir** (str, optionnel) : Répertoire d'un cache des CSV déjà lus (voir `CsvCache`, nécessite `pyarrow`). Les générations suivantes à partir du même fichier, même avec d'autres colonnes ou un autre namespace, projettent l'entrée du cache en mémoire au lieu d'analyser à nouveau le CSV. Une modification du CSV (taille, date ou contenu) crée une nouvelle entrée.
+    - **csv_cache_max_size** (float, optionnel) : Taille maximale du cache des CSV, en Mo (1024 par défaut). Les entrées les moins récemment utilisées sont supprimées au-delà.
+    - **uri_mode** (str, optionnel) : `random` (par défaut) génère un UUID4 par concept ; `deterministic` dérive un UUID5 de l'URI du schéma et du chemin de labels du concept (principal → plus spécifique → item), pour que deux générations du même CSV produisent les mêmes URIs.
+    - **stable_uris** (bool, optionnel) : Conserve les URIs des concepts d'une génération à l'autre. Un manifeste (`<fichier>.manifest.json`) conserve l'URI et l'empreinte de chaque concept : les concepts déjà connus gardent leur URI, même en mode `random`. Le CSV est toujours lu et tous les concepts construits ; si aucun concept n'a changé, le fichier SKOS existant n'est pas réécrit, sinon il est entièrement réécrit (voir `incremental`).
+    - **stable_uris_delta** (bool, optionnel) : Avec `stable_uris`, écrit aussi `<fichier>.delta.json` avec les concepts ajoutés, supprimés et modifiés depuis la génération précédente.
+    - **incremental** (bool, optionnel) : Active `stable_uris` et ne reconstruit que les concepts ajoutés ou modifiés depuis la génération précédente : les lignes des autres concepts sont recopiées du fichier existant, sans celles des concepts supprimés ou modifiés. Le résultat est le même qu'une génération complète. Si le fichier ou le manifeste n'existe pas, ou si les paramètres du schéma ont changé, le fichier est entièrement généré. Nécessite `output_backend='stream'` et `output_format` `ntriples` ou `nquads`.
+    - **append** (bool, optionnel) : Ajoute les concepts du CSV au fichier SKOS existant au lieu de le remplacer. Le fichier est lu en continu pour indexer ses concepts principaux et plus spécifiques par label (voir `ThesaurusHierarchy`) ; les nouveaux items sont rattachés aux concepts existants et seuls les nouveaux concepts sont écrits à la fin du fichier. Nécessite `output_backend='stream'`.
+    - **near_duplicates** (str, optionnel) : Détecte, avant la création des concepts, les labels quasi identiques des concepts principaux et des concepts plus spécifiques (ex. `Céramique`, `ceramique `, `Céramiques`) et les écrit dans `<fichier>.near_duplicates.json` : `report` les signale seulement, `merge` rattache aussi chaque variante au concept du premier label de son groupe. Nécessite `imbrique=True`. Voir `cluster_labels`.
+    - **near_duplicate_threshold** (float, optionnel) : Similarité minimale (Jaccard des trigrammes de caractères, entre 0 et 1) de deux labels quasi identiques, une fois les accents, la casse et les espaces ignorés. Par défaut, 0.7 ; avec 1, seuls les labels identiques à ces différences près sont regroupés.
+    - **concept_index** (str, optionnel) : Index des concepts principaux et plus spécifiques, par label, en mode imbriqué : `memory` (par défaut) les garde dans des dictionnaires ; `sqlite` les stocke dans un fichier temporaire `<fichier>.concepts.sqlite`, supprimé à la fin, et n'en garde en mémoire que les plus récemment utilisés (voir `ConceptIndex`). Avec `output_backend='stream'`, la mémoire ne dépend alors plus de la taille du thésaurus (le décompte des occurrences de `UriMinter` est aussi stocké dans le fichier ; le manifeste de `stable_uris` et l'index du fichier existant en mode `append` restent en mémoire). Nécessite `imbrique=True` et `output_backend='stream'`.
+    - **concept_index_cache_size** (int, optionnel) : Avec `concept_index='sqlite'`, nombre d'entrées gardées en mémoire par index (100 000 par défaut).
+    - **parallel_workers** (int, optionnel) : Nombre de processus utilisés pour construire les concepts. Au-delà de 1, le CSV est découpé en blocs de `csv_chunk_size` lignes (20 000 par défaut) ; les concepts de chaque bloc sont construits dans un processus et écrits dans l'ordre des lignes. Nécessite `output_backend='stream'`.
+    - **output_backend** (str, optionnel) : `graph` (par défaut) construit un graphe rdflib puis le sérialise ; `stream` écrit chaque concept directement dans le fichier avec `SkosXmlWriter` (ou `SkosLineWriter`), sans garder le graphe en mémoire ; `buffer` garde les triplets dans un `TripleBuffer` compact (colonnes d'identifiants de termes) au lieu d'un graphe rdflib, puis les écrit.
+    - **output_format** (str, optionnel) : Format du fichier généré : `xml` (RDF/XML, par défaut), `ntriples`, `nquads`, `turtle` ou `json-ld`. L'extension du fichier (`.xml`, `.nt`, `.nq`, `.ttl`, `.jsonld`) est choisie selon le format. `ntriples` et `nquads` sont écrits ligne par ligne et sont les plus rapides ; avec `output_backend='stream'`, seuls `xml`, `ntriples` et `nquads` sont disponibles.
+    - **output_compression** (str, optionnel) : `gzip` ou `zstd` pour compresser le fichier généré au fil de l'écriture (extension `.gz` ou `.zst` ajoutée au nom). Par défaut, déduit de l'extension de `output_file_name` (ex. `thesaurus.nt.gz`).
+    - **instrumentation** (callable ou str, optionnel) : Active l'instrumentation (voir `Instrumentation`). Fonction appelée avec chaque événement (dictionnaire), ou chemin d'un fichier JSON Lines où les écrire. Les événements contiennent la durée des phases (`load_params`, `read`, `clean`, `build`, `serialize`), les compteurs (lignes lues, concepts créés, concepts principaux dédoublonnés, triplets, octets écrits) et le débit en lignes par seconde.
+    - **instrumentation_interval** (float, optionnel) : Intervalle minimal, en secondes, entre deux événements de progression (5 par défaut).
+    - **profile** (bool, optionnel) : Profile chaque phase de la génération (voir `PhaseProfiler`) et écrit, à côté du fichier SKOS, les statistiques cProfile (`<fichier>.profile.<phase>.pstats`), les piles d'appels repliées pour un flamegraph (`<fichier>.profile.folded`) et le résumé des allocations (`<fichier>.profile.allocations.txt`). Sans cette option, la génération n'est pas ralentie.
 
     ### Retour :
     - **str** : Chemin complet du fichier SKOS généré.
@@ -86,7 +154,7 @@ def make_skos(
     """
         
     # Charger les paramètres du fichier settings
-    settings = Settings()
+    settings = get_settings()
     
     params = {
         'main_project_root': main_project_root,
@@ -110,81 +178,201 @@ def make_skos(
         'skos_main_concept_description_columns': skos_main_concept_description_columns,
         'skos_narrow_concept_preflabel_columns': skos_narrow_concept_preflabel_columns,
         'skos_narrow_concept_description_columns': skos_narrow_concept_description_columns,
+        'output_backend': output_backend,
+        'output_format': output_format,
+        'output_compression': output_compression,
+        'csv_chunk_size': csv_chunk_size,
+        'csv_reader': csv_reader,
+        'csv_cache_dir': csv_cache_dir,
+        'csv_cache_max_size': csv_cache_max_size,
+        'uri_mode': uri_mode,
+        'stable_uris': stable_uris,
+        'stable_uris_delta': stable_uris_delta,
+        'incremental': incremental,
+        'append': append,
+        'near_duplicates': near_duplicates,
+        'near_duplicate_threshold': near_duplicate_threshold,
+        'concept_index': concept_index,
+        'concept_index_cache_size': concept_index_cache_size,
+        'parallel_workers': parallel_workers,
+        'instrumentation': instrumentation,
+        'instrumentation_interval': instrumentation_interval,
+        'profile': profile,
     }
     
     # Attribuer des valeurs par défaut depuis les paramètres si le paramètre est None
-    params = load_params(settings, params)
-    
-    # Vérifier si un concept plus spécifique existe
-    has_narrower = bool(params['concept_narrower_name'])    
+    start = time.perf_counter()
+    profiler = create_profiler(settings.PROFILE if profile is None else profile)
+    try:
+        with nullcontext() if profiler is None else profiler.phase('load_params'):
+            params = load_params(settings, params)
+    except BaseException:
+        if profiler is not None:
+            profiler.close()
+        raise
+    instrumentation = create_instrumentation(params['instrumentation'], params['instrumentation_interval'], start,
+                                             profiler)
+    instrumentation.record('load_params', time.perf_counter() - start)
     
-    # Créer le graphe RDF
-    g = Graph()
+    g = None
+    try:
+        # Définir un namespace pour les concepts
+        NS = Namespace(params['namespace'])
 
-    # Définir un namespace pour les concepts
-    NS = Namespace(params['namespace'])
-    g.bind("skos", SKOS)
+        manifest = load_manifest(params) if params['stable_uris'] else None
+        hierarchy = None
+        if params['append']:
+            # Index des concepts du fichier existant, dont les nouveaux concepts reprennent le schéma
+            with instrumentation.phase('read'):
+                hierarchy = load_hierarchy(params)
+            concept_scheme_uri = hierarchy.scheme_uri
+        elif manifest is not None and manifest.scheme_uri and not params['scheme_id']:
+            # Garder l'URI du schéma de la génération précédente
+            concept_scheme_uri = manifest.scheme_uri
+        else:
+            concept_scheme_uri = get_scheme_uri(params, NS)
+        if manifest is not None:
+            manifest.scheme_uri = concept_scheme_uri
 
-    concept_scheme_uri = URIRef(NS[ params['scheme_id']]) if params['scheme_id'] else get_new_uri(NS)
+        # Créer le graphe RDF
+        g = create_graph(params, concept_scheme_uri)
+        g.bind("skos", SKOS)
 
-    # Définir le schéma (Thésaurus)
-    definition_scheme(params['scheme_name'], params['scheme_definition'], g, concept_scheme_uri)
-    
-    if params['imbrique']:
-        return make_skos_narrowed(params, g, NS, concept_scheme_uri)
-
-    # Créer et ajouter des propriétés au concept principal
-    concept_uri = create_concept(params['concept_main_name'],
-                                      params['concept_main_definition'],
-                                      '',
-                                      g,
-                                      NS,
-                                      concept_scheme_uri,
-                                      True)  
-    
-    # Créer un nouveau URI pour le concept plus spécifique
-    if has_narrower:
-        concept_narrower_uri = create_concept(params['concept_narrower_name'],
-                                            params['concept_narrower_definition'],
-                                            '',
-                                            g,
-                                            NS,
-                                            concept_scheme_uri,
-                                            False,
-                                            concept_uri) 
+        # Définir le schéma (Thésaurus), sauf s'il existe déjà ou s'il est recopié du fichier existant
+        if hierarchy is None and not (manifest is not None and manifest.patch):
+            definition_scheme(params['scheme_name'], params['scheme_definition'], g, concept_scheme_uri)
+            instrumentation.count('triples_emitted', 3)
 
-    
-    # Charger les données du fichier CSV
-    df = pd.read_csv(params['csv_path'], encoding='utf-8', sep=params['csv_separateur'])
-    
-    # Ajouter des concepts au graphe
-    for _, row in df.iterrows():
-        cleaned_list_definition = clear_data(params['skos_definition_columns'], row)
-        cleaned_list_prefLabel = clear_data(params['skos_prefLabel_columns'], row)
-        cleaned_list_notes = clear_data(params['skos_notes_columns'], row)
-
-        # Créer un item spécifique dans le concept       
-        create_concept(cleaned_list_prefLabel,
-                       cleaned_list_definition,
-                       cleaned_list_notes,
+        minter = UriMinter(NS, concept_scheme_uri, params['uri_mode'] == 'deterministic', manifest,
+                           hierarchy.item_counts if hierarchy is not None else None)
+
+        if params['imbrique']:
+            final_path = make_skos_narrowed(params, g, NS, concept_scheme_uri, minter, instrumentation, hierarchy)
+        else:
+            final_path = make_skos_flat(params, g, NS, concept_scheme_uri, minter, instrumentation, hierarchy)
+    except BaseException as exc:
+        if isinstance(g, SkosStreamWriter):
+            g.abort()
+        instrumentation.finish('error', error=f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        if profiler is not None:
+            save_profile(profiler, params)
+
+    instrumentation.finish(output=final_path)
+    return final_path
+
+def make_skos_flat(params, g: Graph, NS: Namespace, concept_scheme_uri: URIRef, minter: UriMinter = None,
+                   instrumentation: Instrumentation = None, hierarchy: ThesaurusHierarchy = None):
+    """
+    Génère un fichier SKOS dont les items du CSV sont rattachés à un concept principal fixe.
+
+    ### Description :
+    En mode ajout (`hierarchy`), le concept principal et le concept plus spécifique sont repris du
+    fichier existant s'ils y figurent déjà avec le même label : seuls les items sont alors écrits.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire contenant les paramètres nécessaires à la génération du SKOS.
+    - **g** (Graph ou SkosStreamWriter) : Destination des triplets RDF.
+    - **NS** (Namespace) : Namespace RDF pour générer des URIs uniques.
+    - **concept_scheme_uri** (URIRef) : URI du schéma SKOS.
+    - **minter** (UriMinter, optionnel) : Générateur d'URIs des concepts. Par défaut, construit selon `uri_mode`.
+    - **instrumentation** (Instrumentation, optionnel) : Mesures de la génération. Par défaut, désactivée.
+    - **hierarchy** (ThesaurusHierarchy, optionnel) : Concepts du fichier existant, en mode ajout.
+
+    ### Retour :
+    - **Path** : Chemin complet du fichier SKOS généré.
+    """
+    minter = minter or UriMinter(NS, concept_scheme_uri, params['uri_mode'] == 'deterministic')
+    instrumentation = instrumentation or Instrumentation()
+    hierarchy = hierarchy or ThesaurusHierarchy()
+    track = minter.manifest is not None
+    unchanged = minter.manifest.unchanged if track else set()
+
+    # Vérifier si un concept plus spécifique existe
+    has_narrower = bool(params['concept_narrower_name'])
+    main_name = str(params['concept_main_name'])
+    narrower_name = str(params['concept_narrower_name']) if has_narrower else ''
+
+    # Créer et ajouter des propriétés au concept principal (sauf s'il existe déjà ou, en mode
+    # incrémental, s'il est inchangé)
+    concept_uri = hierarchy.main_concepts.get(main_name)
+    new_main = concept_uri is None
+    if new_main:
+        concept_uri = minter.mint_one(main_name, content=str(params['concept_main_definition']))
+        new_main = concept_uri not in unchanged
+    if new_main:
+        create_concept(params['concept_main_name'],
+                       params['concept_main_definition'],
+                       '',
                        g,
                        NS,
                        concept_scheme_uri,
-                       False,
-                        concept_uri if not has_narrower else concept_narrower_uri)
-        
-    final_path = Path(params['main_project_root'],params['output_file_path'], params['output_file_name'])
+                       True,
+                       concept_uri=concept_uri)
+
+    # Créer un nouveau URI pour le concept plus spécifique (sauf s'il existe déjà)
+    new_narrower = False
+    if has_narrower:
+        concept_narrower_uri = hierarchy.narrow_concepts.get((main_name, narrower_name))
+        new_narrower = concept_narrower_uri is None
+        if new_narrower:
+            concept_narrower_uri = minter.mint_one(main_name, narrower_name,
+                                                   content=str(params['concept_narrower_definition']))
+            new_narrower = concept_narrower_uri not in unchanged
+        if new_narrower:
+            create_concept(params['concept_narrower_name'],
+                           params['concept_narrower_definition'],
+                           '',
+                           g,
+                           NS,
+                           concept_scheme_uri,
+                           False,
+                           concept_uri,
+                           concept_uri=concept_narrower_uri)
+    instrumentation.count('concepts_created', new_main + new_narrower)
+    instrumentation.count('triples_emitted',
+                          new_main * concept_triple_count('', True)
+                          + new_narrower * concept_triple_count('', False, concept_uri))
+
+    parent_uri = concept_uri if not has_narrower else concept_narrower_uri
+    shards = create_shard_pool(params, g, NS, concept_scheme_uri)
     
-    if final_path.suffix != ".xml":
-        final_path = Path(f"{final_path}.xml")
+    # Charger les données du fichier CSV et ajouter des concepts au graphe
+    keys = ['skos_prefLabel_columns', 'skos_definition_columns', 'skos_notes_columns']
+    try:
+        for prepared in iter_prepared_chunks(params, keys, instrumentation):
+            # Générer les URIs de tous les items du bloc en une passe
+            item_uris = minter.mint([(main_name, narrower_name, label) for label in prepared['skos_prefLabel_columns']],
+                                    contents=join_contents(*(prepared[key] for key in keys)) if track else None)
+
+            # Créer un item spécifique dans le concept pour chaque ligne
+            items = (*(prepared[key] for key in keys), [parent_uri] * len(item_uris), item_uris)
+            emit_chunk(skip_unchanged([items], unchanged), g, NS, concept_scheme_uri, shards, instrumentation)
+
+        if shards is not None:
+            with instrumentation.phase('build'):
+                shards.close()
+    except BaseException:
+        if shards is not None:
+            shards.abort()
+        raise
         
-    # Sauvegarder le graphe en format XML/RDF (SKOS)
-    g.serialize(destination=str(final_path), format="pretty-xml", encoding='utf-8')
+    final_path = get_output_path(params)
 
-    print(f"Fichier SKOS XML généré : {final_path}")
+    # Sauvegarder le graphe dans le format demandé (SKOS)
+    with instrumentation.phase('serialize'):
+        written = save_graph(g, final_path, format=get_serialization_format(params, "pretty-xml"),
+                             encoding='utf-8', manifest=minter.manifest, compression=params['output_compression'],
+                             instrumentation=instrumentation)
+    if written:
+        instrumentation.count('bytes_written', final_path.stat().st_size)
+
+    print(f"Fichier SKOS généré : {final_path}")
     return final_path
 
-def make_skos_narrowed(params, g: Graph, NS: Namespace, concept_scheme_uri: URIRef):       
+def make_skos_narrowed(params, g: Graph, NS: Namespace, concept_scheme_uri: URIRef, minter: UriMinter = None,
+                       instrumentation: Instrumentation = None, hierarchy: ThesaurusHierarchy = None):
     """
     Génère un fichier SKOS avec des concepts principaux et leurs sous-concepts à partir d'un fichier CSV.
 
@@ -194,114 +382,543 @@ def make_skos_narrowed(params, g: Graph, NS: Namespace, concept_scheme_uri: URIR
     peut contenir des données pour un concept principal et, éventuellement, un ou plusieurs sous-concepts 
     ou éléments associés.
 
+    Les concepts principaux sont dédoublonnés par label, et les sous-concepts par couple (label du
+    concept principal, label du sous-concept) : chacun est créé une seule fois, à sa première ligne,
+    et les items des lignes suivantes lui sont rattachés. En mode ajout (`hierarchy`), les index
+    partent des concepts du fichier existant : les items y sont rattachés sans les réécrire.
+    Avec `concept_index='sqlite'`, ces index sont stockés dans un fichier (voir `ConceptIndex`).
+
     ### Paramètres :
     - **params** (dict) : Dictionnaire contenant les paramètres nécessaires à la génération du SKOS.
-    - **g** (Graph) : Objet Graph pour gérer les données RDF.
+    - **g** (Graph ou SkosStreamWriter) : Destination des triplets RDF.
     - **NS** (Namespace) : Namespace RDF pour générer des URIs uniques.
     - **concept_scheme_uri** (URIRef) : URI du schéma SKOS.
+    - **minter** (UriMinter, optionnel) : Générateur d'URIs des concepts. Par défaut, construit selon `uri_mode`.
+    - **instrumentation** (Instrumentation, optionnel) : Mesures de la génération. Par défaut, désactivée.
+    - **hierarchy** (ThesaurusHierarchy, optionnel) : Concepts du fichier existant, en mode ajout.
 
     ### Retour :
     - **Path** : Chemin complet du fichier SKOS généré.
     """
-    df = pd.read_csv(params['csv_path'], encoding='utf-8', sep=params['csv_separateur'])
-    main_concepts = {}
-    for _, row in df.iterrows(): 
-        main_concept_list_prefLabel = clear_data(params['skos_main_concept_preflabel_columns'], row)
-        main_concept_list_description = clear_data(params['skos_main_concept_description_columns'], row)
-        narrow_concept_list_prefLabel = clear_data(params['skos_narrow_concept_preflabel_columns'], row)
-        narrow_concept_list_description = clear_data(params['skos_narrow_concept_description_columns'], row)
-                
-        try:            
-            main_concept_uri = main_concepts[main_concept_list_prefLabel]
-        except KeyError:           
-            main_concept_uri = create_concept(main_concept_list_prefLabel,
-                                          main_concept_list_description,
-                                          '',
-                                          g,
-                                          NS,
-                                          concept_scheme_uri,
-                                          True)
-            main_concepts[main_concept_list_prefLabel] = main_concept_uri
-                        
-        has_narrower = bool(narrow_concept_list_prefLabel)
-        if has_narrower:
-            narrow_concept_uri = create_concept(narrow_concept_list_prefLabel,
-                                            narrow_concept_list_description,
-                                            '',
-                                            g,
-                                            NS,
-                                            concept_scheme_uri,
-                                            False,
-                                            main_concept_uri)
-            
-            
-        if params['skos_prefLabel_columns']:      
-            item_cleaned_list_definition = clear_data(params['skos_definition_columns'], row)
-            item_cleaned_list_prefLabel = clear_data(params['skos_prefLabel_columns'], row)
-            item_cleaned_list_notes = clear_data(params['skos_notes_columns'], row)
-
-            # Créer un item spécifique dans le concept       
-            create_concept(item_cleaned_list_prefLabel,
-                           item_cleaned_list_definition,
-                           item_cleaned_list_notes,
-                           g,
-                           NS,
-                           concept_scheme_uri,
-                           False,
-                            main_concept_uri if not has_narrower else narrow_concept_uri)
-    
-    final_path = Path(params['main_project_root'],params['output_file_path'], params['output_file_name'])
+    minter = minter or UriMinter(NS, concept_scheme_uri, params['uri_mode'] == 'deterministic')
+    instrumentation = instrumentation or Instrumentation()
+    hierarchy = hierarchy or ThesaurusHierarchy()
+    track = minter.manifest is not None
+    unchanged = minter.manifest.unchanged if track else set()
+    has_items = bool(params['skos_prefLabel_columns'])
+
+    main_map, narrow_map = find_near_duplicates(params, instrumentation) if params['near_duplicates'] else ({}, {})
+
+    # Les index des concepts principaux et des sous-concepts sont partagés par tous les blocs du CSV
+    store = create_concept_store(params)
+    if store is None:
+        main_concepts = dict(hierarchy.main_concepts)
+        narrow_concepts = dict(hierarchy.narrow_concepts)
+    else:
+        main_concepts = store.index('main_concepts')
+        narrow_concepts = store.index('narrow_concepts')
+        main_concepts.update(hierarchy.main_concepts)
+        narrow_concepts.update(hierarchy.narrow_concepts)
+        minter.store_occurrences(store.index('occurrences', int))
+    row_params = params
+    if not has_items:
+        # Sans items, leurs colonnes ne sont ni lues ni validées
+        row_params = dict(params, skos_definition_columns=None, skos_notes_columns=None)
+    item_keys = ['skos_prefLabel_columns', 'skos_definition_columns', 'skos_notes_columns']
+    keys = ['skos_main_concept_preflabel_columns',
+            'skos_main_concept_description_columns',
+            'skos_narrow_concept_preflabel_columns',
+            'skos_narrow_concept_description_columns'] + item_keys
+    shards = create_shard_pool(params, g, NS, concept_scheme_uri)
+    try:
+        for prepared in iter_prepared_chunks(row_params, keys, instrumentation):
+            # Remplacer les variantes par le label retenu de leur groupe
+            main_labels = prepared['skos_main_concept_preflabel_columns']
+            if main_map:
+                main_labels = prepared['skos_main_concept_preflabel_columns'] = [
+                    main_map.get(label, label) for label in main_labels]
+            narrow_labels = prepared['skos_narrow_concept_preflabel_columns']
+            if narrow_map:
+                narrow_labels = prepared['skos_narrow_concept_preflabel_columns'] = [
+                    narrow_map.get((main_label, label), label) for main_label, label in zip(main_labels, narrow_labels)]
+            narrow_descriptions = prepared['skos_narrow_concept_description_columns']
+            if store is not None:
+                # Lire en une fois les entrées des labels du bloc
+                main_concepts.prefetch(main_labels)
+                narrow_concepts.prefetch((main_label, narrow_label) for main_label, narrow_label
+                                        in zip(main_labels, narrow_labels) if narrow_label)
+            main_descriptions = {}
+            if track:
+                for label, description in zip(main_labels, prepared['skos_main_concept_description_columns']):
+                    main_descriptions.setdefault(label, description)
+
+            # Générer en une passe les URIs des concepts du bloc : concepts principaux
+            # encore inconnus, concepts plus spécifiques et items
+            new_main_labels = [label for label in dict.fromkeys(main_labels) if label not in main_concepts]
+            new_main_uris = dict(zip(new_main_labels, minter.mint(
+                [(label,) for label in new_main_labels],
+                unique=True,
+                contents=join_contents(new_main_labels, [main_descriptions[label] for label in new_main_labels])
+                if track else None)))
+            narrow_keys = [(main_label, narrow_label) if narrow_label else None
+                           for main_label, narrow_label in zip(main_labels, narrow_labels)]
+            new_narrow_rows = {}
+            for index, key in enumerate(narrow_keys):
+                if key is not None and key not in narrow_concepts:
+                    new_narrow_rows.setdefault(key, index)
+            new_narrow_uris = dict(zip(new_narrow_rows, minter.mint(
+                list(new_narrow_rows),
+                unique=True,
+                contents=join_contents([narrow_labels[index] for index in new_narrow_rows.values()],
+                                       [narrow_descriptions[index] for index in new_narrow_rows.values()])
+                if track else None)))
+            item_uris = minter.mint(
+                [(main_label, narrow_label, item_label)
+                 for main_label, narrow_label, item_label in zip(main_labels, narrow_labels,
+                                                                 prepared['skos_prefLabel_columns'])],
+                contents=join_contents(*(prepared[key] for key in item_keys)) if track else None
+            ) if has_items else []
+
+            # Les concepts principaux sont dédoublonnés avant la création des autres concepts ; en
+            # mode incrémental, les concepts inchangés sont recopiés du fichier existant
+            created_main = sum(new_main_uris[label] not in unchanged for label in new_main_labels)
+            instrumentation.count('concepts_created', created_main)
+            instrumentation.count('triples_emitted', created_main * concept_triple_count('', True))
+            instrumentation.count('main_concepts_deduplicated', len(main_labels) - len(new_main_labels))
+            main_concept_uris = []
+            for main_concept_list_prefLabel, main_concept_list_description in zip(
+                main_labels, prepared['skos_main_concept_description_columns']
+            ):
+                try:            
+                    main_concept_uri = main_concepts[main_concept_list_prefLabel]
+                except KeyError:           
+                    main_concept_uri = new_main_uris[main_concept_list_prefLabel]
+                    if main_concept_uri not in unchanged:
+                        create_concept(main_concept_list_prefLabel,
+                                       main_concept_list_description,
+                                       '',
+                                       g,
+                                       NS,
+                                       concept_scheme_uri,
+                                       True,
+                                       concept_uri=main_concept_uri)
+                    main_concepts[main_concept_list_prefLabel] = main_concept_uri
+                main_concept_uris.append(main_concept_uri)
+
+            # Concepts plus spécifiques, créés à la première ligne de leur couple (concept principal,
+            # label), puis items rattachés au concept plus spécifique de leur ligne, sinon à leur
+            # concept principal
+            narrow_concept_uris = []
+            item_narrow_uris = []
+            for key in narrow_keys:
+                created = key is not None and key not in narrow_concepts
+                if created:
+                    narrow_concepts[key] = new_narrow_uris[key]
+                narrow_concept_uris.append(narrow_concepts[key] if created else None)
+                item_narrow_uris.append(narrow_concepts.get(key))
+            instrumentation.count('narrower_concepts_deduplicated',
+                                  len(narrow_keys) - narrow_keys.count(None) - len(new_narrow_uris))
+            groups = [(narrow_labels, narrow_descriptions, [''] * len(narrow_labels),
+                       main_concept_uris, narrow_concept_uris)]
+            if has_items:
+                item_parents = [narrow_uri or main_uri
+                                for narrow_uri, main_uri in zip(item_narrow_uris, main_concept_uris)]
+                groups.append((*(prepared[key] for key in item_keys), item_parents, item_uris))
+            emit_chunk(skip_unchanged(groups, unchanged), g, NS, concept_scheme_uri, shards, instrumentation)
+
+        if shards is not None:
+            with instrumentation.phase('build'):
+                shards.close()
+    except BaseException:
+        if shards is not None:
+            shards.abort()
+        raise
+    finally:
+        if store is not None:
+            store.close()
     
-    if final_path.suffix != ".xml":
-        final_path = Path(f"{final_path}.xml")
-        
-    # Sauvegarder le graphe en format XML/RDF (SKOS)
-    g.serialize(destination=str(final_path), format="xml", encoding='iso-8859-1')
+    final_path = get_output_path(params)
+
+    # Sauvegarder le graphe dans le format demandé (SKOS)
+    with instrumentation.phase('serialize'):
+        written = save_graph(g, final_path, format=get_serialization_format(params, "xml"),
+                             encoding='utf-8', manifest=minter.manifest, compression=params['output_compression'],
+                             instrumentation=instrumentation)
+    if written:
+        instrumentation.count('bytes_written', final_path.stat().st_size)
 
-    print(f"Fichier SKOS XML généré : {final_path}")
+    print(f"Fichier SKOS généré : {final_path}")
     return final_path
     
 
-def load_params(settings, params):
+def find_near_duplicates(params, instrumentation=None):
     """
-    Charge les paramètres par défaut à partir d'un objet `settings` si les valeurs des paramètres sont `None`.
+    Regroupe les labels quasi identiques des concepts principaux et des concepts plus spécifiques.
+
+    ### Description :
+    Le CSV est lu une première fois, seulement pour les colonnes de ces labels, avant la création
+    des concepts (temps compté dans la phase `clean`). Les labels des concepts plus spécifiques ne
+    sont comparés qu'entre ceux d'un même concept principal (label retenu de son groupe). Les
+    groupes (voir `cluster_labels`) sont écrits dans `<fichier>.near_duplicates.json` : `main` est
+    la liste des groupes de labels de concepts principaux, `narrower` associe à chaque concept
+    principal ses groupes de labels de concepts plus spécifiques.
 
     ### Paramètres :
-    - **settings** : Objet contenant les paramètres par défaut.
-    - **params** (dict) : Dictionnaire de paramètres utilisateur.
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **instrumentation** (Instrumentation, optionnel) : Mesures de la génération.
 
     ### Retour :
-    - **dict** : Dictionnaire mis à jour avec les paramètres par défaut.
-    """
-    for key, value in params.items():
-        if value is None:
-            params[key] = getattr(settings, key.upper(), None)
-            
-    params['output_file_name'] = params['output_file_name'] or str(uuid.uuid4())
-    params['output_file_path'] = params['output_file_path'] or '/'
-    params['main_project_root'] = params['main_project_root'] or '/workspaces'
-    params['imbrique'] = params['imbrique'] or False
-    params['csv_separateur'] = params['csv_separateur'] or ','
-    
-    
-    if not params['csv_path']:
-        raise FileNotFoundError(f"Invalid CSV file path: '{params['csv_path']}'" )
-    
-    # Vérifier si imbrique=True, que les colonnes nécessaires sont spécifiées
-    if params['imbrique']:
-        if not params['skos_main_concept_preflabel_columns'] or params['skos_main_concept_preflabel_columns'] == ['']:
-            raise ValueError(
-                "Lorsque 'imbrique=True', 'skos_main_concept_preflabel_columns' est obligatoire. "
-                "Veuillez spécifier les colonnes pour les labels des concepts principaux."
-            )
+    - **tuple** : Avec `near_duplicates='merge'`, le label retenu par variante de label de concept principal
+      (dict), et par couple (concept principal retenu, variante de label de concept plus spécifique) (dict).
+      Avec `report`, deux dictionnaires vides.
+    """
+    instrumentation = instrumentation or Instrumentation()
+    threshold = params['near_duplicate_threshold']
+    main_key, narrow_key = 'skos_main_concept_preflabel_columns', 'skos_narrow_concept_preflabel_columns'
+    with instrumentation.phase('clean'):
+        main_labels = {}
+        narrow_labels = {}
+        for prepared in iter_prepared_chunks(params, [main_key, narrow_key]):
+            for main_label, narrow_label in zip(prepared[main_key], prepared[narrow_key]):
+                main_labels[main_label] = None
+                if narrow_label:
+                    narrow_labels.setdefault(main_label, {})[narrow_label] = None
+
+        main_clusters = cluster_labels([label for label in main_labels if label], threshold)
+        main_map = {label: cluster[0] for cluster in main_clusters for label in cluster[1:]}
+        scoped_labels = {}
+        for main_label, labels in narrow_labels.items():
+            scoped_labels.setdefault(main_map.get(main_label, main_label), {}).update(labels)
+        narrow_clusters = {}
+        for main_label, labels in scoped_labels.items():
+            clusters = cluster_labels(labels, threshold)
+            if clusters:
+                narrow_clusters[main_label] = clusters
+
+    report = {
+        'mode': params['near_duplicates'],
+        'threshold': threshold,
+        'clusters': {'main': main_clusters, 'narrower': narrow_clusters},
+    }
+    with open(f"{get_output_path(params)}.near_duplicates.json", 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    narrow_map = {(main_label, label): cluster[0]
+                  for main_label, clusters in narrow_clusters.items() for cluster in clusters for label in cluster[1:]}
+    instrumentation.count('near_duplicate_labels', len(main_map) + len(narrow_map))
+
+    if params['near_duplicates'] != 'merge':
+        return {}, {}
+    return main_map, narrow_map
+
+def get_scheme_uri(params, NS):
+    """
+    Retourne l'URI du schéma SKOS.
+
+    ### Description :
+    L'URI est construite à partir de `scheme_id` s'il est fourni. Sinon, elle est aléatoire, ou
+    dérivée du namespace et du nom du schéma si `uri_mode='deterministic'`.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **NS** (Namespace) : Namespace pour l'URI.
+
+    ### Retour :
+    - **URIRef** : URI du schéma.
+    """
+    if params['scheme_id']:
+        return URIRef(NS[params['scheme_id']])
+    if params['uri_mode'] == 'deterministic':
+        return URIRef(NS[str(uuid.uuid5(uuid.NAMESPACE_URL, f"{NS}{params['scheme_name']}"))])
+    return get_new_uri(NS)
+
+def load_hierarchy(params):
+    """
+    Lit les concepts du fichier SKOS existant, pour le mode ajout.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+
+    ### Retour :
+    - **ThesaurusHierarchy** : Schéma, concepts principaux et concepts plus spécifiques du fichier (et,
+      en mode `deterministic`, nombre d'items existants par chemin de labels).
+
+    ### Exceptions :
+    - `FileNotFoundError` : Si le fichier SKOS n'existe pas.
+    """
+    final_path = get_output_path(params)
+    if not final_path.exists():
+        raise FileNotFoundError(f"Fichier SKOS introuvable pour le mode ajout : '{final_path}'")
+    has_items = bool(params['skos_prefLabel_columns']) or not params['imbrique']
+    return ThesaurusHierarchy.read(final_path, has_items=has_items,
+                                   count_items=params['uri_mode'] == 'deterministic')
+
+def load_manifest(params):
+    """
+    Charge le manifeste des URIs des concepts (`stable_uris`), situé à côté du fichier SKOS.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+
+    ### Retour :
+    - **ConceptManifest** : Manifeste de la génération précédente (vide s'il n'existe pas). En mode
+      `incremental`, son attribut `patch` indique si le fichier existant peut être complété.
+    """
+    final_path = get_output_path(params)
+    # Paramètres du schéma qui ne dépendent pas du CSV
+    fingerprint = content_hash(PATH_SEPARATOR.join(
+        str(params[key]) for key in ('namespace', 'scheme_id', 'scheme_name', 'scheme_definition', 'imbrique')
+    ))
+    manifest = ConceptManifest(f"{final_path}.manifest.json", fingerprint)
+    if params['stable_uris_delta']:
+        manifest.delta_path = Path(f"{final_path}.delta.json")
+    manifest.patch = (params['incremental'] and final_path.exists()
+                      and manifest.previous_fingerprint == manifest.fingerprint)
+    return manifest
+
+
+def create_graph(params, concept_scheme_uri=None):
+    """
+    Crée la destination des triplets RDF selon `output_backend` et `output_format`.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **concept_scheme_uri** (URIRef, optionnel) : URI du schéma SKOS, utilisée comme graphe nommé en N-Quads.
+
+    ### Retour :
+    - **Graph, TripleBuffer ou SkosStreamWriter** : Un graphe rdflib (`graph`), un tampon compact (`buffer`)
+      ou un écrivain en continu (`stream`) : `SkosLineWriter` pour N-Triples et N-Quads, sinon `SkosXmlWriter`.
+    """
+    graph_name = concept_scheme_uri if params['output_format'] == 'nquads' else None
+    if params['output_backend'] == 'buffer':
+        return TripleBuffer(identifier=graph_name)
+    if params['output_backend'] == 'stream':
+        if params['output_format'] in LINE_FORMATS:
+            return SkosLineWriter(get_output_path(params), graph_name=graph_name,
+                                  compression=params['output_compression'], append=params['append'])
+        return SkosXmlWriter(get_output_path(params), encoding='utf-8', compression=params['output_compression'],
+                             append=params['append'])
+    return Graph(identifier=graph_name)
+
+def save_graph(g, final_path, format, encoding, manifest=None, compression=None, instrumentation=None):
+    """
+    Sauvegarde les triplets RDF dans le fichier de sortie.
+
+    ### Description :
+    Avec un manifeste (`stable_uris`), le fichier existant est conservé tel quel si aucun concept
+    n'a changé depuis la génération précédente ; le manifeste (et le fichier delta, si demandé)
+    est ensuite mis à jour. En mode incrémental (`manifest.patch`), les lignes des concepts inchangés
+    sont recopiées du fichier existant à la suite des concepts reconstruits.
+
+    Le fichier est écrit sous un nom temporaire (`.part`), puis renommé. Juste avant, le dernier
+    point d'interruption de `instrumentation` est atteint (voir `Instrumentation.checkpoint`) : une
+    génération annulée pendant la sérialisation ne laisse donc aucun fichier.
+
+    ### Paramètres :
+    - **g** (Graph, TripleBuffer ou SkosStreamWriter) : Destination des triplets RDF.
+    - **final_path** (Path) : Chemin du fichier de sortie.
+    - **format** (str) : Format de sérialisation rdflib (ignoré par les écrivains en continu). N-Triples
+      et N-Quads sont écrits avec `SkosLineWriter`, plus rapide que les sérialiseurs de rdflib. Un
+      `TripleBuffer` est écrit en RDF/XML avec `SkosXmlWriter` ; pour les autres formats, il est
+      d'abord converti en graphe rdflib.
+    - **encoding** (str) : Encodage du fichier (fixé à la création pour les écrivains en continu).
+    - **manifest** (ConceptManifest, optionnel) : Manifeste des URIs des concepts (`stable_uris`).
+    - **compression** (str, optionnel) : `gzip` ou `zstd` pour compresser le fichier (fixé à la création
+      pour les écrivains en continu).
+    - **instrumentation** (Instrumentation, optionnel) : Instrumentation de la génération.
+
+    ### Retour :
+    - **bool** : `True` si le fichier de sortie a été écrit.
+    """
+    instrumentation = instrumentation or Instrumentation()
+    written = True
+    if manifest is not None and final_path.exists() and not manifest.has_changes():
+        instrumentation.checkpoint(final=True)
+        if isinstance(g, SkosStreamWriter):
+            g.abort()
+        print(f"Aucun changement depuis la génération précédente : {final_path}")
+        written = False
+    elif isinstance(g, SkosStreamWriter):
+        if manifest is not None and manifest.patch:
+            g.copy_lines(final_path, manifest.replaced_uris())
+        instrumentation.checkpoint(final=True)
+        g.close()
+    elif format in ('nt', 'nquads'):
+        with SkosLineWriter(final_path, graph_name=g.identifier if format == 'nquads' else None,
+                            compression=compression) as writer:
+            for triple in g:
+                writer.add(triple)
+            instrumentation.checkpoint(final=True)
+    elif isinstance(g, TripleBuffer) and format in ('xml', 'pretty-xml'):
+        with SkosXmlWriter(final_path, encoding=encoding, compression=compression) as writer:
+            g.write(writer)
+            instrumentation.checkpoint(final=True)
     else:
-        if not params['concept_main_name']:
-            raise ValueError(
-                "Lorsque 'imbrique=False', 'concept_main_name' est obligatoire. "
-                "Veuillez fournir un nom pour le concept principal."
-            )
-    
-    return params
+        if isinstance(g, TripleBuffer):
+            g = g.to_graph()
+        part_path = final_path.with_name(final_path.name + '.part')
+        try:
+            if compression is not None:
+                with open_binary(part_path, compression) as file:
+                    g.serialize(destination=file, format=format, encoding=encoding)
+            else:
+                g.serialize(destination=str(part_path), format=format, encoding=encoding)
+            instrumentation.checkpoint(final=True)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+        os.replace(part_path, final_path)
+
+    if manifest is not None:
+        if manifest.delta_path is not None:
+            manifest.write_delta(manifest.delta_path)
+        manifest.save()
+    return written
+
+def emit_chunk(groups, g, NS: Namespace, concept_scheme_uri, shards=None, instrumentation=None):
+    """
+    Crée les concepts d'un bloc du CSV, directement ou dans un processus du pool `shards`.
+
+    ### Paramètres :
+    - **groups** (list) : Groupes de concepts (voir `emit_concepts`).
+    - **g** (Graph ou SkosStreamWriter) : Destination des triplets RDF.
+    - **NS** (Namespace) : Namespace pour les URIs.
+    - **concept_scheme_uri** : URI du schéma SKOS.
+    - **shards** (ShardPool, optionnel) : Pool de processus du mode parallèle.
+    - **instrumentation** (Instrumentation, optionnel) : Compte les concepts et les triplets du bloc.
+    """
+    if instrumentation is not None and instrumentation.enabled:
+        count_concepts(groups, instrumentation)
+    if shards is None:
+        emit_concepts(groups, g, NS, concept_scheme_uri)
+    else:
+        shards.submit(groups)
+
+def skip_unchanged(groups, unchanged):
+    """
+    Retire des groupes d'un bloc les concepts inchangés du mode incrémental (voir `ConceptManifest`).
+
+    ### Paramètres :
+    - **groups** (list) : Groupes de concepts (voir `emit_concepts`).
+    - **unchanged** (set) : URIs des concepts recopiés du fichier existant.
+
+    ### Retour :
+    - **list** : Groupes dont l'URI des concepts inchangés est remplacée par `None`.
+    """
+    if not unchanged:
+        return groups
+    return [(names, definitions, notes, parent_uris, [None if uri in unchanged else uri for uri in concept_uris])
+            for names, definitions, notes, parent_uris, concept_uris in groups]
+
+def emit_concepts(groups, g, NS: Namespace, concept_scheme_uri):
+    """
+    Crée, ligne par ligne, les concepts de chaque groupe avec `create_concept`.
+
+    ### Description :
+    Un groupe est un tuple de listes de même longueur (une valeur par ligne du bloc) :
+    `(noms, définitions, notes, parents, uris)`. Les lignes dont l'URI est `None` sont ignorées.
+    Pour chaque ligne, les groupes sont traités dans l'ordre (ex. concept plus spécifique, puis item).
+
+    ### Paramètres :
+    - **groups** (list) : Groupes de concepts.
+    - **g** (Graph ou SkosStreamWriter) : Destination des triplets RDF.
+    - **NS** (Namespace) : Namespace pour les URIs.
+    - **concept_scheme_uri** : URI du schéma SKOS.
+    """
+    for row in zip(*(zip(*group) for group in groups)):
+        for name, definition, notes, parent_uri, concept_uri in row:
+            if concept_uri is not None:
+                create_concept(name, definition, notes, g, NS, concept_scheme_uri, False, parent_uri,
+                               concept_uri=concept_uri)
+
+def count_concepts(groups, instrumentation):
+    """
+    Ajoute aux compteurs de l'instrumentation les concepts et les triplets des groupes d'un bloc.
+
+    ### Paramètres :
+    - **groups** (list) : Groupes de concepts (voir `emit_concepts`).
+    - **instrumentation** (Instrumentation) : Instrumentation de la génération.
+    """
+    concepts = triples = 0
+    for names, definitions, notes, parent_uris, concept_uris in groups:
+        for note, parent_uri, concept_uri in zip(notes, parent_uris, concept_uris):
+            if concept_uri is not None:
+                concepts += 1
+                triples += concept_triple_count(note, False, parent_uri)
+    instrumentation.count('concepts_created', concepts)
+    instrumentation.count('triples_emitted', triples)
+
+def concept_triple_count(notes, is_top_concept=False, narrower_of=None):
+    """
+    Retourne le nombre de triplets ajoutés par `create_concept` pour un concept.
+
+    ### Paramètres :
+    - **notes** (str) : Notes du concept.
+    - **is_top_concept** (bool, optionnel) : Le concept est un top concept.
+    - **narrower_of** (URIRef, optionnel) : URI du concept parent.
+
+    ### Retour :
+    - **int** : Nombre de triplets.
+    """
+    return 4 + bool(notes) + bool(is_top_concept) + bool(narrower_of)
+
+def create_profiler(enabled):
+    """
+    Crée le profilage des phases du mode `profile`.
+
+    ### Paramètres :
+    - **enabled** (bool) : Active le profilage.
+
+    ### Retour :
+    - **PhaseProfiler ou None** : Profilage, ou `None` s'il est désactivé (le module `profiling` n'est alors pas importé).
+    """
+    if not enabled:
+        return None
+    from mcc_skos_service.profiling import PhaseProfiler
+    return PhaseProfiler()
+
+def save_profile(profiler, params):
+    """
+    Arrête le profilage et écrit ses rapports à côté du fichier SKOS.
+
+    ### Paramètres :
+    - **profiler** (PhaseProfiler) : Profilage de la génération.
+    - **params** (dict) : Dictionnaire de paramètres.
+    """
+    profiler.close()
+    paths = profiler.write(get_output_path(params))
+    print(f"Rapports de profilage : {', '.join(str(path) for path in paths)}")
+
+def create_concept_store(params):
+    """
+    Crée le fichier des index des concepts, si `concept_index='sqlite'`.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+
+    ### Retour :
+    - **ConceptStore ou None** : Fichier `<fichier>.concepts.sqlite`, ou `None` pour des index en mémoire.
+    """
+    if params['concept_index'] != 'sqlite':
+        return None
+    return ConceptStore(f"{get_output_path(params)}.concepts.sqlite", params['concept_index_cache_size'])
+
+def create_shard_pool(params, g, NS: Namespace, concept_scheme_uri):
+    """
+    Crée le pool de processus du mode parallèle, si `parallel_workers` est supérieur à 1.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **g** (SkosStreamWriter) : Écrivain du fichier de sortie.
+    - **NS** (Namespace) : Namespace pour les URIs.
+    - **concept_scheme_uri** : URI du schéma SKOS.
+
+    ### Retour :
+    - **ShardPool ou None** : Pool de processus, ou `None` en mode séquentiel.
+    """
+    if params['parallel_workers'] <= 1:
+        return None
+    from mcc_skos_service.parallel import ShardPool
+    return ShardPool(g, NS, concept_scheme_uri, params['parallel_workers'])
 
 def create_concept(
     name: str,
@@ -311,7 +928,8 @@ def create_concept(
     NS: Namespace,
     concept_scheme_uri,
     is_top_concept=False,
-    narrower_of=None
+    narrower_of=None,
+    concept_uri=None
 ):
     """
     Crée un concept SKOS et ajoute ses relations au graphe RDF.
@@ -320,31 +938,32 @@ def create_concept(
     - **name** (str) : Nom du concept.
     - **definition** (str) : Définition du concept.
     - **notes** (str, optionnel) : Notes associées au concept.
-    - **g** (Graph) : Objet Graph pour le RDF.
+    - **g** (Graph ou SkosStreamWriter) : Destination des triplets RDF.
     - **NS** (Namespace) : Namespace pour les URIs.
     - **concept_scheme_uri** : URI du schéma SKOS.
     - **is_top_concept** (bool, optionnel) : Définit si le concept est un top concept.
     - **narrower_of** (URIRef, optionnel) : URI d'un concept parent.
+    - **concept_uri** (URIRef, optionnel) : URI déjà générée pour le concept (voir `UriMinter`). Par défaut, une nouvelle URI est générée.
 
     ### Retour :
     - **URIRef** : URI du concept créé.
     """
-    concept_new_uri = get_new_uri(NS)
-    name_utf8 = Literal(name, lang="fr")
-    definition_utf8 = Literal(definition, lang="fr")
-    g.add((concept_new_uri, RDF.type, SKOS.Concept))
-    g.add((concept_new_uri, SKOS.inScheme, concept_scheme_uri))
-    g.add((concept_new_uri, SKOS.prefLabel, name_utf8))
-    g.add((concept_new_uri, SKOS.definition, definition_utf8))
+    concept_new_uri = concept_uri or get_new_uri(NS)
+    name_utf8 = get_literal(name)
+    definition_utf8 = get_literal(definition)
+    g.add((concept_new_uri, RDF.type, SKOS_CONCEPT))
+    g.add((concept_new_uri, SKOS_IN_SCHEME, concept_scheme_uri))
+    g.add((concept_new_uri, SKOS_PREF_LABEL, name_utf8))
+    g.add((concept_new_uri, SKOS_DEFINITION, definition_utf8))
     
     if notes:
-        notes_utf8 = Literal(notes, lang="fr")
-        g.add((concept_new_uri, SKOS.note, notes_utf8))
+        notes_utf8 = get_literal(notes)
+        g.add((concept_new_uri, SKOS_NOTE, notes_utf8))
 
     if is_top_concept:
-        g.add((concept_scheme_uri, SKOS.hasTopConcept, concept_new_uri))
+        g.add((concept_scheme_uri, SKOS_HAS_TOP_CONCEPT, concept_new_uri))
     if narrower_of:
-        g.add((narrower_of, SKOS.narrower, concept_new_uri))
+        g.add((narrower_of, SKOS_NARROWER, concept_new_uri))
 
     return concept_new_uri
 
@@ -355,15 +974,35 @@ def definition_scheme(scheme_name, scheme_definition, g: Graph, concept_scheme_u
     ### Paramètres :
     - **scheme_name** (str) : Nom du schéma.
     - **scheme_definition** (str) : Définition du schéma.
-    - **g** (Graph) : Graphe RDF.
+    - **g** (Graph ou SkosStreamWriter) : Destination des triplets RDF.
     - **concept_scheme_uri** : URI du schéma.
 
     ### Retour :
     - **None** : Ajoute des triples au graphe RDF.
     """
-    g.add((concept_scheme_uri, RDF.type, SKOS.ConceptScheme))
-    g.add((concept_scheme_uri,SKOS.prefLabel,Literal(scheme_name, "fr")))
-    g.add((concept_scheme_uri,SKOS.definition,Literal(scheme_definition, "fr")))
+    g.add((concept_scheme_uri, RDF.type, SKOS_CONCEPT_SCHEME))
+    g.add((concept_scheme_uri,SKOS_PREF_LABEL,get_literal(scheme_name)))
+    g.add((concept_scheme_uri,SKOS_DEFINITION,get_literal(scheme_definition)))
+
+@lru_cache(maxsize=LITERAL_CACHE_SIZE, typed=True)
+def get_literal(value):
+    """
+    Retourne le littéral RDF en français de `value`, partagé entre les concepts.
+
+    ### Description :
+    Les labels des concepts principaux et plus spécifiques, les définitions et les notes se
+    répètent d'une ligne à l'autre du CSV : le même objet `Literal` est réutilisé au lieu d'en
+    construire un nouveau pour chaque triplet, ce qui évite sa validation et réduit la mémoire
+    du graphe. Le cache est borné à `LITERAL_CACHE_SIZE` littéraux, les moins récemment utilisés
+    étant oubliés ; `get_literal.cache_info()` indique le nombre de réutilisations.
+
+    ### Paramètres :
+    - **value** (str) : Valeur du littéral.
+
+    ### Retour :
+    - **Literal** : Littéral de langue `fr`.
+    """
+    return Literal(value, lang="fr")
 
 def clear_data(columns, row):
     """
@@ -392,6 +1031,226 @@ def clear_data(columns, row):
         ]    
     return " - ".join(cleaned_list)
 
+def join_contents(*columns):
+    """
+    Regroupe, ligne par ligne, les valeurs qui forment le contenu d'un concept (`stable_uris`).
+
+    ### Paramètres :
+    - **columns** (list) : Listes de chaînes de même longueur.
+
+    ### Retour :
+    - **list** : Une chaîne par ligne.
+    """
+    return [PATH_SEPARATOR.join(values) for values in zip(*columns)]
+
+def read_csv_chunks(params, keys):
+    """
+    Lit le fichier CSV, en entier ou par blocs de `csv_chunk_size` lignes.
+
+    ### Description :
+    Sans `csv_chunk_size`, le fichier est lu en une fois, comme auparavant. Avec `csv_chunk_size`,
+    seules les colonnes référencées par `keys` sont lues (`usecols`), bloc par bloc, pour traiter
+    des fichiers plus grands que la mémoire. Les valeurs sont alors lues comme du texte (`dtype=str`) :
+    l'inférence de type de pandas pourrait sinon différer d'un bloc à l'autre (ex. `1` et `1.0`).
+
+    Avec `csv_cache_dir`, le fichier est lu depuis le cache des CSV (`CsvCache`) s'il y a déjà été
+    enregistré, sinon il y est ajouté ; seules les colonnes référencées par `keys` sont alors
+    converties en DataFrame, en lecture complète comme par blocs.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **keys** (list) : Clés des paramètres de colonnes utilisées.
+
+    ### Retour :
+    - **Iterator[pd.DataFrame]** : Blocs successifs du fichier CSV.
+    """
+    import pandas as pd
+
+    if params['csv_cache_dir']:
+        from mcc_skos_service.csv_cache import CsvCache
+        cache = CsvCache(params['csv_cache_dir'], params['csv_cache_max_size'])
+        if not params['csv_chunk_size']:
+            yield cache.read(params['csv_path'], params['csv_separateur'], get_used_columns(params, keys))
+        else:
+            yield from cache.read_chunks(params['csv_path'], params['csv_separateur'],
+                                         get_used_columns(params, keys), params['csv_chunk_size'])
+        return
+
+    if not params['csv_chunk_size']:
+        yield pd.read_csv(params['csv_path'], encoding='utf-8', sep=params['csv_separateur'])
+        return
+
+    usecols = get_used_columns(params, keys)
+    header = pd.read_csv(params['csv_path'], encoding='utf-8', sep=params['csv_separateur'], nrows=0).columns
+    if not set(usecols).issubset(header):
+        raise KeyError(f"Colonnes manquants: {set(usecols) - set(header)}")
+
+    with pd.read_csv(params['csv_path'],
+                     encoding='utf-8',
+                     sep=params['csv_separateur'],
+                     usecols=usecols or None,
+                     dtype=str,
+                     chunksize=params['csv_chunk_size']) as reader:
+        yield from reader
+
+def get_used_columns(params, keys):
+    """
+    Retourne les colonnes du CSV référencées par les paramètres `keys`, sans doublons.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **keys** (list) : Clés des paramètres de colonnes.
+
+    ### Retour :
+    - **list** : Noms des colonnes, dans l'ordre de première apparition.
+    """
+    columns = []
+    for key in keys:
+        for column in normalize_str(params[key]) or []:
+            if column and column not in columns:
+                columns.append(column)
+    return columns
+
+def iter_prepared_chunks(params, keys, instrumentation=None):
+    """
+    Parcourt le fichier CSV et retourne, pour chaque bloc, les chaînes nettoyées de chaque groupe de colonnes.
+
+    ### Description :
+    Le CSV est lu avec pandas (`prepare_columns`), ou sans pandas si `csv_reader` vaut `csv` ou
+    `pyarrow` (`prepare_text_columns`) ; les chaînes nettoyées sont les mêmes qu'en lecture par blocs.
+
+    Avec une `instrumentation`, la lecture de chaque bloc est comptée dans la phase `read`, son
+    nettoyage dans la phase `clean` et le temps passé par l'appelant à traiter le bloc (jusqu'à
+    la demande du bloc suivant) dans la phase `build`.
+
+    ### Paramètres :
+    - **params** (dict) : Dictionnaire de paramètres.
+    - **keys** (list) : Clés des paramètres de colonnes à préparer.
+    - **instrumentation** (Instrumentation, optionnel) : Mesures de la génération.
+
+    ### Retour :
+    - **Iterator[dict]** : Résultat de `prepare_columns` (ou `prepare_text_columns`) pour chaque bloc du CSV.
+    """
+    instrumentation = instrumentation or Instrumentation()
+    if params['csv_reader'] == 'pandas':
+        chunks, prepare = read_csv_chunks(params, keys), prepare_columns
+    else:
+        from mcc_skos_service.csv_reader import read_text_chunks
+        chunks = read_text_chunks(params['csv_path'], params['csv_separateur'], get_used_columns(params, keys),
+                                  params['csv_chunk_size'], params['csv_reader'])
+        prepare = prepare_text_columns
+    while True:
+        with instrumentation.phase('read'):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        with instrumentation.phase('clean'):
+            prepared = prepare(chunk, params, keys)
+        instrumentation.count('rows_read', len(chunk))
+        with instrumentation.phase('build'):
+            yield prepared
+
+def prepare_columns(df, params, keys):
+    """
+    Prépare, pour tout le DataFrame, les chaînes nettoyées de chaque groupe de colonnes.
+
+    ### Description :
+    Chaque clé de `keys` désigne un paramètre de colonnes (ex. `skos_prefLabel_columns`).
+    Les colonnes sont validées une seule fois puis jointes en bloc avec `clear_columns`,
+    ce qui évite d'appeler `clear_data` pour chaque ligne.
+
+    ### Paramètres :
+    - **df** (pd.DataFrame) : Données du fichier CSV.
+    - **params** (dict) : Dictionnaire de paramètres contenant les colonnes.
+    - **keys** (list) : Clés des paramètres de colonnes à préparer.
+
+    ### Retour :
+    - **dict** : Pour chaque clé, la liste des chaînes nettoyées (une par ligne), dans l'ordre de `keys`.
+    """
+    return {key: clear_columns(params[key], df) for key in keys}
+
+def prepare_text_columns(chunk, params, keys):
+    """
+    Équivalent de `prepare_columns` pour un bloc lu sans pandas (`csv_reader='csv'` ou `'pyarrow'`).
+
+    ### Description :
+    Comme avec `clear_data`, les valeurs manquantes sont ignorées et les autres sont jointes avec " - ".
+    Les valeurs sont celles écrites dans le CSV, comme en lecture par blocs (ex. `1` et non `1.0`).
+
+    ### Paramètres :
+    - **chunk** (TextChunk) : Bloc du fichier CSV.
+    - **params** (dict) : Dictionnaire de paramètres contenant les colonnes.
+    - **keys** (list) : Clés des paramètres de colonnes à préparer.
+
+    ### Retour :
+    - **dict** : Pour chaque clé, la liste des chaînes nettoyées (une par ligne), dans l'ordre de `keys`.
+    """
+    prepared = {}
+    for key in keys:
+        columns = normalize_str(params[key])
+        if columns == [''] or columns is None:
+            prepared[key] = [''] * len(chunk)
+        elif len(columns) == 1:
+            prepared[key] = [value or '' for value in chunk.columns[columns[0]]]
+        else:
+            prepared[key] = [
+                " - ".join([value for value in values if value is not None])
+                for values in zip(*(chunk.columns[column] for column in columns))
+            ]
+    return prepared
+
+def clear_columns(columns, df):
+    """
+    Version vectorisée de `clear_data` : nettoie les colonnes sur toutes les lignes du DataFrame.
+
+    ### Description :
+    Les valeurs `NaN` ou `None` sont ignorées et les autres sont jointes avec " - ",
+    colonne par colonne sur des tableaux entiers. Le résultat est identique à celui
+    de `clear_data` appliqué à chaque ligne de `df.iterrows()`.
+
+    ### Paramètres :
+    - **columns** (list ou str) : Colonnes à nettoyer.
+    - **df** (pd.DataFrame) : Données du fichier CSV.
+
+    ### Retour :
+    - **list** : Valeurs concaténées et nettoyées, une chaîne par ligne.
+    """
+    import numpy as np
+
+    columns = normalize_str(columns)
+
+    if columns == [''] or columns is None:
+        return [''] * len(df)
+
+    if not set(columns).issubset(df.columns):
+        raise KeyError(f"Colonnes manquants: {set(columns) - set(df.columns)}")
+
+    # `iterrows` convertit chaque ligne vers un type commun : un DataFrame
+    # entièrement numérique transforme ainsi les entiers en flottants. Le type
+    # dépend de toutes les colonnes du CSV, même si seules certaines ont été
+    # lues (voir `CsvCache.read`).
+    dtypes = df.attrs.get('csv_dtypes', list(df.dtypes))
+    row_dtype = None
+    if dtypes and all(dtype.kind in 'iuf' for dtype in dtypes):
+        row_dtype = np.result_type(*dtypes)
+
+    joined = np.full(len(df), '', dtype=object)
+    has_value = np.zeros(len(df), dtype=bool)
+    for column in columns:
+        series = df[column]
+        if row_dtype is not None:
+            series = series.astype(row_dtype)
+        present = series.notna().to_numpy()
+        values = series.astype(str).to_numpy(dtype=object)
+
+        both = has_value & present
+        joined[both] = joined[both] + " - " + values[both]
+        first = present & ~has_value
+        joined[first] = values[first]
+        has_value |= present
+
+    return joined.tolist()
+
 def normalize_str(columns):
     """
     Normalise une chaîne de caractères représentant des colonnes, en la transformant en une liste.
@@ -0,0 +1,433 @@
+import io
+import os
+import re
+import shutil
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+from rdflib import URIRef, BNode, Literal
+from rdflib.namespace import RDF, SKOS, split_uri
+from mcc_skos_service.compression import open_text, open_input_text
+
+# Taille de la fin d'un fichier RDF/XML lue pour y retrouver `</rdf:RDF>` (mode ajout)
+APPEND_TAIL_SIZE = 64 * 1024
+
+# Taille du début d'un fichier RDF/XML lue pour y vérifier les déclarations de namespaces (mode ajout)
+APPEND_HEAD_SIZE = 64 * 1024
+
+# Un retour chariot littéral serait normalisé en saut de ligne par le parseur XML.
+TEXT_ENTITIES = {'\r': '&#13;'}
+
+# Caractères échappés dans les littéraux N-Triples
+NTRIPLES_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+
+class SkosStreamWriter:
+    """
+    Classe SkosStreamWriter : Base des écrivains qui écrivent les triplets RDF directement dans
+    le fichier de sortie, sans construire de graphe rdflib en mémoire.
+
+    ### Description :
+    Les sous-classes exposent les méthodes `add` et `bind` d'un `Graph` et définissent l'en-tête
+    et la fin du document. Le fichier est écrit sous un nom temporaire (`.part`) puis renommé
+    par `close()`. Avec `compression`, le texte passe par le codec au fil de l'écriture.
+
+    Avec `append=True`, le fichier existant est d'abord copié dans le fichier temporaire, sans sa fin
+    de document, et les triplets sont écrits à la suite : `close()` réécrit la fin du document et
+    remplace le fichier existant, qui n'est jamais modifié en place. Une écriture interrompue,
+    même par l'arrêt du processus, le laisse donc intact.
+    """
+
+    def __init__(self, destination, encoding='utf-8', compression=None, append=False):
+        """
+        Initialisation de l'écrivain.
+
+        ### Paramètres :
+        - **destination** (str ou Path) : Chemin du fichier à produire.
+        - **encoding** (str, optionnel) : Encodage du fichier. Par défaut `utf-8`.
+        - **compression** (str, optionnel) : `gzip` ou `zstd` pour compresser le fichier.
+        - **append** (bool, optionnel) : Ajoute les triplets au fichier existant au lieu de le remplacer.
+        """
+        self.destination = Path(destination)
+        self.encoding = encoding
+        self.compression = compression
+        self.append = append
+        self._part_path = self.destination.with_name(self.destination.name + '.part')
+        self._file = None
+
+    def close(self):
+        """
+        Termine le document et renomme le fichier temporaire vers sa destination.
+
+        ### Retour :
+        - **Path** : Chemin du fichier écrit.
+        """
+        self._flush()
+        self._open()
+        self._file.write(self._footer())
+        self._file.close()
+        os.replace(self._part_path, self.destination)
+        return self.destination
+
+    def write_fragment(self, fragment):
+        """
+        Écrit tel quel un fragment produit par l'écrivain de fragments correspondant.
+
+        ### Paramètres :
+        - **fragment** (str) : Triplets déjà mis en forme, sans en-tête.
+        """
+        self._flush()
+        self._open()
+        self._file.write(fragment)
+
+    def abort(self):
+        """
+        Abandonne l'écriture et supprime le fichier temporaire (en mode ajout, le fichier existant est inchangé).
+        """
+        if self._file is not None:
+            self._file.close()
+            self._part_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _open(self):
+        if self._file is not None:
+            return
+        if self.append:
+            self._file = self._open_append()
+            return
+        self._file = open_text(self._part_path, self.compression, self.encoding, errors='xmlcharrefreplace')
+        self._file.write(self._header())
+
+    def _open_append(self):
+        # Copier le fichier existant sans sa fin de document, qui sera réécrite par `close()`
+        footer = self._footer().strip().encode(self.encoding)
+        with open(self.destination, 'rb') as file:
+            position = file.seek(0, os.SEEK_END)
+            if footer:
+                if self.compression is not None:
+                    raise ValueError(f"Impossible d'ajouter des triplets à un fichier compressé : {self.destination}")
+                file.seek(0)
+                self._check_header(file.read(APPEND_HEAD_SIZE))
+                file.seek(max(0, position - APPEND_TAIL_SIZE))
+                end = file.read()
+                index = end.rfind(footer)
+                if index < 0:
+                    raise ValueError(f"Fin du document introuvable : {self.destination}")
+                position -= len(end) - index
+        try:
+            shutil.copyfile(self.destination, self._part_path)
+            os.truncate(self._part_path, position)
+            return open_text(self._part_path, self.compression, self.encoding, errors='xmlcharrefreplace', mode='a')
+        except BaseException:
+            self._part_path.unlink(missing_ok=True)
+            raise
+
+    def _check_header(self, head):
+        pass
+
+    def _flush(self):
+        pass
+
+    def _header(self):
+        return ''
+
+    def _footer(self):
+        return ''
+
+
+class SkosXmlWriter(SkosStreamWriter):
+    """
+    Classe SkosXmlWriter : Écrit les triplets RDF/XML directement dans le fichier de sortie,
+    sans construire de graphe rdflib en mémoire.
+
+    ### Description :
+    L'objet expose les méthodes `add` et `bind` d'un `Graph`, il peut donc être passé
+    à `create_concept` et `definition_scheme`. Les triplets consécutifs d'un même sujet
+    sont regroupés dans un seul élément (`skos:Concept`, `skos:ConceptScheme` ou
+    `rdf:Description`) écrit dès que le sujet change. La mémoire utilisée reste donc
+    constante, quelle que soit la taille du CSV, et le graphe lu depuis le fichier est
+    le même que celui produit par `Graph.serialize`.
+
+    Le fichier est écrit sous un nom temporaire (`.part`) puis renommé par `close()`. En mode
+    ajout, les éléments sont insérés avant `</rdf:RDF>` dans une copie du fichier existant ; celui-ci
+    ne doit pas être compressé et doit déclarer les mêmes préfixes (`rdf`, `skos`...) que l'écrivain.
+    """
+
+    def __init__(self, destination, encoding='utf-8', compression=None, append=False):
+        """
+        Initialisation de l'écrivain.
+
+        ### Paramètres :
+        - **destination** (str ou Path) : Chemin du fichier RDF/XML à produire.
+        - **encoding** (str, optionnel) : Encodage du fichier. Par défaut `utf-8`.
+        - **compression** (str, optionnel) : `gzip` ou `zstd` pour compresser le fichier.
+        - **append** (bool, optionnel) : Ajoute les éléments au fichier existant au lieu de le remplacer.
+        """
+        super().__init__(destination, encoding, compression, append)
+        self._namespaces = {str(RDF): 'rdf', str(SKOS): 'skos'}
+        # Noms qualifiés déjà calculés, par URI de prédicat ou de type
+        self._qnames = {}
+        self._type_qnames = {}
+        self._subject = None
+        self._type = None
+        self._properties = []
+
+    def bind(self, prefix, namespace):
+        """
+        Associe un préfixe à un namespace pour les éléments écrits.
+
+        ### Paramètres :
+        - **prefix** (str) : Préfixe XML.
+        - **namespace** (str ou Namespace) : URI du namespace.
+        """
+        if self._file is not None:
+            raise RuntimeError("Les namespaces doivent être déclarés avant le premier triplet.")
+        self._namespaces[str(namespace)] = prefix
+        self._qnames.clear()
+        self._type_qnames.clear()
+
+    def add(self, triple):
+        """
+        Ajoute un triplet. Il est écrit dans le fichier dès que le sujet change.
+
+        ### Paramètres :
+        - **triple** (tuple) : Triplet `(sujet, prédicat, objet)`.
+        """
+        subject, predicate, obj = triple
+        if subject != self._subject:
+            self._flush()
+            self._subject = subject
+        if (predicate == RDF.type and self._type is None and not self._properties
+                and isinstance(obj, URIRef) and self._type_qname(obj)):
+            self._type = obj
+        else:
+            self._properties.append((predicate, obj))
+
+    def _header(self):
+        declarations = ''.join(
+            f'\n   xmlns:{prefix}={quoteattr(namespace)}'
+            for namespace, prefix in self._namespaces.items()
+        )
+        return f'<?xml version="1.0" encoding="{self.encoding}"?>\n<rdf:RDF{declarations}\n>\n'
+
+    def _footer(self):
+        return '</rdf:RDF>\n'
+
+    def _check_header(self, head):
+        head = head.decode(self.encoding, errors='replace')
+        for namespace, prefix in self._namespaces.items():
+            if not re.search(rf'xmlns:{re.escape(prefix)}\s*=\s*["\']{re.escape(namespace)}["\']', head):
+                raise ValueError(
+                    f"Le préfixe '{prefix}' ({namespace}) n'est pas déclaré dans {self.destination}."
+                )
+
+    def _flush(self):
+        if self._subject is None:
+            return
+        self._open()
+        element = self._type_qname(self._type) if self._type is not None else 'rdf:Description'
+        lines = [f'  <{element} {self._node_attribute(self._subject, "rdf:about")}>\n']
+        for predicate, obj in self._properties:
+            lines.append(f'    {self._property(predicate, obj)}\n')
+        lines.append(f'  </{element}>\n')
+        self._file.write(''.join(lines))
+        self._subject = None
+        self._type = None
+        self._properties = []
+
+    def _qname(self, uri):
+        qname = self._qnames.get(uri)
+        if qname is None:
+            qname = self._qnames[uri] = self._split_qname(uri)
+        return qname
+
+    def _split_qname(self, uri):
+        try:
+            namespace, local_name = split_uri(uri)
+        except ValueError:
+            raise ValueError(f"Impossible d'écrire le prédicat en RDF/XML : {uri}")
+        prefix = self._namespaces.get(namespace)
+        if prefix is None:
+            return f'ns0:{local_name}', f' xmlns:ns0={quoteattr(namespace)}'
+        return f'{prefix}:{local_name}', ''
+
+    def _type_qname(self, uri):
+        if uri not in self._type_qnames:
+            try:
+                namespace, local_name = split_uri(uri)
+            except ValueError:
+                self._type_qnames[uri] = None
+            else:
+                prefix = self._namespaces.get(namespace)
+                self._type_qnames[uri] = f'{prefix}:{local_name}' if prefix else None
+        return self._type_qnames[uri]
+
+    @staticmethod
+    def _node_attribute(node, about):
+        if isinstance(node, BNode):
+            return f'rdf:nodeID={quoteattr(str(node))}'
+        return f'{about}={quoteattr(str(node))}'
+
+    def _property(self, predicate, obj):
+        name, declaration = self._qname(predicate)
+        if isinstance(obj, Literal):
+            attributes = declaration
+            if obj.language:
+                attributes += f' xml:lang={quoteattr(obj.language)}'
+            elif obj.datatype:
+                attributes += f' rdf:datatype={quoteattr(str(obj.datatype))}'
+            return f'<{name}{attributes}>{escape(str(obj), TEXT_ENTITIES)}</{name}>'
+        return f'<{name}{declaration} {self._node_attribute(obj, "rdf:resource")}/>'
+
+
+class SkosLineWriter(SkosStreamWriter):
+    """
+    Classe SkosLineWriter : Écrit les triplets en N-Triples, ou en N-Quads si `graph_name` est
+    renseigné, directement dans le fichier de sortie.
+
+    ### Description :
+    Chaque triplet est écrit sur sa propre ligne, sans dépendre des triplets précédents : l'écriture
+    ne garde aucun état et les fragments construits en parallèle peuvent être concaténés tels quels.
+    Le fichier est toujours encodé en UTF-8.
+    """
+
+    def __init__(self, destination, graph_name=None, compression=None, append=False):
+        """
+        Initialisation de l'écrivain.
+
+        ### Paramètres :
+        - **destination** (str ou Path) : Chemin du fichier N-Triples ou N-Quads à produire.
+        - **graph_name** (URIRef, optionnel) : Graphe nommé des quadruplets (N-Quads).
+        - **compression** (str, optionnel) : `gzip` ou `zstd` pour compresser le fichier. En mode
+          ajout, les lignes sont écrites dans un nouveau membre compressé, à la suite d'une copie du fichier.
+        - **append** (bool, optionnel) : Ajoute les lignes à la fin du fichier existant au lieu de le remplacer.
+        """
+        super().__init__(destination, 'utf-8', compression, append)
+        self.graph_name = graph_name
+        self._end = f' {ntriples_term(graph_name)} .\n' if graph_name is not None else ' .\n'
+        # Termes déjà mis en forme, par prédicat
+        self._predicates = {}
+
+    def bind(self, prefix, namespace):
+        """
+        Sans effet : N-Triples et N-Quads n'utilisent pas de préfixes.
+        """
+
+    def add(self, triple):
+        """
+        Écrit un triplet.
+
+        ### Paramètres :
+        - **triple** (tuple) : Triplet `(sujet, prédicat, objet)`.
+        """
+        subject, predicate, obj = triple
+        term = self._predicates.get(predicate)
+        if term is None:
+            term = self._predicates[predicate] = ntriples_term(predicate)
+        self._open()
+        self._file.write(f'{ntriples_term(subject)} {term} {ntriples_term(obj)}{self._end}')
+
+    def copy_lines(self, path, dropped=()):
+        """
+        Recopie les lignes d'un fichier écrit par `SkosLineWriter`, sauf celles des concepts `dropped`.
+
+        ### Description :
+        Utilisé par le mode incrémental pour reprendre les concepts inchangés du fichier existant.
+        Les lignes d'un concept sont celles dont il est le sujet, sauf `skos:narrower` (qui appartient
+        au concept plus spécifique), et celles qui le rattachent à son parent ou au schéma
+        (`skos:narrower` et `skos:hasTopConcept`, dont il est l'objet). Le fichier est lu en continu,
+        et décompressé selon son extension.
+
+        ### Paramètres :
+        - **path** (str ou Path) : Fichier N-Triples ou N-Quads existant.
+        - **dropped** (iterable, optionnel) : URIs des concepts dont les lignes ne sont pas recopiées.
+        """
+        dropped = {f'<{uri}>' for uri in dropped}
+        narrower = ntriples_term(SKOS.narrower)
+        links = (narrower, ntriples_term(SKOS.hasTopConcept))
+        self._open()
+        with open_input_text(path, self.encoding) as file:
+            if not dropped:
+                shutil.copyfileobj(file, self._file)
+                return
+            for line in file:
+                subject, predicate, rest = line.split(' ', 2)
+                if subject in dropped and predicate != narrower:
+                    continue
+                if predicate in links and rest.split(' ', 1)[0] in dropped:
+                    continue
+                self._file.write(line)
+
+
+def ntriples_term(node):
+    """
+    Met en forme un terme RDF selon la syntaxe N-Triples.
+
+    ### Paramètres :
+    - **node** (URIRef, BNode ou Literal) : Terme RDF.
+
+    ### Retour :
+    - **str** : Terme N-Triples.
+    """
+    if isinstance(node, Literal):
+        value = f'"{str(node).translate(NTRIPLES_ESCAPES)}"'
+        if node.language:
+            return f'{value}@{node.language}'
+        if node.datatype:
+            return f'{value}^^<{node.datatype}>'
+        return value
+    if isinstance(node, BNode):
+        return f'_:{node}'
+    return f'<{node}>'
+
+
+class SkosFragmentMixin:
+    """
+    Classe SkosFragmentMixin : Fait écrire un `SkosStreamWriter` en mémoire, sans en-tête, pour produire
+    un fragment destiné à `write_fragment`. Utilisée par les processus du mode parallèle.
+    """
+
+    def getvalue(self):
+        """
+        Retourne le fragment écrit.
+
+        ### Retour :
+        - **str** : Triplets mis en forme.
+        """
+        self._flush()
+        return self._file.getvalue()
+
+    def close(self):
+        raise RuntimeError("Un fragment est récupéré avec getvalue(), pas écrit dans un fichier.")
+
+    def abort(self):
+        self._file = io.StringIO()
+
+
+class SkosFragmentWriter(SkosFragmentMixin, SkosXmlWriter):
+    """
+    Classe SkosFragmentWriter : Variante de `SkosXmlWriter` qui écrit en mémoire un fragment RDF/XML
+    (sans en-tête ni élément `rdf:RDF`), destiné à être inséré par `SkosXmlWriter.write_fragment`.
+    """
+
+    def __init__(self):
+        super().__init__(destination='fragment.xml')
+        self._file = io.StringIO()
+
+
+class SkosLineFragmentWriter(SkosFragmentMixin, SkosLineWriter):
+    """
+    Classe SkosLineFragmentWriter : Variante de `SkosLineWriter` qui écrit en mémoire un fragment
+    N-Triples ou N-Quads, destiné à être inséré par `SkosLineWriter.write_fragment`.
+    """
+
+    def __init__(self, graph_name=None):
+        super().__init__(destination='fragment.nt', graph_name=graph_name)
+        self._file = io.StringIO()
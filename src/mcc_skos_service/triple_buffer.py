@@ -0,0 +1,120 @@
+from array import array
+from rdflib import Graph
+
+
+class TripleBuffer:
+    """
+    Classe TripleBuffer : Destination compacte des triplets RDF, en ajout seul, pour `output_backend='buffer'`.
+
+    ### Description :
+    La génération n'interroge jamais le graphe : le store `Memory` de rdflib, qui indexe chaque
+    triplet dans plusieurs dictionnaires, est remplacé par trois colonnes d'entiers (`array`),
+    une par position du triplet. Chaque terme (URI ou littéral) n'est conservé qu'une fois et
+    reçoit un identifiant à son premier ajout.
+
+    L'objet expose les méthodes `add` et `bind` d'un `Graph`, il peut donc être passé à
+    `create_concept` et `definition_scheme`. Comme dans un `Graph`, un triplet ajouté plusieurs
+    fois n'est retourné qu'une fois. `to_graph()` construit le graphe rdflib équivalent pour les
+    formats qui nécessitent les sérialiseurs de rdflib.
+    """
+
+    def __init__(self, identifier=None):
+        """
+        Initialisation du tampon.
+
+        ### Paramètres :
+        - **identifier** (URIRef, optionnel) : Nom du graphe (N-Quads), comme `Graph.identifier`.
+        """
+        self.identifier = identifier
+        self.namespaces = {}
+        self._terms = []
+        self._ids = {}
+        self._columns = (array('I'), array('I'), array('I'))
+
+    def bind(self, prefix, namespace):
+        """
+        Associe un préfixe à un namespace, repris par `write` et `to_graph`.
+
+        ### Paramètres :
+        - **prefix** (str) : Préfixe.
+        - **namespace** (str ou Namespace) : URI du namespace.
+        """
+        self.namespaces[prefix] = namespace
+
+    def add(self, triple):
+        """
+        Ajoute un triplet.
+
+        ### Paramètres :
+        - **triple** (tuple) : Triplet `(sujet, prédicat, objet)`.
+        """
+        ids = self._ids
+        for column, term in zip(self._columns, triple):
+            term_id = ids.get(term)
+            if term_id is None:
+                term_id = ids[term] = len(self._terms)
+                self._terms.append(term)
+            column.append(term_id)
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __iter__(self):
+        """
+        Retourne les triplets distincts, dans l'ordre de leur premier ajout.
+        """
+        return self._iter_rows(self._unique_rows())
+
+    def write(self, writer):
+        """
+        Écrit les triplets avec un écrivain en continu, regroupés par sujet.
+
+        ### Description :
+        Les triplets d'un même sujet sont écrits à la suite, dans l'ordre de leur ajout (le type
+        d'un concept en premier) : `SkosXmlWriter` produit alors un seul élément par sujet, comme
+        `Graph.serialize`.
+
+        ### Paramètres :
+        - **writer** (SkosStreamWriter) : Écrivain du fichier de sortie, fermé par l'appelant.
+        """
+        import numpy as np
+
+        for prefix, namespace in self.namespaces.items():
+            writer.bind(prefix, namespace)
+        rows = self._unique_rows()
+        subjects = np.frombuffer(self._columns[0], dtype=np.uint32)[rows]
+        for triple in self._iter_rows(rows[np.argsort(subjects, kind='stable')]):
+            writer.add(triple)
+
+    def to_graph(self):
+        """
+        Construit le graphe rdflib contenant les triplets du tampon.
+
+        ### Retour :
+        - **Graph** : Graphe rdflib (store `Memory`), avec les préfixes déclarés par `bind`.
+        """
+        g = Graph(identifier=self.identifier)
+        for prefix, namespace in self.namespaces.items():
+            g.bind(prefix, namespace)
+        for triple in self:
+            g.add(triple)
+        return g
+
+    def _unique_rows(self):
+        # Indices des premières occurrences des triplets, dans l'ordre d'ajout
+        import numpy as np
+
+        if not len(self):
+            return np.zeros(0, dtype=np.intp)
+        triples = np.empty(len(self), dtype=[('s', np.uint32), ('p', np.uint32), ('o', np.uint32)])
+        for name, column in zip('spo', self._columns):
+            triples[name] = np.frombuffer(column, dtype=np.uint32)
+        _, rows = np.unique(triples, return_index=True)
+        rows.sort()
+        return rows
+
+    def _iter_rows(self, rows):
+        terms = self._terms
+        subjects, predicates, objects = self._columns
+        for row in rows.tolist():
+            yield terms[subjects[row]], terms[predicates[row]], terms[objects[row]]
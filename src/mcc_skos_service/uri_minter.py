@@ -0,0 +1,147 @@
+import hashlib
+import uuid
+from rdflib import URIRef, Namespace
+
+# Sépare les labels d'un chemin (concept principal → plus spécifique → item)
+PATH_SEPARATOR = '\x1f'
+
+
+class UriMinter:
+    """
+    Classe UriMinter : Génère les URIs des concepts d'un schéma SKOS, par lots.
+
+    ### Description :
+    En mode `random`, chaque concept reçoit un UUID4, comme avec `get_new_uri`.
+    En mode `deterministic`, l'URI est un UUID5 calculé à partir de l'URI du schéma et du
+    chemin de labels du concept (concept principal → concept plus spécifique → item) :
+    une nouvelle génération à partir du même CSV produit donc les mêmes URIs.
+
+    Deux concepts ayant le même chemin reçoivent des URIs distinctes : la n-ième occurrence
+    d'un chemin (n > 1) est suffixée par son rang avant le calcul du UUID5. En mode ajout, le
+    décompte part des items du fichier existant (`occurrences`). Ce décompte a une entrée par
+    chemin : avec `concept_index='sqlite'`, il est déplacé dans le fichier des index
+    (`store_occurrences`) pour que la mémoire ne dépende pas du nombre de concepts.
+
+    Avec un `ConceptManifest` (`stable_uris`), les concepts déjà présents dans le manifeste
+    précédent gardent leur URI.
+    """
+
+    def __init__(self, NS: Namespace, concept_scheme_uri, deterministic=False, manifest=None, occurrences=None):
+        """
+        Initialisation du générateur d'URIs.
+
+        ### Paramètres :
+        - **NS** (Namespace) : Namespace pour les URIs.
+        - **concept_scheme_uri** (URIRef) : URI du schéma SKOS, utilisée comme graine des UUID5.
+        - **deterministic** (bool, optionnel) : Active le mode déterministe. Par défaut `False`.
+        - **manifest** (ConceptManifest, optionnel) : Manifeste des URIs des concepts (`stable_uris`).
+        - **occurrences** (dict, optionnel) : Nombre de concepts déjà générés par chemin de labels
+          (voir `ThesaurusHierarchy.item_counts`).
+        """
+        self.NS = NS
+        self.deterministic = deterministic
+        self.manifest = manifest
+        namespace_uuid = uuid.uuid5(uuid.NAMESPACE_URL, str(concept_scheme_uri))
+        self._seed = hashlib.sha1(namespace_uuid.bytes)
+        self._occurrences = occurrences or {}
+        self._stored = False
+
+    def mint(self, paths, unique=False, contents=None):
+        """
+        Génère une URI pour chaque chemin de labels.
+
+        ### Paramètres :
+        - **paths** (list) : Chemins de labels, un tuple de chaînes par concept.
+        - **unique** (bool, optionnel) : Indique que chaque chemin désigne un seul concept
+          (ex. concepts principaux dédoublonnés) : les occurrences ne sont pas comptées.
+        - **contents** (list, optionnel) : Contenu de chaque concept, enregistré dans le manifeste
+          pour détecter les modifications.
+
+        ### Retour :
+        - **list** : URIs (`URIRef`) dans l'ordre de `paths`.
+        """
+        if not self.deterministic and self.manifest is None:
+            return [URIRef(self.NS[str(uuid.uuid4())]) for _ in paths]
+
+        names = [PATH_SEPARATOR.join(path) for path in paths]
+        if not unique:
+            if self._stored:
+                self._occurrences.prefetch(names)
+            names = [self._count(name) for name in names]
+        if self.manifest is None:
+            return self._generate(names)
+        return self.manifest.resolve(names, contents or [''] * len(names), self._generate)
+
+    def mint_one(self, *path, content=''):
+        """
+        Génère l'URI d'un seul concept.
+
+        ### Paramètres :
+        - **path** (str) : Labels du chemin du concept.
+        - **content** (str, optionnel) : Contenu du concept (`stable_uris`).
+
+        ### Retour :
+        - **URIRef** : URI du concept.
+        """
+        return self.mint([path], unique=True, contents=[content])[0]
+
+    def store_occurrences(self, index):
+        """
+        Déplace le décompte des occurrences des chemins de labels dans un index stocké sur disque.
+
+        ### Paramètres :
+        - **index** (ConceptIndex) : Index vide, de valeurs `int` (voir `ConceptStore.index`).
+        """
+        index.update(self._occurrences)
+        self._occurrences = index
+        self._stored = True
+
+    def _generate(self, names):
+        if self.deterministic:
+            values = uuid5_strings(self._seed, names)
+        else:
+            values = [str(uuid.uuid4()) for _ in names]
+        return [URIRef(self.NS[value]) for value in values]
+
+    def _count(self, name):
+        occurrence = self._occurrences.get(name, 0) + 1
+        self._occurrences[name] = occurrence
+        return name if occurrence == 1 else f'{name}{PATH_SEPARATOR}#{occurrence}'
+
+
+def uuid5_strings(seed, names):
+    """
+    Calcule les UUID5 d'une liste de noms, en une passe.
+
+    ### Description :
+    Le résultat est identique à `str(uuid.uuid5(namespace, name))`, mais le hachage du
+    namespace est calculé une seule fois (`seed`) et les bits de version/variante ainsi
+    que la mise en forme hexadécimale sont appliqués sur tout le lot avec NumPy.
+
+    ### Paramètres :
+    - **seed** (hashlib.sha1) : Hachage SHA-1 déjà alimenté avec les octets du namespace.
+    - **names** (list) : Noms à hacher.
+
+    ### Retour :
+    - **list** : UUID5 sous forme de chaînes.
+    """
+    import numpy as np
+
+    if not names:
+        return []
+
+    digests = bytearray()
+    for name in names:
+        digest = seed.copy()
+        digest.update(name.encode('utf-8'))
+        digests += digest.digest()[:16]
+
+    octets = np.frombuffer(bytes(digests), dtype=np.uint8).reshape(-1, 16).copy()
+    octets[:, 6] = (octets[:, 6] & 0x0F) | 0x50
+    octets[:, 8] = (octets[:, 8] & 0x3F) | 0x80
+
+    hexa = octets.tobytes().hex()
+    return [
+        f'{hexa[i:i + 8]}-{hexa[i + 8:i + 12]}-{hexa[i + 12:i + 16]}-{hexa[i + 16:i + 20]}-{hexa[i + 20:i + 32]}'
+        for i in range(0, len(hexa), 32)
+    ]
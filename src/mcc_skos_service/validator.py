@@ -0,0 +1,283 @@
+import time
+from array import array
+from pathlib import Path
+from rdflib.namespace import RDF, SKOS
+from mcc_skos_service.skos_reader import iter_triples
+
+# Vérifications dont l'échec rend le fichier invalide
+ERROR_CHECKS = ('missing_in_scheme', 'dangling_narrower', 'narrower_cycles', 'top_concepts_not_linked')
+
+# Vérifications signalées sans rendre le fichier invalide
+WARNING_CHECKS = ('duplicate_labels', 'empty_definitions')
+
+# Prédicats lus par le validateur : les termes des autres triplets ne sont pas construits
+VALIDATED_PREDICATES = (RDF.type, SKOS.inScheme, SKOS.narrower, SKOS.prefLabel, SKOS.definition,
+                        SKOS.hasTopConcept, SKOS.topConceptOf)
+TYPE, IN_SCHEME, NARROWER, PREF_LABEL, DEFINITION, HAS_TOP_CONCEPT, TOP_CONCEPT_OF = range(len(VALIDATED_PREDICATES))
+
+# Nombre d'URIs d'exemple conservées par vérification
+VALIDATION_EXAMPLES = 10
+
+
+class ValidationReport:
+    """
+    Classe ValidationReport : Résultat de `validate_skos`.
+
+    ### Description :
+    Pour chaque vérification (voir `ERROR_CHECKS` et `WARNING_CHECKS`), `counts` contient le nombre
+    de concepts concernés et `examples` quelques-unes de leurs URIs. Le débit de la lecture est
+    calculé sur la taille du fichier (compressé, le cas échéant).
+    """
+
+    def __init__(self, path):
+        """
+        Initialisation du rapport.
+
+        ### Paramètres :
+        - **path** (str ou Path) : Fichier validé.
+        """
+        self.path = Path(path)
+        self.bytes_read = self.path.stat().st_size
+        self.triples = 0
+        self.concepts = 0
+        self.seconds = 0.0
+        self.counts = dict.fromkeys(ERROR_CHECKS + WARNING_CHECKS, 0)
+        self.examples = {check: [] for check in ERROR_CHECKS + WARNING_CHECKS}
+
+    @property
+    def is_valid(self):
+        """
+        **bool** : `True` si aucune erreur n'a été trouvée (les avertissements sont ignorés).
+        """
+        return not any(self.counts[check] for check in ERROR_CHECKS)
+
+    @property
+    def triples_per_second(self):
+        return self.triples / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self):
+        return self.bytes_read / 2**20 / self.seconds if self.seconds else 0.0
+
+    def to_dict(self):
+        """
+        Retourne le rapport sous forme de dictionnaire (sérialisable en JSON).
+
+        ### Retour :
+        - **dict** : Fichier, validité, compteurs, exemples et débit.
+        """
+        return {
+            'path': str(self.path),
+            'valid': self.is_valid,
+            'errors': {check: self.counts[check] for check in ERROR_CHECKS},
+            'warnings': {check: self.counts[check] for check in WARNING_CHECKS},
+            'examples': {check: examples for check, examples in self.examples.items() if examples},
+            'concepts': self.concepts,
+            'triples': self.triples,
+            'bytes_read': self.bytes_read,
+            'seconds': round(self.seconds, 3),
+            'triples_per_second': round(self.triples_per_second, 1),
+            'megabytes_per_second': round(self.megabytes_per_second, 2),
+        }
+
+
+def validate_skos(path, examples=VALIDATION_EXAMPLES):
+    """
+    Vérifie l'intégrité d'un fichier SKOS généré, en une seule lecture en continu.
+
+    ### Description :
+    Le fichier n'est pas chargé dans un graphe rdflib : chaque URI et chaque label lus sont réduits
+    à une empreinte de 64 bits, conservée dans des tableaux d'entiers (`array`), puis les
+    vérifications sont faites par tri et jointure avec numpy. La mémoire utilisée dépend donc du
+    nombre de concepts (quelques dizaines d'octets chacun), pas de la taille du fichier ni de celle
+    des URIs et des labels. Deux URIs distinctes de même empreinte sont confondues : la probabilité
+    en est négligeable (de l'ordre de 10⁻⁶ pour 10 millions de concepts).
+
+    Erreurs :
+    - `missing_in_scheme` : concepts (`skos:Concept`) sans `skos:inScheme`.
+    - `dangling_narrower` : cibles de `skos:narrower` qui ne sont pas des concepts du fichier.
+    - `narrower_cycles` : concepts d'un cycle de `skos:narrower` (ou situés entre deux cycles).
+    - `top_concepts_not_linked` : concepts sans parent (ou déclarés `skos:topConceptOf`) qui ne
+      sont pas reliés au schéma par `skos:hasTopConcept`.
+
+    Avertissements :
+    - `duplicate_labels` : concepts qui ont le même `skos:prefLabel` (et la même langue) qu'un autre
+      concept du même parent.
+    - `empty_definitions` : concepts dont un `skos:definition` est vide, comme ceux que `create_concept`
+      écrit pour une définition absente du CSV.
+
+    Les URIs d'exemple des erreurs détectées à la fin de la lecture ne sont connues que par leur
+    empreinte : si des problèmes sont trouvés, une seconde lecture retrouve les URIs correspondantes.
+    Avec `examples=0`, le fichier n'est lu qu'une fois.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Fichier SKOS (RDF/XML, N-Triples ou N-Quads, éventuellement compressé).
+    - **examples** (int, optionnel) : Nombre maximal d'URIs d'exemple par vérification.
+
+    ### Retour :
+    - **ValidationReport** : Résultat des vérifications et débit de la lecture.
+
+    ### Exceptions :
+    - `FileNotFoundError` : Si le fichier n'existe pas.
+    - `ValueError` : Si le format du fichier n'est pas reconnu ou s'il est mal formé.
+    """
+    import numpy as np
+
+    report = ValidationReport(path)
+    start = time.perf_counter()
+    term_hash = str.__hash__
+    skos_concept = SKOS.Concept
+    # Empreintes des sujets (et objets) de chaque prédicat lu
+    concepts = array('q')
+    in_scheme = array('q')
+    narrower = (array('q'), array('q'))
+    top_links = (array('q'), array('q'))
+    declared_tops = array('q')
+    labels = (array('q'), array('q'))
+    empty_definitions = report.examples['empty_definitions']
+
+    # Rang de chaque prédicat de `VALIDATED_PREDICATES`, par empreinte (plus rapide que `URIRef.__eq__`)
+    kinds = {term_hash(predicate): kind for kind, predicate in enumerate(VALIDATED_PREDICATES)}
+    for subject, predicate, obj in iter_triples(path, set(VALIDATED_PREDICATES)):
+        report.triples += 1
+        kind = kinds[term_hash(predicate)]
+        if kind == TYPE:
+            if obj == skos_concept:
+                concepts.append(term_hash(subject))
+        elif kind == IN_SCHEME:
+            in_scheme.append(term_hash(subject))
+        elif kind == NARROWER:
+            narrower[0].append(term_hash(subject))
+            narrower[1].append(term_hash(obj))
+        elif kind == PREF_LABEL:
+            labels[0].append(term_hash(subject))
+            labels[1].append(hash((obj.language, term_hash(obj))))
+        elif kind == DEFINITION:
+            if not obj.strip():
+                report.counts['empty_definitions'] += 1
+                if len(empty_definitions) < examples:
+                    empty_definitions.append(str(subject))
+        elif kind == HAS_TOP_CONCEPT:
+            top_links[0].append(term_hash(subject))
+            top_links[1].append(term_hash(obj))
+        elif kind == TOP_CONCEPT_OF:
+            declared_tops.append(term_hash(subject))
+
+    def values(column):
+        return np.frombuffer(column, dtype=np.int64) if len(column) else np.zeros(0, dtype=np.int64)
+
+    concepts = np.unique(values(concepts))
+    parents, children = values(narrower[0]), values(narrower[1])
+    schemes, tops = values(top_links[0]), values(top_links[1])
+    report.concepts = len(concepts)
+    found = {
+        'missing_in_scheme': np.setdiff1d(concepts, values(in_scheme)),
+        'dangling_narrower': np.setdiff1d(children, concepts),
+        'narrower_cycles': cycle_members(parents, children),
+        'top_concepts_not_linked': np.setdiff1d(
+            np.union1d(np.setdiff1d(concepts, children), np.intersect1d(values(declared_tops), concepts)), tops),
+        'duplicate_labels': duplicate_label_members(np.concatenate([parents, schemes]),
+                                                    np.concatenate([children, tops]),
+                                                    values(labels[0]), values(labels[1])),
+    }
+    for check, members in found.items():
+        report.counts[check] = len(members)
+    report.seconds = time.perf_counter() - start
+
+    wanted = {}
+    for check, members in found.items():
+        for value in members[:examples].tolist():
+            wanted.setdefault(value, []).append(check)
+    if wanted:
+        for checks, uri in resolve_hashes(path, wanted):
+            for check in checks:
+                report.examples[check].append(uri)
+    return report
+
+
+def cycle_members(parents, children):
+    """
+    Retourne les nœuds des cycles d'un graphe orienté donné par ses arcs.
+
+    ### Description :
+    Les nœuds sans arc entrant ou sans arc sortant ne peuvent pas appartenir à un cycle : ils sont
+    retirés avec leurs arcs, par vagues, jusqu'à ce qu'il n'en reste plus. Le nombre de vagues est
+    de l'ordre de la profondeur de la hiérarchie.
+
+    ### Paramètres :
+    - **parents** (numpy.ndarray) : Origine de chaque arc.
+    - **children** (numpy.ndarray) : Cible de chaque arc.
+
+    ### Retour :
+    - **numpy.ndarray** : Nœuds restants, triés : ceux des cycles et ceux qui relient deux cycles.
+    """
+    import numpy as np
+
+    nodes, inverse = np.unique(np.concatenate([parents, children]), return_inverse=True)
+    sources, targets = inverse[:len(parents)], inverse[len(parents):]
+    alive = np.ones(len(sources), dtype=bool)
+    while alive.any():
+        removable = ((np.bincount(targets[alive], minlength=len(nodes)) == 0)
+                     | (np.bincount(sources[alive], minlength=len(nodes)) == 0))
+        remaining = alive & ~removable[sources] & ~removable[targets]
+        if remaining.sum() == alive.sum():
+            break
+        alive = remaining
+    return nodes[np.unique(np.concatenate([sources[alive], targets[alive]]))]
+
+
+def duplicate_label_members(parents, children, label_subjects, label_hashes):
+    """
+    Retourne les enfants qui ont le même label qu'un autre enfant du même parent.
+
+    ### Paramètres :
+    - **parents** (numpy.ndarray) : Parent de chaque lien.
+    - **children** (numpy.ndarray) : Enfant de chaque lien.
+    - **label_subjects** (numpy.ndarray) : Concept de chaque label.
+    - **label_hashes** (numpy.ndarray) : Empreinte de chaque label (texte et langue).
+
+    ### Retour :
+    - **numpy.ndarray** : Enfants concernés, triés.
+    """
+    import numpy as np
+
+    # Joindre chaque lien aux labels de son enfant (un concept peut avoir plusieurs labels)
+    order = np.argsort(label_subjects, kind='stable')
+    label_subjects, label_hashes = label_subjects[order], label_hashes[order]
+    first = np.searchsorted(label_subjects, children, 'left')
+    counts = np.searchsorted(label_subjects, children, 'right') - first
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(total)
+    rows = np.empty(total, dtype=[('parent', np.int64), ('label', np.int64), ('child', np.int64)])
+    rows['parent'] = np.repeat(parents, counts)
+    rows['label'] = label_hashes[offsets]
+    rows['child'] = np.repeat(children, counts)
+
+    # Regrouper par (parent, label) les couples distincts
+    rows = np.unique(rows)
+    _, inverse, group_sizes = np.unique(rows[['parent', 'label']], return_inverse=True, return_counts=True)
+    return np.unique(rows['child'][group_sizes[inverse.ravel()] > 1])
+
+
+def resolve_hashes(path, wanted):
+    """
+    Retrouve les URIs correspondant à des empreintes, par une nouvelle lecture du fichier.
+
+    ### Paramètres :
+    - **path** (str ou Path) : Fichier SKOS.
+    - **wanted** (dict) : Vérifications concernées, par empreinte recherchée.
+
+    ### Retour :
+    - **Iterator[tuple]** : Couples `(vérifications, URI)`, au plus un par empreinte.
+    """
+    term_hash = str.__hash__
+    wanted = dict(wanted)
+    for subject, _, obj in iter_triples(path, {RDF.type, SKOS.narrower}):
+        for term in (subject, obj):
+            checks = wanted.pop(term_hash(term), None)
+            if checks is not None:
+                yield checks, str(term)
+        if not wanted:
+            return
@@ -0,0 +1,16 @@
+import argparse
+from mcc_skos_service.remove_duplicate import remove_duplicate_uuid_file
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dédoublonne les UUID d'un fichier (séparés par des virgules ou des blancs).")
+    parser.add_argument("input", help="Fichier des identifiants.")
+    parser.add_argument("--output", default="unique_uuids.txt", help="Fichier des identifiants uniques.")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : le nombre de CPU).")
+    parser.add_argument("--partitions", type=int, default=None, help="Nombre de partitions (par défaut : 4 par processus).")
+    parser.add_argument("--no-order", action="store_true", help="N'écrit pas les identifiants dans l'ordre de leur première occurrence.")
+    parser.add_argument("--separator", default=",", help="Séparateur des identifiants écrits.")
+    args = parser.parse_args()
+
+    count = remove_duplicate_uuid_file(args.input, args.output, workers=args.workers, partitions=args.partitions,
+                                       keep_order=not args.no_order, separator=args.separator)
+    print(f"{count} identifiants uniques écrits dans {args.output}")
@@ -0,0 +1,14 @@
+import argparse
+from mcc_skos_service.service import serve
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Démarre le service local de génération SKOS (API HTTP JSON).")
+    parser.add_argument("--host", default=None, help="Adresse d'écoute (par défaut : SERVICE_HOST ou 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=None, help="Port d'écoute (par défaut : SERVICE_PORT ou 8750).")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus de génération (par défaut : SERVICE_WORKERS ou le nombre de CPU).")
+    parser.add_argument("--queue-size", type=int, default=None, help="Nombre maximal de tâches en attente (par défaut : SERVICE_QUEUE_SIZE ou 100).")
+    parser.add_argument("--job-timeout", type=float, default=None, help="Durée maximale d'une tâche, en secondes (par défaut : SERVICE_JOB_TIMEOUT, sans limite).")
+    args = parser.parse_args()
+
+    serve(host=args.host, port=args.port, workers=args.workers, queue_size=args.queue_size,
+          job_timeout=args.job_timeout)
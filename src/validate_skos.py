@@ -0,0 +1,22 @@
+import argparse
+import json
+import sys
+from mcc_skos_service.validator import ERROR_CHECKS, VALIDATION_EXAMPLES, validate_skos
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vérifie l'intégrité d'un fichier SKOS généré, sans le charger dans rdflib.")
+    parser.add_argument("input", help="Fichier SKOS (RDF/XML, N-Triples ou N-Quads, éventuellement compressé).")
+    parser.add_argument("--examples", type=int, default=VALIDATION_EXAMPLES, help="Nombre d'URIs d'exemple par vérification (0 : une seule lecture du fichier).")
+    parser.add_argument("--strict", action="store_true", help="Considère aussi les avertissements comme des erreurs.")
+    parser.add_argument("--output", default=None, help="Fichier JSON où écrire le rapport (par défaut : la sortie standard).")
+    args = parser.parse_args()
+
+    report = validate_skos(args.input, examples=args.examples)
+    result = json.dumps(report.to_dict(), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(result)
+    else:
+        print(result)
+    checks = report.counts if args.strict else {check: report.counts[check] for check in ERROR_CHECKS}
+    sys.exit(1 if any(checks.values()) else 0)
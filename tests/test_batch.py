@@ -0,0 +1,58 @@
+import json
+import os
+import unittest
+import pandas as pd
+from mcc_skos_service.batch import make_skos_batch
+
+class TestMakeSkosBatch(unittest.TestCase):
+    """
+    Classe de test pour la fonction make_skos_batch, qui génère plusieurs schémas SKOS en parallèle.
+    """
+
+    def setUp(self):
+        """Prépare un fichier CSV valide et un manifeste de deux schémas, dont un invalide."""
+        self.csv_path = "test_data_batch.csv"
+        self.report_path = "test_batch_report.json"
+        self.outputs = []
+        pd.DataFrame({"label": ["Concept 1", "Concept 2"]}).to_csv(self.csv_path, index=False)
+        self.schemes = [
+            {
+                "name": "valide",
+                "csv_path": self.csv_path,
+                "namespace": "http://example.org/test#",
+                "scheme_name": "Schéma de Test",
+                "scheme_definition": "Définition du schéma de test",
+                "concept_main_name": "Concept Principal",
+                "skos_prefLabel_columns": "label",
+                "output_file_name": "fichier_skos_batch",
+            },
+            {
+                "name": "csv absent",
+                "csv_path": "absent.csv",
+                "namespace": "http://example.org/test#",
+                "scheme_name": "Schéma de Test",
+                "scheme_definition": "Définition du schéma de test",
+                "concept_main_name": "Concept Principal",
+                "output_file_name": "fichier_skos_batch_absent",
+            },
+        ]
+
+    def tearDown(self):
+        """Supprime les fichiers temporaires créés pendant les tests."""
+        for path in [self.csv_path, self.report_path] + self.outputs:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_failure_does_not_abort_batch(self):
+        """Vérifie qu'un schéma en erreur n'empêche pas la génération des autres."""
+        results = make_skos_batch(self.schemes, workers=2, report_path=self.report_path)
+        self.outputs = [result["output"] for result in results if result["output"]]
+
+        self.assertEqual([result["status"] for result in results], ["ok", "error"])
+        self.assertTrue(os.path.exists(results[0]["output"]))
+        self.assertIn("FileNotFoundError", results[1]["error"])
+        with open(self.report_path, encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 2)
+
+if __name__ == "__main__":
+    unittest.main()
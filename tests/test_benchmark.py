@@ -0,0 +1,52 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import pandas as pd
+from mcc_skos_service.benchmark import generate_synthetic_csv, run_benchmarks
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_generate_synthetic_csv(self):
+        csv_path = generate_synthetic_csv(self.path / "synthetic.csv", 1000, main_concepts=5,
+                                          narrower_concepts=20, nan_density=0.5)
+        df = pd.read_csv(csv_path)
+        self.assertEqual(len(df), 1000)
+        self.assertLessEqual(df['main'].nunique(), 5)
+        self.assertLessEqual(df['narrow'].nunique(), 20)
+        self.assertFalse(df['main'].isna().any())
+        self.assertTrue(0.3 < df['note'].isna().mean() < 0.7)
+
+    def test_run_benchmarks(self):
+        results_path = self.path / "results.json"
+        run_benchmarks(sizes=[200], output_backends=['stream'], workdir=self.path / "data",
+                       results_path=results_path)
+
+        with open(results_path, encoding='utf-8') as file:
+            results = json.load(file)
+        self.assertEqual([case['mode'] for case in results['cases']], ['flat', 'nested'])
+        for case in results['cases']:
+            self.assertEqual(set(case['phases']), {'load_params', 'read', 'clean', 'build', 'serialize'})
+            self.assertEqual(case['counters']['rows_read'], 200)
+            self.assertGreater(case['peak_rss_mb'], 0)
+            self.assertGreater(case['output_bytes'], 0)
+        self.assertEqual(list((self.path / "data").glob("*.xml")), [])
+
+    def test_run_benchmarks_trace_memory(self):
+        results = run_benchmarks(sizes=[200], modes=['nested'], workdir=self.path / "data",
+                                 results_path=self.path / "results.json", trace_memory=True)
+        case, = results['cases']
+        self.assertGreater(case['traced_peak_mb'], 0)
+        self.assertGreater(case['allocated_blocks'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
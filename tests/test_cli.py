@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+import pandas as pd
+from mcc_skos_service.cli import main
+
+
+class TestCli(unittest.TestCase):
+    """
+    Classe de test pour la commande make-skos et son démarrage rapide.
+    """
+
+    def setUp(self):
+        """Prépare un fichier CSV temporaire."""
+        self.csv_path = "test_data_cli.csv"
+        self.output = "/fichier_skos_cli.xml"
+        pd.DataFrame({"label": ["Concept 1", "Concept 2"]}).to_csv(self.csv_path, index=False)
+        self.args = ["--csv-path", self.csv_path, "--namespace", "http://example.org/test#",
+                     "--scheme-name", "Schéma de Test", "--scheme-definition", "Définition du schéma de test",
+                     "--concept-main-name", "Concept Principal", "--skos-prefLabel-columns", "label",
+                     "--output-file-name", "fichier_skos_cli"]
+
+    def tearDown(self):
+        """Supprime les fichiers temporaires créés pendant les tests."""
+        for path in (self.csv_path, self.output):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def run_python(self, code):
+        """Exécute du code dans un nouvel interpréteur et retourne sa durée et sa sortie."""
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        return time.perf_counter() - start, result.stdout.strip()
+
+    def test_help_and_check_do_not_import_pandas(self):
+        """Vérifie que l'aide et la validation des paramètres n'importent ni pandas, ni numpy, ni rdflib."""
+        for argv in (["--help"], ["--check"] + self.args):
+            _, loaded = self.run_python(
+                "import sys\n"
+                "from mcc_skos_service.cli import main\n"
+                "try:\n"
+                f"    main({argv!r})\n"
+                "except SystemExit:\n"
+                "    pass\n"
+                "print('modules :', *(m for m in ('pandas', 'numpy', 'rdflib') if m in sys.modules))\n")
+            self.assertEqual(loaded.splitlines()[-1], "modules :", argv)
+
+    def test_cold_start_is_faster_than_heavy_imports(self):
+        """Mesure le démarrage à froid de la validation : il doit être plus court que l'import de pandas et rdflib."""
+        check = f"from mcc_skos_service.cli import main; main({['--check'] + self.args!r})"
+        cli_time = min(self.run_python(check)[0] for _ in range(3))
+        imports_time = min(self.run_python("import pandas, rdflib")[0] for _ in range(3))
+        self.assertLess(cli_time, imports_time)
+
+    def test_generate(self):
+        """Vérifie la génération du fichier et le code de sortie d'un paramètre invalide."""
+        self.assertEqual(main(self.args), 0)
+        self.assertTrue(os.path.exists(self.output))
+        self.assertEqual(main(self.args + ["--uri-mode", "inconnu"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
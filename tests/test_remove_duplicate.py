@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from mcc_skos_service.remove_duplicate import remove_duplicate_uuid_file, remove_duplicate_uuids
+
+
+class TestRemoveDuplicateUuidFile(unittest.TestCase):
+    """
+    Classe de test pour le dédoublonnage des UUID d'un fichier.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        ids = [str(uuid.UUID(int=i * 7919)) for i in range(300)]
+        # Doublons (y compris en majuscules ou sans tirets), identifiants invalides et séparateurs variés
+        self.tokens = (ids + ids[::3] + [ids[5].upper(), ids[8].replace("-", ""), "pas-un-uuid", "é"]
+                       + ids[100:150])
+        text = ""
+        for index, token in enumerate(self.tokens):
+            text += token + (",", "\n", " ,\r\n", ",,")[index % 4]
+        self.input_path = self.path / "ids.txt"
+        self.input_path.write_text(text, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def expected(self):
+        """Résultat de remove_duplicate_uuids sur les mêmes identifiants."""
+        expected_path = self.path / "expected.txt"
+        remove_duplicate_uuids(self.tokens, expected_path)
+        return expected_path.read_text().split(",")
+
+    def test_same_result_as_remove_duplicate_uuids(self):
+        """Vérifie que le résultat est le même, quel que soit le découpage en plages et en partitions."""
+        expected = self.expected()
+        for workers, partitions in ((1, 1), (1, 5), (3, 2), (7, None)):
+            output_path = self.path / f"unique-{workers}-{partitions}.txt"
+            count = remove_duplicate_uuid_file(self.input_path, output_path, workers=workers, partitions=partitions)
+            self.assertEqual(output_path.read_text().split(","), expected, (workers, partitions))
+            self.assertEqual(count, len(expected))
+        # Ni fichier intermédiaire, ni fichier temporaire
+        self.assertFalse(any(path.is_dir() or path.suffix == ".part" for path in self.path.iterdir()))
+
+    def test_without_order(self):
+        """Vérifie que sans `keep_order`, les mêmes identifiants sont écrits, avec le séparateur demandé."""
+        output_path = self.path / "unique.txt"
+        remove_duplicate_uuid_file(self.input_path, output_path, workers=2, keep_order=False, separator="\n")
+        self.assertEqual(sorted(output_path.read_text().split("\n")), sorted(self.expected()))
+
+    def test_empty_file(self):
+        """Vérifie qu'un fichier vide produit un fichier vide."""
+        self.input_path.write_bytes(b"")
+        output_path = self.path / "unique.txt"
+        self.assertEqual(remove_duplicate_uuid_file(self.input_path, output_path, workers=2), 0)
+        self.assertEqual(output_path.read_bytes(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
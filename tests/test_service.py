@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import unittest
+import urllib.error
+import urllib.request
+import pandas as pd
+from mcc_skos_service.service import GenerationService, create_server, pin_output
+
+
+class TestGenerationService(unittest.TestCase):
+    """
+    Classe de test pour le service de génération : API HTTP, file d'attente et durée maximale des tâches.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Démarre un service d'un processus, avec une file de deux tâches, sur un port libre."""
+        cls.service = GenerationService(workers=1, queue_size=2)
+        cls.service.start()
+        cls.server = create_server(cls.service, port=0)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.shutdown()
+
+    def setUp(self):
+        """Prépare un fichier CSV et la configuration d'une tâche."""
+        self.csv_path = "test_data_service.csv"
+        self.outputs = []
+        pd.DataFrame({"label": ["Concept 1", "Concept 2"]}).to_csv(self.csv_path, index=False)
+        self.config = {
+            "name": "service",
+            "csv_path": os.path.abspath(self.csv_path),
+            "namespace": "http://example.org/test#",
+            "scheme_name": "Schéma de Test",
+            "scheme_definition": "Définition du schéma de test",
+            "concept_main_name": "Concept Principal",
+            "skos_prefLabel_columns": "label",
+            "output_file_name": "fichier_skos_service",
+        }
+
+    def tearDown(self):
+        """Supprime les fichiers temporaires créés pendant les tests."""
+        for path in [self.csv_path] + self.outputs:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def request(self, path, body=None):
+        """Envoie une requête au service et retourne le code HTTP et le corps JSON de la réponse."""
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        try:
+            with urllib.request.urlopen(urllib.request.Request(self.url + path, data=data), timeout=60) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as error:
+            return error.code, json.load(error)
+
+    def test_job_is_generated(self):
+        """Vérifie qu'une tâche est exécutée et que son état peut être consulté."""
+        status, job = self.request("/jobs?wait=60", self.config)
+        self.outputs.append(job["output"])
+        self.assertEqual(status, 200)
+        self.assertEqual((job["name"], job["status"]), ("service", "ok"))
+        self.assertTrue(os.path.exists(job["output"]))
+        self.assertEqual(self.request(f"/jobs/{job['id']}")[1], job)
+        self.assertEqual(self.request("/jobs/inconnue")[0], 404)
+        self.assertEqual(self.request("/health")[1]["workers"], 1)
+
+    def test_job_error(self):
+        """Vérifie qu'une tâche invalide est en erreur et qu'un corps ou une attente invalides sont refusés."""
+        status, job = self.request("/jobs?wait=60", dict(self.config, csv_path="absent.csv"))
+        self.assertEqual(job["status"], "error")
+        self.assertIn("FileNotFoundError", job["error"])
+        self.assertEqual(self.request("/jobs", [1, 2])[0], 400)
+        for wait in ("abc", "-1", "nan"):
+            status, body = self.request(f"/jobs?wait={wait}", self.config)
+            self.assertEqual(status, 400)
+            self.assertIn("'wait' invalide", body["error"])
+            self.assertEqual(self.request(f"/jobs/{job['id']}?wait={wait}")[0], 400)
+
+    def test_queue_full_and_timeout(self):
+        """Vérifie que la file est bornée et qu'une tâche trop longue est interrompue, sans laisser de fichier
+        temporaire ni bloquer les suivantes."""
+        _, part_path = pin_output(self.config)
+        part_path.write_text("", encoding="utf-8")
+        self.outputs.append(str(part_path))
+        self.service.job_timeout = 1e-3
+        try:
+            jobs = [self.request("/jobs", self.config) for _ in range(4)]
+            self.assertIn(503, [status for status, _ in jobs])
+            accepted = [job for status, job in jobs if status == 202]
+            results = [self.service.get(job["id"], wait=60) for job in accepted]
+            self.assertEqual({job["status"] for job in results}, {"timeout"})
+            self.assertFalse(part_path.exists())
+        finally:
+            self.service.job_timeout = None
+        status, job = self.request("/jobs?wait=60", self.config)
+        self.outputs.append(job["output"])
+        self.assertEqual(job["status"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
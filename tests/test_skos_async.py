@@ -0,0 +1,111 @@
+import asyncio
+import os
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+import pandas as pd
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from mcc_skos_service.skos_async import make_skos_async, make_skos_events, CancellableInstrumentation, GenerationCancelled
+from mcc_skos_service.skos_service import make_skos
+
+
+class TestMakeSkosAsync(unittest.IsolatedAsyncioTestCase):
+    """
+    Classe de test pour les variantes asynchrones de make_skos.
+    """
+
+    def setUp(self):
+        """Prépare un fichier CSV temporaire."""
+        self.csv_path = "test_data_async.csv"
+        self.outputs = []
+        pd.DataFrame({
+            "main": [f"Catégorie {i % 5}" for i in range(500)],
+            "label": [f"Item {i}" for i in range(500)],
+        }).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        """Supprime les fichiers temporaires créés pendant les tests."""
+        for path in [self.csv_path] + self.outputs:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def params(self, name, **kwargs):
+        """Retourne les paramètres de make_skos d'un schéma imbriqué."""
+        self.outputs.append(Path("/workspaces", "/", f"{name}.xml"))
+        return dict(csv_path=self.csv_path,
+                    imbrique=True,
+                    uri_mode="deterministic",
+                    namespace="http://example.org/test#",
+                    scheme_id="test_scheme",
+                    scheme_name="Schéma de Test",
+                    scheme_definition="Définition du schéma de test",
+                    skos_main_concept_preflabel_columns=["main"],
+                    skos_prefLabel_columns=["label"],
+                    output_file_name=name,
+                    **kwargs)
+
+    async def test_concurrent_generations(self):
+        """Vérifie que plusieurs schémas sont générés en même temps, comme avec make_skos."""
+        expected = Graph().parse(make_skos(**self.params("fichier_skos_sync")))
+        events = []
+        outputs = await asyncio.gather(*(
+            make_skos_async(progress=events.append, **self.params(f"fichier_skos_async_{i}", csv_chunk_size=50))
+            for i in range(3)
+        ))
+        for output in outputs:
+            self.assertTrue(isomorphic(expected, Graph().parse(output)))
+        self.assertEqual([event["status"] for event in events if event["event"] == "summary"], ["ok"] * 3)
+
+    async def test_events(self):
+        """Vérifie que les événements de progression sont retournés, puis le bilan et les erreurs."""
+        events = [event async for event in make_skos_events(
+            **self.params("fichier_skos_events", csv_chunk_size=50, instrumentation_interval=1e-9))]
+        self.assertIn("progress", [event["event"] for event in events])
+        self.assertEqual(events[-1]["event"], "summary")
+        self.assertTrue(os.path.exists(events[-1]["output"]))
+
+        with self.assertRaises(KeyError):
+            async for _ in make_skos_events(**self.params("fichier_skos_erreur", skos_notes_columns=["absente"])):
+                pass
+
+    async def test_cancellation(self):
+        """Vérifie qu'une génération annulée s'arrête et ne laisse pas de fichier."""
+        started = asyncio.Event()
+        task = asyncio.ensure_future(make_skos_async(
+            progress=lambda event: started.set(),
+            **self.params("fichier_skos_annule", csv_chunk_size=1, output_backend="stream",
+                          instrumentation_interval=1e-9)))
+        await started.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertFalse(self.outputs[-1].exists())
+        self.assertFalse(Path(f"{self.outputs[-1]}.part").exists())
+
+    def test_cancellation_during_serialize(self):
+        """Vérifie qu'une annulation pendant la sérialisation, sans blocs ni écriture en continu, ne laisse pas de fichier."""
+        cancelled = threading.Event()
+        serialize = Graph.serialize
+
+        def cancel_and_serialize(graph, *args, **kwargs):
+            cancelled.set()
+            return serialize(graph, *args, **kwargs)
+
+        with mock.patch.object(Graph, "serialize", cancel_and_serialize):
+            with self.assertRaises(GenerationCancelled):
+                make_skos(instrumentation=CancellableInstrumentation(cancelled), **self.params("fichier_skos_annule"))
+        self.assertFalse(self.outputs[-1].exists())
+        self.assertFalse(Path(f"{self.outputs[-1]}.part").exists())
+
+        # Une annulation reçue une fois le fichier écrit n'a plus d'effet
+        cancelled = threading.Event()
+        instrumentation = CancellableInstrumentation(cancelled)
+        instrumentation.checkpoint(final=True)
+        cancelled.set()
+        instrumentation.count("bytes_written")
+
+
+if __name__ == "__main__":
+    unittest.main()
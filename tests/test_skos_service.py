@@ -3,8 +3,29 @@ import unittest
 import os
 import pandas as pd
 import uuid
-from rdflib import Graph, SKOS
-from mcc_skos_service.skos_service import make_skos
+import itertools
+import hashlib
+import gzip
+import json
+import importlib.util
+import tempfile
+import types
+import pstats
+import tracemalloc
+from unittest import mock
+from rdflib import Graph, Dataset, Literal, Namespace, URIRef, SKOS
+from rdflib.compare import isomorphic
+from rdflib.util import guess_format
+from mcc_skos_service.skos_service import make_skos, clear_data, clear_columns, create_concept, get_literal
+from mcc_skos_service.uri_minter import UriMinter, uuid5_strings
+from mcc_skos_service.triple_buffer import TripleBuffer
+from mcc_skos_service.skos_writer import SkosStreamWriter
+from mcc_skos_service.parallel import ShardPool
+from mcc_skos_service.concept_index import ConceptStore
+from mcc_skos_service.csv_cache import CsvCache
+from mcc_skos_service.params import load_params
+from mcc_skos_service.label_matching import cluster_labels
+from mcc_skos_service.cli import CLI_PARAMETERS
 
 class TestMakeSkos(unittest.TestCase):
     """
@@ -265,5 +286,733 @@ class TestMakeSkos(unittest.TestCase):
         )
         self.assertTrue(os.path.exists(self.full_output_file))
 
+    def test_default_output_file_name(self):
+        """Vérifie que, sans 'output_file_name', le fichier reçoit un UUID pour nom."""
+        params = dict.fromkeys(CLI_PARAMETERS, None)
+        params.update(csv_path=self.csv_path, concept_main_name="Concept Principal")
+        params = load_params(types.SimpleNamespace(), params)
+        self.assertEqual(str(uuid.UUID(params['output_file_name'])), params['output_file_name'])
+
+class TestGenerationModes(unittest.TestCase):
+    """
+    Classe de test pour les modes de génération (écriture en continu, lecture par blocs) :
+    ils doivent produire le même graphe RDF que le mode par défaut.
+    """
+
+    def setUp(self):
+        """Prépare un fichier CSV temporaire avec des valeurs manquantes et des caractères spéciaux."""
+        self.csv_path = "test_data_stream.csv"
+        self.outputs = []
+        pd.DataFrame({
+            "main": ["Céramique", "Céramique", "Verre & <métal>"],
+            "narrow": ["Vase", None, "Bol"],
+            "label": ["Item 1", "Item 2", "Item \"3\""],
+            "definition": ["Définition 1", None, "Définition 3"],
+            "note": [None, "Note 2", "Note 3"],
+        }).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        """Supprime les fichiers temporaires créés pendant les tests."""
+        for path in [self.csv_path] + self.outputs:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def generate(self, output_backend="graph", uuid_start=0, **kwargs):
+        """Génère un fichier SKOS avec des UUID déterministes pour pouvoir comparer les graphes."""
+        uuids = (uuid.UUID(int=i) for i in itertools.count(uuid_start))
+        with mock.patch("mcc_skos_service.skos_service.uuid.uuid4", side_effect=lambda: next(uuids)):
+            params = dict(
+                csv_path=self.csv_path,
+                csv_separateur=',',
+                skos_prefLabel_columns=["label"],
+                skos_definition_columns=["definition"],
+                skos_notes_columns=["note"],
+                namespace="http://example.org/test#",
+                scheme_id="test_scheme",
+                scheme_name="Schéma de Test",
+                scheme_definition="Définition du schéma de test",
+                output_file_name=f"fichier_skos_{len(self.outputs)}",
+                output_backend=output_backend,
+            )
+            params.update(kwargs)
+            path = make_skos(**params)
+        self.outputs.append(path)
+        data = gzip.decompress(path.read_bytes()) if path.suffix == ".gz" else path.read_bytes()
+        rdf_path = path.with_suffix("") if path.suffix == ".gz" else path
+        g = Graph()
+        if rdf_path.suffix == ".nq":
+            dataset = Dataset()
+            dataset.parse(data=data, format="nquads")
+            for subject, predicate, obj, _ in dataset.quads():
+                g.add((subject, predicate, obj))
+        else:
+            g.parse(data=data, format=guess_format(str(rdf_path)))
+        return g
+
+    def test_flat_stream_is_isomorphic(self):
+        """Vérifie que le mode plat produit le même graphe avec les deux backends."""
+        kwargs = dict(imbrique=False,
+                      concept_main_name="Concept Principal",
+                      concept_main_definition="Définition du concept principal",
+                      concept_narrower_name="Sous-concept")
+        self.assertTrue(isomorphic(self.generate("graph", **kwargs), self.generate("stream", **kwargs)))
+
+    def test_narrowed_stream_is_isomorphic(self):
+        """Vérifie que le mode imbriqué produit le même graphe avec les deux backends."""
+        kwargs = dict(imbrique=True,
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        self.assertTrue(isomorphic(self.generate("graph", **kwargs), self.generate("stream", **kwargs)))
+
+    def test_chunked_narrowed_is_isomorphic(self):
+        """Vérifie que la lecture par blocs conserve les concepts principaux d'un bloc à l'autre."""
+        kwargs = dict(imbrique=True,
+                      uri_mode="deterministic",
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        chunked = self.generate(csv_chunk_size=1, **kwargs)
+        self.assertTrue(isomorphic(self.generate(**kwargs), chunked))
+        self.assertEqual(len(list(chunked.triples((None, SKOS.hasTopConcept, None)))), 2)
+
+    def test_narrower_concepts_are_deduplicated(self):
+        """Vérifie que chaque couple (concept principal, concept plus spécifique) est créé une seule fois, y compris entre blocs."""
+        pd.DataFrame({
+            "main": ["Céramique", "Céramique", "Verre", "Céramique", "Verre"],
+            "narrow": ["Vase", "Vase", "Vase", "Vase", None],
+            "label": [f"Item {i}" for i in range(5)],
+            "definition": [None] * 5,
+            "note": [None] * 5,
+        }).to_csv(self.csv_path, index=False)
+        kwargs = dict(imbrique=True,
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        for extra in (dict(), dict(csv_chunk_size=2, uri_mode="deterministic"),
+                      dict(output_backend="stream", output_format="ntriples", csv_chunk_size=2)):
+            events = []
+            g = self.generate(**kwargs, **extra, instrumentation=events.append)
+            narrow = {(str(g.value(main, SKOS.prefLabel)), str(g.value(concept, SKOS.prefLabel))): concept
+                      for main, concept in g.subject_objects(SKOS.narrower)
+                      if (concept, SKOS.narrower, None) in g}
+            self.assertEqual(set(narrow), {("Céramique", "Vase"), ("Verre", "Vase")}, extra)
+            self.assertEqual(len(list(g.objects(narrow["Céramique", "Vase"], SKOS.narrower))), 3)
+            self.assertEqual(len(list(g.subjects(SKOS.prefLabel, Literal("Vase", lang="fr")))), 2)
+            counters = events[-1]["counters"]
+            self.assertEqual(counters["narrower_concepts_deduplicated"], 2)
+            self.assertEqual(counters["triples_emitted"], len(g))
+            if extra.get("output_backend") == "stream":
+                self.assertEqual(len(self.outputs[-1].read_text(encoding="utf-8").splitlines()), len(g))
+
+    def test_chunked_missing_column(self):
+        """Vérifie qu'une KeyError est levée si une colonne référencée est absente du CSV."""
+        with self.assertRaises(KeyError):
+            self.generate(csv_chunk_size=2,
+                          imbrique=False,
+                          concept_main_name="Concept Principal",
+                          skos_notes_columns=["absente"])
+
+    def test_parallel_is_isomorphic(self):
+        """Vérifie que la construction parallèle produit le même graphe que le mode séquentiel."""
+        for kwargs in (dict(imbrique=False, concept_main_name="Concept Principal", concept_narrower_name="Sous-concept"),
+                       dict(imbrique=True,
+                            skos_main_concept_preflabel_columns=["main"],
+                            skos_narrow_concept_preflabel_columns=["narrow"])):
+            kwargs.update(uri_mode="deterministic", csv_chunk_size=1)
+            parallel = self.generate("stream", parallel_workers=2, **kwargs)
+            self.assertTrue(isomorphic(self.generate(**kwargs), parallel))
+
+    def test_parallel_error_stops_pool(self):
+        """Vérifie qu'une erreur pendant la construction parallèle arrête les processus du pool."""
+        for kwargs in (dict(imbrique=False, concept_main_name="Concept Principal"),
+                       dict(imbrique=True, skos_main_concept_preflabel_columns=["main"])):
+            with mock.patch.object(ShardPool, "abort", autospec=True, side_effect=ShardPool.abort) as abort:
+                with self.assertRaises(KeyError):
+                    self.generate("stream", parallel_workers=2, csv_chunk_size=1, output_format="ntriples",
+                                  skos_notes_columns=["absente"], **kwargs)
+            abort.assert_called_once()
+
+    def test_parallel_requires_stream(self):
+        """Vérifie qu'une ValueError est levée si le mode parallèle est demandé sans écriture en continu."""
+        with self.assertRaises(ValueError):
+            self.generate(parallel_workers=2, imbrique=False, concept_main_name="Concept Principal")
+
+    def test_deterministic_uris_are_stable(self):
+        """Vérifie que deux générations en mode déterministe produisent le même graphe, sans UUID4."""
+        kwargs = dict(imbrique=True,
+                      uri_mode="deterministic",
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        first = self.generate(**kwargs)
+        second = self.generate("stream", **kwargs)
+        self.assertEqual(set(first), set(second))
+        self.assertFalse(any("00000000-0000" in str(uri) for uri in first.subjects()))
+
+    def test_deterministic_uris_distinct(self):
+        """Vérifie que chaque concept reçoit une URI distincte, même pour des chemins de labels identiques."""
+        pd.DataFrame({"label": ["Item", "Item", "Autre"]}).to_csv(self.csv_path, index=False)
+        g = self.generate(imbrique=False,
+                          uri_mode="deterministic",
+                          concept_main_name="Concept Principal",
+                          skos_definition_columns=None,
+                          skos_notes_columns=None)
+        self.assertEqual(len(set(g.subjects(SKOS.inScheme, None))), 4)
+
+    def test_output_formats_are_isomorphic(self):
+        """Vérifie que chaque format de sortie produit le même graphe, avec l'extension du format."""
+        kwargs = dict(imbrique=True,
+                      uri_mode="deterministic",
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        expected = self.generate(**kwargs)
+        cases = [("graph", "ntriples", ".nt"), ("graph", "nquads", ".nq"), ("graph", "turtle", ".ttl"),
+                 ("graph", "json-ld", ".jsonld"), ("stream", "ntriples", ".nt"), ("stream", "nquads", ".nq")]
+        for output_backend, output_format, suffix in cases:
+            g = self.generate(output_backend, output_format=output_format, **kwargs)
+            self.assertEqual(self.outputs[-1].suffix, suffix)
+            self.assertTrue(isomorphic(expected, g), (output_backend, output_format))
+
+        parallel = self.generate("stream", output_format="nquads", parallel_workers=2, csv_chunk_size=1, **kwargs)
+        self.assertTrue(isomorphic(expected, parallel))
+        with open(self.outputs[-1], encoding="utf-8") as file:
+            self.assertTrue(all(line.endswith("<http://example.org/test#test_scheme> .\n") for line in file))
+
+    def test_buffer_is_isomorphic(self):
+        """Vérifie que le tampon compact produit le même graphe que rdflib, dans chaque format."""
+        for kwargs in (dict(imbrique=False, concept_main_name="Concept Principal", concept_narrower_name="Sous-concept"),
+                       dict(imbrique=True,
+                            skos_main_concept_preflabel_columns=["main"],
+                            skos_narrow_concept_preflabel_columns=["narrow"])):
+            expected = self.generate(**kwargs)
+            for output_format in ("xml", "ntriples", "nquads", "turtle", "json-ld"):
+                g = self.generate("buffer", output_format=output_format, **kwargs)
+                self.assertTrue(isomorphic(expected, g), output_format)
+            self.assertTrue(isomorphic(expected, self.generate("buffer", output_compression="gzip", **kwargs)))
+
+        # Un seul élément RDF/XML par concept, comme Graph.serialize
+        self.generate("buffer", **kwargs)
+        with open(self.outputs[-1], encoding="utf-8") as file:
+            about = [line for line in file if "rdf:about=" in line]
+        self.assertEqual(len(about), len(set(about)))
+
+    def test_triple_buffer(self):
+        """Vérifie que le tampon ignore les triplets déjà ajoutés et se convertit en graphe rdflib."""
+        buffer = TripleBuffer()
+        buffer.bind("skos", SKOS)
+        concept, parent = URIRef("http://example.org/test#1"), URIRef("http://example.org/test#0")
+        triples = [(concept, SKOS.prefLabel, Literal("Vase", lang="fr")),
+                   (parent, SKOS.narrower, concept),
+                   (concept, SKOS.prefLabel, Literal("Vase", lang="fr")),
+                   (concept, SKOS.note, Literal("Vase"))]
+        for triple in triples:
+            buffer.add(triple)
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(list(buffer), [triples[0], triples[1], triples[3]])
+        g = buffer.to_graph()
+        self.assertEqual(set(g), set(triples))
+        self.assertIn(("skos", URIRef(str(SKOS))), list(g.namespaces()))
+
+    def test_stream_output_format_requires_line_format(self):
+        """Vérifie qu'une ValueError est levée pour un format qui ne peut pas être écrit en continu."""
+        with self.assertRaises(ValueError):
+            self.generate("stream", output_format="turtle", imbrique=False, concept_main_name="Concept Principal")
+
+    def test_compressed_input_and_output(self):
+        """Vérifie la lecture d'un CSV gzip et l'écriture d'un fichier compressé, avec les deux backends."""
+        kwargs = dict(imbrique=True,
+                      uri_mode="deterministic",
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        expected = self.generate(**kwargs)
+
+        with open(self.csv_path, "rb") as file:
+            self.csv_path = f"{self.csv_path}.gz"
+            with gzip.open(self.csv_path, "wb") as compressed:
+                compressed.write(file.read())
+        self.outputs.append(self.csv_path)
+
+        for output_backend, output_format in (("graph", "xml"), ("graph", "turtle"), ("stream", "xml"),
+                                              ("stream", "ntriples")):
+            g = self.generate(output_backend, output_format=output_format, output_compression="gzip",
+                              csv_chunk_size=2, **kwargs)
+            self.assertEqual(self.outputs[-1].suffixes[-1], ".gz")
+            self.assertTrue(isomorphic(expected, g), (output_backend, output_format))
+
+        # La compression est déduite du nom du fichier, sans doubler l'extension
+        g = self.generate("stream", output_format="ntriples", output_file_name="thesaurus.nt.gz", **kwargs)
+        self.assertEqual(self.outputs[-1].name, "thesaurus.nt.gz")
+        self.assertTrue(isomorphic(expected, g))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow n'est pas installé")
+    def test_csv_cache_is_isomorphic(self):
+        """Vérifie que le cache des CSV produit le même graphe, réutilise ses entrées et suit les modifications."""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        kwargs = dict(imbrique=True,
+                      uri_mode="deterministic",
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        for chunk_kwargs in (dict(), dict(csv_chunk_size=2)):
+            expected = self.generate(**kwargs, **chunk_kwargs)
+            self.assertTrue(isomorphic(expected, self.generate(csv_cache_dir=cache_dir.name, **kwargs, **chunk_kwargs)))
+            with mock.patch("mcc_skos_service.csv_cache.pd.read_csv", side_effect=AssertionError):
+                cached = self.generate(csv_cache_dir=cache_dir.name, **kwargs, **chunk_kwargs)
+            self.assertTrue(isomorphic(expected, cached))
+        self.assertEqual(len(list(Path(cache_dir.name).glob("*.arrow"))), 2)
+
+        # Seules les colonnes demandées sont converties, dans leur ordre
+        cache = CsvCache(cache_dir.name)
+        df = cache.read(self.csv_path, columns=["narrow", "main"])
+        self.assertEqual(list(df.columns), ["narrow", "main"])
+        self.assertEqual(list(df["main"]), list(pd.read_csv(self.csv_path)["main"]))
+        with self.assertRaises(KeyError):
+            cache.read(self.csv_path, columns=["absente"])
+
+        # Un CSV modifié crée une nouvelle entrée ; la plus ancienne est supprimée au-delà de la taille maximale
+        pd.DataFrame({"main": ["Autre"], "narrow": ["Vase"], "label": ["Item"],
+                      "definition": [None], "note": [None]}).to_csv(self.csv_path, index=False)
+        g = self.generate(csv_cache_dir=cache_dir.name, csv_cache_max_size=1e-6, **kwargs)
+        self.assertEqual(len(list(g.subjects(SKOS.inScheme, None))), 3)
+        self.assertEqual(len(list(Path(cache_dir.name).glob("*.arrow"))), 1)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow n'est pas installé")
+    def test_csv_cache_keeps_row_types(self):
+        """Vérifie que le cache des CSV produit les mêmes labels qu'une lecture directe pour des colonnes entières et flottantes."""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        pd.DataFrame({"name": ["A", "B"], "code": [1, 2], "value": [0.5, None]}).to_csv(self.csv_path, index=False)
+        kwargs = dict(imbrique=False, concept_main_name="Concept Principal", uri_mode="deterministic",
+                      skos_prefLabel_columns=["code"], skos_definition_columns=["value"], skos_notes_columns=None)
+        expected = self.generate(**kwargs)
+        labels = {str(label) for label in expected.objects(None, SKOS.prefLabel)}
+        self.assertTrue({"1", "2"} <= labels and not {"1.0", "2.0"} & labels)
+        # Création de l'entrée, puis lecture depuis le cache
+        for _ in range(2):
+            self.assertTrue(isomorphic(expected, self.generate(csv_cache_dir=cache_dir.name, **kwargs)))
+
+    def test_csv_readers_are_isomorphic(self):
+        """Vérifie que les lecteurs `csv` et `pyarrow` produisent le même graphe que pandas, y compris compressé."""
+        readers = ["csv"] + (["pyarrow"] if importlib.util.find_spec("pyarrow") else [])
+        pd.DataFrame({"main": ["Céramique", "NA", "Verre"], "narrow": ["Vase", "", "null"],
+                      "label": ["Item 1", "Item, 2", "Item \"3\""], "definition": ["Définition 1", None, "N/A"],
+                      "note": [None, "Note 2", "Note 3"]}).to_csv(self.csv_path, index=False)
+        for kwargs in (dict(imbrique=False, concept_main_name="Concept Principal"),
+                       dict(imbrique=True,
+                            uri_mode="deterministic",
+                            skos_main_concept_preflabel_columns=["main"],
+                            skos_narrow_concept_preflabel_columns=["narrow", "note"])):
+            expected = self.generate(csv_chunk_size=2, **kwargs)
+            for reader in readers:
+                for chunk_kwargs in (dict(), dict(csv_chunk_size=1)):
+                    g = self.generate(csv_reader=reader, **kwargs, **chunk_kwargs)
+                    self.assertTrue(isomorphic(expected, g), (reader, chunk_kwargs))
+
+        with open(self.csv_path, "rb") as file:
+            self.csv_path = f"{self.csv_path}.gz"
+            with gzip.open(self.csv_path, "wb") as compressed:
+                compressed.write(file.read())
+        self.outputs.append(self.csv_path)
+        for reader in readers:
+            self.assertTrue(isomorphic(expected, self.generate(csv_reader=reader, **kwargs)), reader)
+            with self.assertRaises(KeyError):
+                self.generate(csv_reader=reader, skos_notes_columns=["absente"], **kwargs)
+
+        with self.assertRaises(ValueError):
+            self.generate(csv_reader="inconnu", **kwargs)
+
+    def test_instrumentation_reports_phases_and_counters(self):
+        """Vérifie que l'instrumentation rapporte les phases et que les compteurs correspondent au graphe."""
+        for kwargs in (dict(imbrique=False, concept_main_name="Concept Principal", concept_narrower_name="Sous-concept"),
+                       dict(imbrique=True,
+                            skos_main_concept_preflabel_columns=["main"],
+                            skos_narrow_concept_preflabel_columns=["narrow"])):
+            events = []
+            g = self.generate(csv_chunk_size=1, instrumentation=events.append, instrumentation_interval=1e-9, **kwargs)
+
+            summary = events[-1]
+            self.assertEqual(summary["event"], "summary")
+            self.assertEqual(summary["status"], "ok")
+            self.assertIn("progress", [event["event"] for event in events[:-1]])
+            self.assertEqual(set(summary["phases"]), {"load_params", "read", "clean", "build", "serialize"})
+            counters = summary["counters"]
+            self.assertEqual(counters["rows_read"], 3)
+            self.assertEqual(counters["concepts_created"], len(set(g.subjects(SKOS.inScheme, None))))
+            self.assertEqual(counters["triples_emitted"], len(g))
+            self.assertEqual(counters["bytes_written"], os.path.getsize(self.outputs[-1]))
+        self.assertEqual(counters["main_concepts_deduplicated"], 1)
+
+        # Sans blocs, la progression est aussi envoyée à la fin de chaque phase
+        events = []
+        self.generate(instrumentation=events.append, instrumentation_interval=1e-9, **kwargs)
+        phases = [event["phase"] for event in events if event["event"] == "progress" and "phase" in event]
+        self.assertEqual(list(dict.fromkeys(phases)), ["read", "clean", "build", "serialize"])
+
+    def test_instrumentation_json_lines(self):
+        """Vérifie l'écriture des événements dans un fichier JSON Lines, y compris en cas d'erreur."""
+        log_path = "instrumentation.jsonl"
+        self.outputs.append(log_path)
+        with self.assertRaises(KeyError):
+            self.generate(instrumentation=log_path, imbrique=False, concept_main_name="Concept Principal",
+                          skos_notes_columns=["absente"])
+        with open(log_path, encoding="utf-8") as file:
+            events = [json.loads(line) for line in file]
+        self.assertEqual(events[-1]["status"], "error")
+
+    def test_stable_uris_keeps_uris_and_writes_delta(self):
+        """Vérifie que `stable_uris` garde les URIs, ne réécrit pas un fichier inchangé et écrit le delta."""
+        kwargs = dict(imbrique=True,
+                      stable_uris=True,
+                      stable_uris_delta=True,
+                      output_file_name="fichier_skos_stable_uris",
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        first = self.generate(**kwargs)
+        output = self.outputs[-1]
+        self.outputs += [f"{output}.manifest.json", f"{output}.delta.json"]
+        os.utime(output, (0, 0))
+
+        # Une seconde génération avec d'autres UUID4 ne change ni les URIs ni le fichier
+        second = self.generate(uuid_start=1000, **kwargs)
+        self.assertEqual(set(first), set(second))
+        self.assertEqual(os.path.getmtime(output), 0)
+
+        # Une ligne modifiée et une ligne supprimée
+        pd.DataFrame({
+            "main": ["Céramique", "Céramique"],
+            "narrow": ["Vase", None],
+            "label": ["Item 1", "Item 2"],
+            "definition": ["Définition modifiée", None],
+            "note": [None, "Note 2"],
+        }).to_csv(self.csv_path, index=False)
+        third = self.generate(uuid_start=2000, **kwargs)
+        self.assertNotEqual(os.path.getmtime(output), 0)
+        self.assertTrue(set(third.subjects()) < set(first.subjects()))
+
+        with open(f"{output}.delta.json", encoding="utf-8") as file:
+            delta = json.load(file)
+        self.assertEqual(len(delta["added"]), 0)
+        self.assertEqual([entry["path"] for entry in delta["modified"]], [["Céramique", "Vase", "Item 1"]])
+        self.assertEqual(len(delta["removed"]), 3)
+
+    def test_incremental_rebuilds_changed_concepts(self):
+        """Vérifie que le mode incrémental ne reconstruit que les concepts modifiés, comme une génération complète."""
+        rows = pd.read_csv(self.csv_path).assign(main_def=["Céramiques", "Céramiques", "Verres"])
+        rows.to_csv(self.csv_path, index=False)
+        for options in (dict(output_format="ntriples"), dict(output_format="nquads", output_compression="gzip")):
+            kwargs = dict(imbrique=True,
+                          uri_mode="deterministic",
+                          skos_main_concept_preflabel_columns=["main"],
+                          skos_main_concept_description_columns=["main_def"],
+                          skos_narrow_concept_preflabel_columns=["narrow"],
+                          **options)
+            rows.to_csv(self.csv_path, index=False)
+            expected = self.generate("stream", **kwargs)
+            first = self.generate("stream", incremental=True, output_file_name="fichier_skos_incremental", **kwargs)
+            output = self.outputs[-1]
+            self.outputs.append(f"{output}.manifest.json")
+            self.assertTrue(isomorphic(expected, first), options)
+
+            # Une définition et une description modifiées, une ligne supprimée et une ligne ajoutée
+            changed = pd.concat([rows.iloc[[0, 2]], pd.DataFrame({
+                "main": ["Céramique"], "narrow": ["Vase"], "label": ["Item 4"],
+                "definition": ["Définition 4"], "note": [None], "main_def": [None],
+            })], ignore_index=True)
+            changed.loc[0, "definition"] = "Définition modifiée"
+            changed.loc[1, "main_def"] = "Verres et métaux"
+            changed.to_csv(self.csv_path, index=False)
+            expected = self.generate("stream", **kwargs)
+            events = []
+            second = self.generate("stream", incremental=True, output_file_name="fichier_skos_incremental",
+                                   instrumentation=events.append, **kwargs)
+            self.assertTrue(isomorphic(expected, second), options)
+            self.assertEqual(events[-1]["counters"]["concepts_created"], 3)
+
+            # Sans changement, le fichier n'est pas réécrit
+            os.utime(output, (0, 0))
+            third = self.generate("stream", incremental=True, output_file_name="fichier_skos_incremental", **kwargs)
+            self.assertTrue(isomorphic(expected, third), options)
+            self.assertEqual(os.path.getmtime(output), 0)
+
+        with self.assertRaises(ValueError):
+            self.generate(incremental=True, **kwargs)
+        with self.assertRaises(ValueError):
+            self.generate("stream", incremental=True, **dict(kwargs, output_format="xml"))
+
+    def test_append_extends_existing_file(self):
+        """Vérifie que le mode ajout rattache les nouvelles lignes aux concepts existants, comme une génération complète."""
+        rows = pd.read_csv(self.csv_path)
+        for kwargs in (dict(imbrique=False, concept_main_name="Concept Principal", concept_narrower_name="Sous-concept"),
+                       dict(imbrique=True,
+                            skos_main_concept_preflabel_columns=["main"],
+                            skos_narrow_concept_preflabel_columns=["narrow"])):
+            kwargs.update(uri_mode="deterministic")
+            rows.to_csv(self.csv_path, index=False)
+            expected = self.generate(**kwargs)
+            cases = [("graph", dict(output_format="xml")), ("stream", dict(output_format="xml")),
+                     ("stream", dict(output_format="ntriples")),
+                     ("stream", dict(output_format="nquads", output_compression="gzip"))]
+            for first_backend, options in cases:
+                options = dict(kwargs, output_file_name="fichier_skos_append", **options)
+                rows.iloc[:2].to_csv(self.csv_path, index=False)
+                self.generate(first_backend, **options)
+                size = self.outputs[-1].stat().st_size
+                rows.iloc[2:].to_csv(self.csv_path, index=False)
+                appended = self.generate("stream", append=True, **options)
+                self.assertTrue(isomorphic(expected, appended), (first_backend, options))
+                self.assertEqual(len(list(appended.subjects(SKOS.prefLabel, Literal("Céramique", lang="fr")))),
+                                 int(kwargs["imbrique"]))
+
+                # Une erreur pendant l'ajout laisse le fichier existant intact
+                rows.iloc[:2].to_csv(self.csv_path, index=False)
+                self.generate(first_backend, **options)
+                content = self.outputs[-1].read_bytes()
+                self.assertEqual(len(content), size)
+                rows.to_csv(self.csv_path, index=False)
+                with mock.patch("mcc_skos_service.skos_service.emit_chunk", side_effect=RuntimeError):
+                    with self.assertRaises(RuntimeError):
+                        self.generate("stream", append=True, **options)
+                self.assertEqual(self.outputs[-1].read_bytes(), content)
+
+                # Un processus arrêté pendant l'ajout (sans `abort`) ne laisse que le fichier temporaire
+                part_path = Path(f"{self.outputs[-1]}.part")
+                with mock.patch("mcc_skos_service.skos_service.save_graph", side_effect=RuntimeError), \
+                        mock.patch.object(SkosStreamWriter, "abort"):
+                    with self.assertRaises(RuntimeError):
+                        self.generate("stream", append=True, **options)
+                self.assertEqual(self.outputs[-1].read_bytes(), content)
+                self.assertTrue(part_path.exists())
+                part_path.unlink()
+
+            # Des lignes déjà présentes dans le fichier reçoivent de nouvelles URIs, comme dans une
+            # génération complète où elles apparaissent deux fois
+            pd.concat([rows, rows.iloc[1:]]).to_csv(self.csv_path, index=False)
+            expected_twice = self.generate(**kwargs)
+            options = dict(kwargs, output_file_name="fichier_skos_append", output_format="ntriples")
+            rows.to_csv(self.csv_path, index=False)
+            self.generate("stream", **options)
+            rows.iloc[1:].to_csv(self.csv_path, index=False)
+            appended = self.generate("stream", append=True, **options)
+            self.assertTrue(isomorphic(expected_twice, appended))
+            self.assertEqual(len(set(appended.subjects(SKOS.inScheme, None))),
+                             len(set(expected_twice.subjects(SKOS.inScheme, None))))
+
+        with self.assertRaises(ValueError):
+            self.generate(append=True, **kwargs)
+        with self.assertRaises(FileNotFoundError):
+            self.generate("stream", append=True, output_file_name="fichier_skos_absent", **kwargs)
+
+    def test_near_duplicate_labels(self):
+        """Vérifie que les labels quasi identiques sont signalés, puis fusionnés avec near_duplicates='merge'."""
+        pd.DataFrame({
+            "main": ["Céramique", "ceramique ", "Verre", "Céramiques", "CÉRAMIQUE"],
+            "narrow": ["Vase", "vase", "Bol", None, "Vasé"],
+            "label": [f"Item {i}" for i in range(5)],
+            "definition": [None] * 5,
+            "note": [None] * 5,
+        }).to_csv(self.csv_path, index=False)
+        kwargs = dict(imbrique=True,
+                      uri_mode="deterministic",
+                      output_file_name="fichier_skos_near",
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        expected = self.generate(**dict(kwargs, output_file_name="fichier_skos_exact"))
+        self.assertTrue(isomorphic(expected, self.generate(near_duplicates="report", **kwargs)))
+        report_path = f"{self.outputs[-1]}.near_duplicates.json"
+        self.outputs.append(report_path)
+        with open(report_path, encoding="utf-8") as file:
+            report = json.load(file)
+        self.assertEqual(report["clusters"]["main"], [["Céramique", "ceramique ", "Céramiques", "CÉRAMIQUE"]])
+        self.assertEqual(report["clusters"]["narrower"], {"Céramique": [["Vase", "vase", "Vasé"]]})
+
+        events = []
+        merged = self.generate("stream", near_duplicates="merge", instrumentation=events.append, **kwargs)
+        tops = {str(merged.value(concept, SKOS.prefLabel)) for concept in merged.objects(None, SKOS.hasTopConcept)}
+        self.assertEqual(tops, {"Céramique", "Verre"})
+        vase = merged.value(predicate=SKOS.prefLabel, object=Literal("Vase", lang="fr"))
+        self.assertEqual(len(list(merged.objects(vase, SKOS.narrower))), 3)
+        self.assertEqual(events[-1]["counters"]["near_duplicate_labels"], 5)
+
+        # Avec un seuil de 1, seuls les accents, la casse et les espaces sont ignorés
+        self.generate(near_duplicates="report", near_duplicate_threshold=1, **kwargs)
+        with open(report_path, encoding="utf-8") as file:
+            report = json.load(file)
+        self.assertEqual(report["clusters"]["main"], [["Céramique", "ceramique ", "CÉRAMIQUE"]])
+
+        with self.assertRaises(ValueError):
+            self.generate(near_duplicates="merge", imbrique=False, concept_main_name="Concept Principal")
+
+    def test_near_duplicates_keep_distinct_numbers(self):
+        """Vérifie que les labels numérotés ne sont pas fusionnés, ni les concepts plus spécifiques de concepts principaux différents."""
+        pd.DataFrame({
+            "main": ["Catégorie"] * 21 + ["Verre", "Métal"],
+            "narrow": [f"Sous-catégorie {i}" for i in range(20)] + ["sous-categorie 3", "Vase", "vase"],
+            "label": [f"Item {i}" for i in range(23)],
+            "definition": [None] * 23,
+            "note": [None] * 23,
+        }).to_csv(self.csv_path, index=False)
+        merged = self.generate("stream", near_duplicates="merge", imbrique=True,
+                               skos_main_concept_preflabel_columns=["main"],
+                               skos_narrow_concept_preflabel_columns=["narrow"])
+        with open(f"{self.outputs[-1]}.near_duplicates.json", encoding="utf-8") as file:
+            report = json.load(file)
+        self.outputs.append(f"{self.outputs[-1]}.near_duplicates.json")
+        self.assertEqual(report["clusters"], {"main": [], "narrower": {"Catégorie": [["Sous-catégorie 3", "sous-categorie 3"]]}})
+        narrower_labels = {str(label) for concept in merged.subjects(SKOS.narrower, None)
+                           for child in merged.objects(concept, SKOS.narrower)
+                           for label in merged.objects(child, SKOS.prefLabel) if "Item" not in label}
+        self.assertEqual(len(narrower_labels), 22)
+
+        # Chaque label est comparé au label retenu du groupe, pas de proche en proche
+        self.assertEqual(cluster_labels(["abcdefghij", "abcdefghiX", "abcdefghiXY"], 0.65),
+                         [["abcdefghij", "abcdefghiX"]])
+
+    def test_sqlite_concept_index_is_isomorphic(self):
+        """Vérifie que l'index SQLite des concepts, avec un petit cache, produit le même graphe que les dictionnaires."""
+        pd.DataFrame({
+            "main": [f"Principal {i % 7}" for i in range(40)],
+            "narrow": [f"Spécifique {i % 3}" if i % 5 else None for i in range(40)],
+            "label": [f"Item {i}" for i in range(40)],
+            "definition": [None] * 40,
+            "note": [None] * 40,
+        }).to_csv(self.csv_path, index=False)
+        kwargs = dict(imbrique=True,
+                      csv_chunk_size=6,
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        expected = self.generate("stream", **kwargs)
+        indexed = self.generate("stream", concept_index="sqlite", concept_index_cache_size=2, **kwargs)
+        self.assertTrue(isomorphic(expected, indexed))
+        self.assertEqual(len(list(indexed.triples((None, SKOS.hasTopConcept, None)))), 7)
+        self.assertFalse(os.path.exists(f"{self.outputs[-1]}.concepts.sqlite"))
+
+        # Les lignes répétées reçoivent les mêmes URIs déterministes qu'avec le décompte en mémoire
+        rows = pd.read_csv(self.csv_path)
+        pd.concat([rows, rows]).to_csv(self.csv_path, index=False)
+        kwargs.update(uri_mode="deterministic")
+        expected = self.generate("stream", **kwargs)
+        indexed = self.generate("stream", concept_index="sqlite", concept_index_cache_size=2, **kwargs)
+        self.assertEqual(set(expected), set(indexed))
+        self.assertEqual(len({item for item, label in indexed.subject_objects(SKOS.prefLabel)
+                              if str(label).startswith("Item")}), 80)
+
+        with self.assertRaises(ValueError):
+            self.generate(concept_index="sqlite", **kwargs)
+
+    def test_profile_writes_phase_reports(self):
+        """Vérifie que le mode profile écrit les statistiques, les piles repliées et les allocations de chaque phase."""
+        kwargs = dict(imbrique=True,
+                      csv_chunk_size=1,
+                      skos_main_concept_preflabel_columns=["main"],
+                      skos_narrow_concept_preflabel_columns=["narrow"])
+        self.assertTrue(isomorphic(self.generate("stream", **kwargs), self.generate("stream", profile=True, **kwargs)))
+        output = self.outputs[-1]
+        phases = ["load_params", "read", "clean", "build", "serialize"]
+        reports = [f"{output}.profile.{phase}.pstats" for phase in phases]
+        reports += [f"{output}.profile.folded", f"{output}.profile.allocations.txt"]
+        self.outputs.extend(reports)
+        for phase in phases:
+            self.assertGreater(pstats.Stats(f"{output}.profile.{phase}.pstats").total_calls, 0)
+        with open(f"{output}.profile.folded", encoding="utf-8") as file:
+            stacks = [line.rsplit(" ", 1) for line in file.read().splitlines()]
+        self.assertTrue(all(count.isdigit() for _, count in stacks))
+        self.assertTrue(any("create_concept" in stack for stack, _ in stacks if stack.startswith("build;")))
+        with open(f"{output}.profile.allocations.txt", encoding="utf-8") as file:
+            summary = file.read()
+        for phase in phases:
+            self.assertIn(f"Phase {phase} :", summary)
+        self.assertFalse(tracemalloc.is_tracing())
+
+class TestConceptIndex(unittest.TestCase):
+    """
+    Classe de test pour l'index des concepts stocké dans un fichier SQLite.
+    """
+
+    def test_entries_survive_cache_eviction(self):
+        """Vérifie que les entrées sorties du cache LRU sont relues dans le fichier."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "index.sqlite")
+            with ConceptStore(path, cache_size=3) as store:
+                index = store.index("narrow_concepts")
+                uris = {("Principal", f"Spécifique {i}"): URIRef(f"http://example.org/{i}") for i in range(50)}
+                index.update(uris)
+                self.assertLessEqual(len(index._cache), 3)
+                self.assertEqual(dict(index), uris)
+                self.assertEqual(index[("Principal", "Spécifique 0")], URIRef("http://example.org/0"))
+                self.assertNotIn(("Principal", "Inconnu"), index)
+                self.assertIsNone(index.get("Principal"))
+            self.assertFalse(path.exists())
+
+class TestUriMinter(unittest.TestCase):
+    """
+    Classe de test pour la génération d'URIs par lots.
+    """
+
+    def test_uuid5_strings_match_uuid5(self):
+        """Vérifie que le calcul par lots est identique à uuid.uuid5."""
+        namespace = uuid.uuid5(uuid.NAMESPACE_URL, "http://example.org/test#test_scheme")
+        names = ["Céramique", "Céramique\x1fVase", ""]
+        seed = hashlib.sha1(namespace.bytes)
+        self.assertEqual(uuid5_strings(seed, names), [str(uuid.uuid5(namespace, name)) for name in names])
+
+    def test_stored_occurrences_match_memory(self):
+        """Vérifie que le décompte des occurrences stocké dans un fichier donne les mêmes URIs qu'en mémoire."""
+        NS = Namespace("http://example.org/test#")
+        chunks = [[("Céramique", "Vase", f"Item {i % 7}") for i in range(start, start + 20)] for start in (0, 20)]
+        memory = UriMinter(NS, NS.scheme, deterministic=True)
+        expected = [uri for chunk in chunks for uri in memory.mint(chunk)]
+        with tempfile.TemporaryDirectory() as directory:
+            with ConceptStore(Path(directory, "index.sqlite"), cache_size=3) as store:
+                stored = UriMinter(NS, NS.scheme, deterministic=True)
+                stored.mint(chunks[0][:1])
+                stored.store_occurrences(store.index("occurrences", int))
+                uris = stored.mint(chunks[0][1:]) + stored.mint(chunks[1])
+                self.assertEqual(uris, expected[1:])
+                self.assertEqual(len(set(expected)), 40)
+
+class TestGetLiteral(unittest.TestCase):
+    """
+    Classe de test pour le partage des littéraux entre les concepts.
+    """
+
+    def test_repeated_labels_share_literals(self):
+        """Vérifie que les concepts d'un même label partagent le même littéral, et que le type de la valeur est conservé."""
+        self.assertIs(get_literal("Céramique"), get_literal("Céramique"))
+        self.assertEqual(get_literal("Céramique"), Literal("Céramique", lang="fr"))
+        self.assertEqual(get_literal(1), Literal(1, lang="fr"))
+        self.assertIsNot(get_literal(1), get_literal("1"))
+
+        g = Graph()
+        scheme_uri = URIRef("http://example.org/test#test_scheme")
+        uris = [create_concept("Vase", "", "Note", g, None, scheme_uri, concept_uri=URIRef(f"http://example.org/test#{i}"))
+                for i in range(3)]
+        labels = [g.value(uri, SKOS.prefLabel) for uri in uris]
+        self.assertTrue(all(label is labels[0] for label in labels))
+
+class TestClearColumns(unittest.TestCase):
+    """
+    Classe de test pour la fonction clear_columns, version vectorisée de clear_data.
+    """
+
+    def test_same_result_as_clear_data(self):
+        """Vérifie que clear_columns produit les mêmes chaînes que clear_data ligne par ligne."""
+        df = pd.DataFrame({
+            "label": ["Concept 1", None, "Concept 3", None],
+            "code": [1.0, 2.5, float("nan"), float("nan")],
+            "note": ["Note 1", "Note 2", None, None],
+        })
+        for columns in (["label", "code", "note"], "code, note", ["note"], [""]):
+            expected = [clear_data(columns, row) for _, row in df.iterrows()]
+            self.assertEqual(clear_columns(columns, df), expected)
+
+    def test_numeric_rows_are_upcast_like_iterrows(self):
+        """Vérifie que les entiers d'un DataFrame numérique sont convertis comme avec iterrows."""
+        df = pd.DataFrame({"code": [1, 2], "valeur": [0.5, float("nan")]})
+        expected = [clear_data(["code", "valeur"], row) for _, row in df.iterrows()]
+        self.assertEqual(clear_columns(["code", "valeur"], df), expected)
+
+    def test_missing_columns(self):
+        """Vérifie qu'une KeyError est levée pour des colonnes absentes."""
+        df = pd.DataFrame({"label": ["Concept 1"]})
+        with self.assertRaises(KeyError):
+            clear_columns(["label", "absent"], df)
+
 if __name__ == "__main__":
     unittest.main()
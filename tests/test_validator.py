@@ -0,0 +1,93 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import RDF, SKOS
+from mcc_skos_service.skos_reader import iter_triples
+from mcc_skos_service.validator import validate_skos
+
+EX = Namespace("http://example.org/test#")
+
+
+class TestValidateSkos(unittest.TestCase):
+    """
+    Classe de test pour la validation en continu des fichiers SKOS.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+        self.graph = Graph()
+        self.graph.bind("skos", SKOS)
+        self.graph.add((EX.scheme, RDF.type, SKOS.ConceptScheme))
+        for name, label, parent in (("main", "Céramique", None), ("vase", "Vase", "main"), ("bol", "Bol", "main")):
+            concept = EX[name]
+            self.graph.add((concept, RDF.type, SKOS.Concept))
+            self.graph.add((concept, SKOS.inScheme, EX.scheme))
+            self.graph.add((concept, SKOS.prefLabel, Literal(label, lang="fr")))
+            self.graph.add((concept, SKOS.definition, Literal(f"Définition {label}", lang="fr")))
+            if parent is None:
+                self.graph.add((EX.scheme, SKOS.hasTopConcept, concept))
+            else:
+                self.graph.add((EX[parent], SKOS.narrower, concept))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def validate(self, name="thesaurus.nt", format="nt"):
+        """Valide le graphe de test, écrit dans le fichier `name`."""
+        path = self.path / name
+        data = self.graph.serialize(format=format, encoding="utf-8")
+        path.write_bytes(gzip.compress(data) if name.endswith(".gz") else data)
+        return validate_skos(path)
+
+    def test_valid_file(self):
+        """Vérifie qu'un fichier correct est valide, dans chaque format lu."""
+        for name, format in (("thesaurus.nt", "nt"), ("thesaurus.xml", "xml"), ("thesaurus.rdf", "pretty-xml"),
+                             ("thesaurus.nt.gz", "nt")):
+            report = self.validate(name, format)
+            self.assertTrue(report.is_valid, name)
+            self.assertEqual(sum(report.counts.values()), 0, name)
+            self.assertEqual(report.concepts, 3)
+            self.assertEqual(report.triples, len(self.graph))
+            self.assertGreater(report.to_dict()["triples_per_second"], 0)
+
+    def test_reports_each_problem(self):
+        """Vérifie que chaque problème est compté et illustré par les URIs des concepts concernés."""
+        self.graph.remove((EX.bol, SKOS.inScheme, EX.scheme))
+        self.graph.add((EX.vase, SKOS.narrower, EX.absent))
+        self.graph.add((EX.bol, SKOS.narrower, EX.main))
+        self.graph.set((EX.bol, SKOS.prefLabel, Literal("Vase", lang="fr")))
+        self.graph.set((EX.vase, SKOS.definition, Literal("", lang="fr")))
+        orphan = EX.orphan
+        self.graph.add((orphan, RDF.type, SKOS.Concept))
+        self.graph.add((orphan, SKOS.inScheme, EX.scheme))
+
+        for name, format in (("thesaurus.nt", "nt"), ("thesaurus.xml", "pretty-xml")):
+            report = self.validate(name, format)
+            self.assertFalse(report.is_valid)
+            self.assertEqual(report.counts, {
+                "missing_in_scheme": 1,
+                "dangling_narrower": 1,
+                "narrower_cycles": 2,
+                "top_concepts_not_linked": 1,
+                "duplicate_labels": 2,
+                "empty_definitions": 1,
+            }, name)
+            examples = {check: set(uris) for check, uris in report.examples.items()}
+            self.assertEqual(examples["missing_in_scheme"], {str(EX.bol)})
+            self.assertEqual(examples["dangling_narrower"], {str(EX.absent)})
+            self.assertEqual(examples["narrower_cycles"], {str(EX.main), str(EX.bol)})
+            self.assertEqual(examples["top_concepts_not_linked"], {str(orphan)})
+            self.assertEqual(examples["duplicate_labels"], {str(EX.vase), str(EX.bol)})
+            self.assertEqual(examples["empty_definitions"], {str(EX.vase)})
+
+    def test_iter_triples_matches_rdflib(self):
+        """Vérifie que la lecture en continu retourne les triplets lus par rdflib."""
+        self.graph.add((EX.main, SKOS.note, Literal('Note "entre guillemets"\nsur deux lignes\\', lang="fr")))
+        self.graph.add((EX.main, URIRef("http://example.org/other#count"), Literal(3)))
+        for name, format in (("thesaurus.nt", "nt"), ("thesaurus.xml", "xml"), ("thesaurus.rdf", "pretty-xml")):
+            path = self.path / name
+            self.graph.serialize(destination=str(path), format=format, encoding="utf-8")
+            self.assertEqual(set(iter_triples(path)), set(self.graph), name)